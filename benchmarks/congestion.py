@@ -0,0 +1,54 @@
+"""Compares routing on the shortest routes only against congestion-aware routing on a generated multi-arm workcell.
+
+Devices are reachable by several neighbouring arms, so most moves can be made by more than one arm.  With one route
+alternative every thread is offered the arm get_transporter_between picks for its hop, and threads queue on it while the
+other arms idle.  With more alternatives, a thread whose shortest-route arms are saturated also considers the cheapest
+routes through other arms, ranked by their cost plus the time the arms along them are expected to be busy.
+
+Reports the simulated makespan, plates per hour and the busy time of each arm.  Runs still unfinished after
+--max-duration simulated seconds are cancelled and reported as failed.
+
+Usage:
+    python benchmarks/congestion.py --transporters 3 --device-reach 3 --threads 6 --alternatives 1 3 5
+"""
+import argparse
+import logging
+
+from orca.simulation.generator import WorkcellSpec, generate_workcell
+from orca.simulation.runner import simulate_workflow_runs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transporters", type=int, default=3)
+    parser.add_argument("--devices", type=int, default=9)
+    parser.add_argument("--device-types", type=int, default=3)
+    parser.add_argument("--device-reach", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=6)
+    parser.add_argument("--methods", type=int, default=3)
+    parser.add_argument("--device-duration", type=float, default=30.0)
+    parser.add_argument("--arm-duration", type=float, default=10.0)
+    parser.add_argument("--alternatives", nargs="+", type=int, default=[1, 3, 5])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-duration", type=float, default=20000.0, help="Simulated seconds before unfinished runs are cancelled")
+    args = parser.parse_args()
+    logging.getLogger("orca").setLevel(logging.ERROR)
+
+    print(f"{'alternatives':>12} {'makespan s':>11} {'plates/h':>9}  arm busy s")
+    for alternatives in args.alternatives:
+        spec = WorkcellSpec(transporters=args.transporters, devices=args.devices, device_types=args.device_types,
+                            device_reach=args.device_reach, threads=args.threads, methods_per_thread=args.methods,
+                            device_duration=args.device_duration, arm_duration=args.arm_duration, seed=args.seed,
+                            route_alternatives=alternatives)
+        workcell = generate_workcell(spec)
+        result = simulate_workflow_runs(workcell.system, workcell.workflow, max_duration=args.max_duration)
+        arms = {t.name: result.busy_time.get(t.name, 0.0) for t in workcell.resource_registry.transporters}
+        plates_per_hour = args.threads * result.throughput_per_hour
+        busy = " ".join(f"{name}={seconds:.0f}" for name, seconds in arms.items())
+        print(f"{alternatives:>12} {result.makespan:>11.0f} {plates_per_hour:>9.1f}  {busy}")
+        for error in result.errors:
+            print(f"{'':>12} failed: {error}")
+
+
+if __name__ == "__main__":
+    main()
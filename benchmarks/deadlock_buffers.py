@@ -0,0 +1,71 @@
+"""Measures finding where to park deadlocked labware with and without SystemMap's nearest-free-buffer index.
+
+The scan numbers do what deadlock resolution did before the index: every node is checked for a plate pad, the shortest paths
+to each pad are looked up and the paths are sorted by length.  The index numbers ask SystemMap for the nearest few free pads
+and look up the paths to those alone.  Both run after the route cache is warm, so the difference is the per-deadlock work.
+
+Usage:
+    python benchmarks/deadlock_buffers.py --transporters 2 4 8 --shared-positions 3 --queries 2000
+"""
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from orca.resource_models.labware import LabwareInstance
+from orca.resource_models.plate_pad import PlatePad
+from orca.simulation.generator import WorkcellSpec, generate_workcell
+from orca.system.system_map import SystemMap
+
+
+def _scan(system_map: SystemMap, source: str, count: int) -> None:
+    paths = []
+    for location in system_map.locations:
+        if isinstance(location.resource, PlatePad) and location.name != source:
+            paths.extend(system_map.get_all_shortest_any_paths(source, location.name))
+    sorted(paths, key=len)
+
+
+def _index(system_map: SystemMap, source: str, count: int) -> None:
+    for buffer in system_map.get_nearest_free_buffers(source, count):
+        system_map.get_all_shortest_any_paths(source, buffer)
+
+
+def _time(query: Callable[[SystemMap, str, int], None], system_map: SystemMap, sources: List[str], count: int) -> float:
+    for source in set(sources):
+        query(system_map, source, count)
+    start = time.perf_counter()
+    for source in sources:
+        query(system_map, source, count)
+    return (time.perf_counter() - start) / len(sources)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transporters", nargs="+", type=int, default=[2, 4, 8])
+    parser.add_argument("--devices", type=int, default=40)
+    parser.add_argument("--shared-positions", type=int, default=3)
+    parser.add_argument("--buffers", type=int, default=3, help="Nearest free pads offered per deadlock")
+    parser.add_argument("--occupancy", type=float, default=0.5, help="Fraction of plate pads holding labware")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'arms':>5} {'pads':>5} {'scan us/deadlock':>17} {'index us/deadlock':>18} {'speedup':>8}")
+    for transporters in args.transporters:
+        workcell = generate_workcell(WorkcellSpec(transporters=transporters, devices=args.devices,
+                                                  shared_positions=args.shared_positions, seed=args.seed))
+        system_map = workcell.system_map
+        rng = random.Random(args.seed)
+        pads = [location.name for location in system_map.locations if isinstance(location.resource, PlatePad)]
+        for i, name in enumerate(rng.sample(pads, int(len(pads) * args.occupancy))):
+            system_map.get_location(name).initialize_labware(LabwareInstance(f"plate_{i}", "96 well"))
+        names = [location.name for location in system_map.locations]
+        sources = [rng.choice(names) for _ in range(args.queries)]
+        scanned = _time(_scan, system_map, sources, args.buffers)
+        indexed = _time(_index, system_map, sources, args.buffers)
+        print(f"{transporters:>5} {len(pads):>5} {scanned * 1e6:>17.1f} {indexed * 1e6:>18.1f} {scanned / indexed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Measures finding deadlocks with and without the incrementally updated wait-for graph.
+
+The rebuild numbers do what deadlock detection did before the graph was kept: every tick a networkx graph is built from
+every waiting thread and searched for a cycle, finding at most one cycle and only at the next tick.  The incremental numbers
+update the edges of the one thread whose request changed and search for the deadlock it closes, which is what the
+coordinator does as each request starts waiting.
+
+Threads wait in chains, the last of each chain waiting for the first so every chain is a cycle when --cycles is set.
+
+Usage:
+    python benchmarks/deadlock_detection.py --threads 10 100 1000 --chain 5 --events 2000
+"""
+import argparse
+import random
+import time
+from typing import Dict, List, Set
+
+import networkx as nx  # type: ignore
+
+from orca.system.reservation_manager.deadlock_manager import DeadlockGraph
+
+
+def _build_waits_for(threads: int, chain: int, cycles: bool) -> Dict[str, Set[str]]:
+    waits_for: Dict[str, Set[str]] = {}
+    for start in range(0, threads, chain):
+        members = [f"thread_{i}" for i in range(start, min(start + chain, threads))]
+        for requester, holder in zip(members, members[1:]):
+            waits_for[requester] = {holder}
+        if cycles and len(members) > 1:
+            waits_for[members[-1]] = {members[0]}
+    return waits_for
+
+
+def _rebuild(waits_for: Dict[str, Set[str]]) -> None:
+    graph = nx.DiGraph()
+    for requester, holders in waits_for.items():
+        for holder in holders:
+            graph.add_edge(requester, holder)
+    try:
+        nx.find_cycle(graph, orientation="original")
+    except nx.NetworkXNoCycle:
+        pass
+
+
+def _time_rebuild(waits_for: Dict[str, Set[str]], ticks: int) -> float:
+    start = time.perf_counter()
+    for _ in range(ticks):
+        _rebuild(waits_for)
+    return (time.perf_counter() - start) / ticks
+
+
+def _time_incremental(waits_for: Dict[str, Set[str]], changed: List[str]) -> float:
+    graph = DeadlockGraph()
+    for requester, holders in waits_for.items():
+        graph.set_waits_for(requester, [holders])
+    start = time.perf_counter()
+    for requester in changed:
+        graph.set_waits_for(requester, [waits_for[requester]])
+        graph.find_deadlock(requester)
+    return (time.perf_counter() - start) / len(changed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", nargs="+", type=int, default=[10, 100, 1000])
+    parser.add_argument("--chain", type=int, default=5, help="Threads in each chain of waiting threads")
+    parser.add_argument("--cycles", action="store_true", help="Close every chain into a cycle")
+    parser.add_argument("--events", type=int, default=2000, help="Requests updated for the incremental numbers")
+    parser.add_argument("--ticks", type=int, default=200, help="Ticks timed for the rebuild numbers")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'threads':>7} {'rebuild us/tick':>16} {'incremental us/event':>21} {'events per tick':>16}")
+    for threads in args.threads:
+        waits_for = _build_waits_for(threads, args.chain, args.cycles)
+        rng = random.Random(args.seed)
+        changed = [rng.choice(list(waits_for)) for _ in range(args.events)]
+        rebuilt = _time_rebuild(waits_for, args.ticks)
+        incremental = _time_incremental(waits_for, changed)
+        print(f"{threads:>7} {rebuilt * 1e6:>16.1f} {incremental * 1e6:>21.1f} {rebuilt / incremental:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compares the networkx and compact SystemMap graph backends on large generated workcells.
+
+Both maps are generated from the same spec, so they hold the same locations and edges.  Route queries go through the
+graph handler directly, bypassing SystemMap's route cache, to time the backends themselves: all shortest paths between a
+pair, distances from a source and reachability.  Available-route queries go through SystemMap, which filters out the
+locations holding labware and are never cached.
+
+Usage:
+    python benchmarks/graph_backends.py --transporters 2 4 8 --devices 100 --queries 500
+"""
+import argparse
+import random
+import time
+from typing import Callable, List, Tuple
+
+from orca.resource_models.labware import LabwareInstance
+from orca.simulation.generator import WorkcellSpec, generate_workcell
+from orca.system.system_map import SystemMap
+
+BACKENDS = ["networkx", "compact"]
+
+
+def _time_queries(query: Callable[[str, str], object], queries: List[Tuple[str, str]]) -> float:
+    start = time.perf_counter()
+    for source, target in queries:
+        query(source, target)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def _available_paths(system_map: SystemMap, source: str, target: str) -> None:
+    if system_map.has_available_route(source, target):
+        system_map.get_all_shortest_available_paths(source, target)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transporters", nargs="+", type=int, default=[2, 4, 8])
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument("--shared-positions", type=int, default=2)
+    parser.add_argument("--device-reach", type=int, default=2)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--occupancy", type=float, default=0.25, help="Fraction of locations holding labware for available-route queries")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'arms':>5} {'locations':>10} {'edges':>7} {'backend':>9} {'build ms':>9} {'paths us':>9} {'dists us':>9} "
+          f"{'reach us':>9} {'avail us':>9}")
+    for transporters in args.transporters:
+        for backend in BACKENDS:
+            spec = WorkcellSpec(transporters=transporters, devices=args.devices, shared_positions=args.shared_positions,
+                                device_reach=args.device_reach, seed=args.seed, graph_backend=backend)
+            start = time.perf_counter()
+            system_map = generate_workcell(spec).system_map
+            build = time.perf_counter() - start
+            graph = system_map._graph
+            names = [location.name for location in system_map.locations]
+            rng = random.Random(args.seed)
+            queries = [tuple(rng.sample(names, 2)) for _ in range(args.queries)]
+            paths = _time_queries(graph.get_all_shortest_paths, queries)  # type: ignore
+            distances = _time_queries(lambda source, _: graph.get_distances_from(source), queries)  # type: ignore
+            reach = _time_queries(graph.has_path, queries)  # type: ignore
+
+            occupied = rng.sample(names, int(len(names) * args.occupancy))
+            for i, name in enumerate(occupied):
+                system_map.get_location(name).initialize_labware(LabwareInstance(f"plate_{i}", "96 well"))
+            free = [name for name in names if name not in occupied]
+            available_queries = [(rng.choice(occupied), rng.choice(free)) for _ in range(args.queries)]
+            available = _time_queries(lambda source, target: _available_paths(system_map, source, target), available_queries)
+            print(f"{transporters:>5} {len(names):>10} {len(graph.get_all_edges()):>7} {backend:>9} {build * 1e3:>9.1f} "
+                  f"{paths * 1e6:>9.1f} {distances * 1e6:>9.1f} {reach * 1e6:>9.1f} {available * 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Compares reserving one hop at a time against reserving several hops of a route before labware is picked.
+
+Devices are reachable by a single arm of a line of arms, so labware crossing the workcell is handed off at the plate pads
+between neighbouring arms.  Reserving one hop at a time, labware can reach a handoff and wait there for the next hop,
+occupying the pad and possibly deadlocking with labware coming the other way.  Reserving ahead, labware is only picked once
+the hops after it are free.
+
+Reports the simulated makespan, the time labware spent on the handoff pads, the number of deadlocks detected and whether the
+run finished.  A run that cannot resolve a deadlock runs until --max-duration.
+
+Usage:
+    python benchmarks/lookahead.py --transporters 3 --threads 4 --lookahead 1 2 0
+"""
+import argparse
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from orca.resource_models.labware import LabwareInstance
+from orca.resource_models.location import ILabwareLocationObserver, Location
+from orca.simulation.generator import WorkcellSpec, generate_workcell
+from orca.simulation.runner import simulate_workflow_runs
+
+
+class _DwellRecorder(ILabwareLocationObserver):
+    """Sums the simulated time labware rests on the observed locations."""
+    def __init__(self) -> None:
+        self.dwell_time = 0.0
+        self._placed_at: Dict[str, float] = {}
+
+    def notify_labware_location_change(self, event: str, location: Location, labware: LabwareInstance) -> None:
+        now = asyncio.get_running_loop().time()
+        if event == "placed":
+            self._placed_at[labware.id] = now
+        elif event == "picked" and labware.id in self._placed_at:
+            self.dwell_time += now - self._placed_at.pop(labware.id)
+
+
+class _DeadlockCounter(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__(logging.INFO)
+        self.deadlocks = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if "Deadlock detected" in record.getMessage():
+            self.deadlocks += 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transporters", type=int, default=3)
+    parser.add_argument("--devices", type=int, default=9)
+    parser.add_argument("--device-types", type=int, default=3)
+    parser.add_argument("--shared-positions", type=int, default=1)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--methods", type=int, default=3)
+    parser.add_argument("--device-duration", type=float, default=30.0)
+    parser.add_argument("--arm-duration", type=float, default=10.0)
+    parser.add_argument("--lookahead", nargs="+", type=int, default=[1, 2, 0], help="Hops reserved ahead, 0 for the whole route")
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0, 1, 2])
+    parser.add_argument("--max-duration", type=float, default=20000.0, help="Simulated seconds before unfinished runs are cancelled")
+    args = parser.parse_args()
+    orca_logger = logging.getLogger("orca")
+    # deadlocks are logged at info, the counter sees them while nothing is printed
+    orca_logger.setLevel(logging.INFO)
+    orca_logger.propagate = False
+
+    print(f"{'lookahead':>9} {'seed':>5} {'makespan s':>11} {'handoff dwell s':>16} {'deadlocks':>10} {'finished':>9}")
+    for lookahead in args.lookahead:
+        lookahead_hops: Optional[int] = lookahead if lookahead > 0 else None
+        for seed in args.seeds:
+            spec = WorkcellSpec(transporters=args.transporters, devices=args.devices, device_types=args.device_types,
+                                shared_positions=args.shared_positions, device_reach=1, threads=args.threads,
+                                methods_per_thread=args.methods, device_duration=args.device_duration,
+                                arm_duration=args.arm_duration, seed=seed, lookahead_hops=lookahead_hops)
+            workcell = generate_workcell(spec)
+            recorder = _DwellRecorder()
+            handoffs: List[Location] = [l for l in workcell.system_map.locations if l.name.startswith("handoff_")]
+            for location in handoffs:
+                location.add_observer(recorder)
+            counter = _DeadlockCounter()
+            orca_logger.addHandler(counter)
+            try:
+                result = simulate_workflow_runs(workcell.system, workcell.workflow, max_duration=args.max_duration)
+            finally:
+                orca_logger.removeHandler(counter)
+            label = "route" if lookahead_hops is None else str(lookahead_hops)
+            print(f"{label:>9} {seed:>5} {result.makespan:>11.0f} {recorder.dwell_time:>16.0f} {counter.deadlocks:>10} {str(result.completed_runs > 0):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Measures the time from submitting a reservation request to it being granted under load.
+
+Runs generated workcells with an increasing number of concurrent labware threads on the virtual clock and reports the
+request-to-grant latency of every granted reservation request in simulated seconds.  A request for a free location is
+granted without waiting, so the median shows the overhead the coordinator adds on top of waiting for locations to free,
+while the tail shows how quickly a waiting request is granted once the location it waits for is released.
+
+Usage:
+    python benchmarks/reservation_latency.py --threads 2 4 8 --seeds 0 1
+"""
+import argparse
+import logging
+
+from orca.simulation.generator import WorkcellSpec, generate_workcell
+from orca.simulation.runner import simulate_workflow_runs
+from orca.simulation.stats import percentile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", nargs="+", type=int, default=[2, 4, 8])
+    parser.add_argument("--transporters", type=int, default=2)
+    parser.add_argument("--devices", type=int, default=8)
+    parser.add_argument("--methods", type=int, default=3)
+    parser.add_argument("--device-duration", type=float, default=60.0)
+    parser.add_argument("--arm-duration", type=float, default=10.0)
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0, 1])
+    parser.add_argument("--max-duration", type=float, default=20000.0, help="Simulated seconds before unfinished runs are cancelled")
+    args = parser.parse_args()
+    logging.getLogger("orca").setLevel(logging.ERROR)
+
+    print(f"{'threads':>7} {'seed':>5} {'requests':>9} {'mean s':>8} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} {'makespan s':>11}")
+    for threads in args.threads:
+        for seed in args.seeds:
+            spec = WorkcellSpec(transporters=args.transporters, devices=args.devices, threads=threads,
+                                methods_per_thread=args.methods, device_duration=args.device_duration,
+                                arm_duration=args.arm_duration, seed=seed)
+            workcell = generate_workcell(spec)
+            result = simulate_workflow_runs(workcell.system, workcell.workflow, max_duration=args.max_duration)
+            waits = result.reservation_waits
+            mean = sum(waits) / len(waits) if waits else 0.0
+            print(f"{threads:>7} {seed:>5} {len(waits):>9} {mean:>8.3f} {percentile(waits, 50):>8.3f} "
+                  f"{percentile(waits, 95):>8.3f} {percentile(waits, 99):>8.3f} {result.makespan:>11.0f}")
+            for error in result.errors[:3]:
+                print(f"    error: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Measures the routing cost of a single move with and without the SystemMap route cache.
+
+For each move the scheduler looks up every shortest path between the labware's location and its target, ranks
+the candidate devices of the next action by distance and, when deadlocked, looks up the paths to every plate pad.
+The uncached numbers call networkx directly as SystemMap did before the route cache; the cached numbers go
+through SystemMap after the cache has been warmed by a first pass over the same moves.
+
+The second table times available-route queries, which depend on the labware in the workcell and are not cached.  The copy
+numbers rebuild the available graph from the occupied locations and busy transporters as SystemMap did before its occupancy
+index; the view numbers query SystemMap's filtered view of the persistent graph.
+
+Usage:
+    python benchmarks/routing.py --transporters 2 4 8 --devices 40 --moves 2000
+"""
+import argparse
+import random
+import time
+from typing import Callable, List, Tuple
+
+import networkx as nx  # type: ignore
+
+from orca.resource_models.labware import LabwareInstance
+
+from orca.resource_models.plate_pad import PlatePad
+from orca.simulation.generator import WorkcellSpec, generate_workcell
+from orca.system.system_map import SystemMap
+
+
+def _route_move(system_map: SystemMap, source: str, target: str, candidates: List[str], pads: List[str]) -> None:
+    system_map.get_all_shortest_any_paths(source, target)
+    sorted(candidates, key=lambda c: system_map.get_distance(source, c))
+    system_map.get_shortest_paths_to_deadlock_resolution(source)
+
+
+def _route_move_uncached(system_map: SystemMap, source: str, target: str, candidates: List[str], pads: List[str]) -> None:
+    graph = system_map._graph
+    graph.get_all_shortest_paths(source, target)
+    sorted(candidates, key=lambda c: graph.get_distance(source, c))
+    for pad in pads:
+        if pad != source:
+            graph.get_all_shortest_paths(source, pad)
+
+
+def _available_paths_copy(system_map: SystemMap, source: str, target: str) -> None:
+    graph = system_map._graph._graph
+    nodes = [n for n, data in graph.nodes(data=True)
+             if n == source or (data["location"] is None and system_map._hubs[n.transporter].labware is None)
+             or (data["location"] is not None and data["location"].labware is None)]
+    available = nx.DiGraph()
+    available.add_nodes_from((n, graph.nodes[n]) for n in nodes)
+    available.add_edges_from((u, v, data) for u, v, data in graph.subgraph(nodes).edges(data=True) if data["transporter"].labware is None)
+    if nx.has_path(available, source, target):
+        list(nx.all_shortest_paths(available, source, target, weight="weight"))
+
+
+def _available_paths_view(system_map: SystemMap, source: str, target: str) -> None:
+    if system_map.has_available_route(source, target):
+        system_map.get_all_shortest_available_paths(source, target)
+
+
+def _time_queries(query: Callable[[SystemMap, str, str], None], system_map: SystemMap, queries: List[Tuple[str, str]]) -> float:
+    start = time.perf_counter()
+    for source, target in queries:
+        query(system_map, source, target)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def _time_moves(route: Callable[..., None], system_map: SystemMap, moves: List[Tuple[str, str, List[str]]], pads: List[str]) -> float:
+    start = time.perf_counter()
+    for source, target, candidates in moves:
+        route(system_map, source, target, candidates, pads)
+    return (time.perf_counter() - start) / len(moves)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transporters", nargs="+", type=int, default=[2, 4, 8])
+    parser.add_argument("--devices", type=int, default=40)
+    parser.add_argument("--shared-positions", type=int, default=2)
+    parser.add_argument("--pool-size", type=int, default=4, help="Candidate devices ranked by distance per move")
+    parser.add_argument("--moves", type=int, default=2000)
+    parser.add_argument("--occupancy", type=float, default=0.25, help="Fraction of locations holding labware for available-route queries")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    available_rows = []
+    print(f"{'arms':>5} {'locations':>10} {'uncached us/move':>17} {'cached us/move':>15} {'speedup':>8}")
+    for transporters in args.transporters:
+        workcell = generate_workcell(WorkcellSpec(transporters=transporters, devices=args.devices,
+                                                  shared_positions=args.shared_positions, seed=args.seed))
+        system_map = workcell.system_map
+        names = [location.name for location in system_map.locations]
+        pads = [location.name for location in system_map.locations if isinstance(location.resource, PlatePad)]
+        rng = random.Random(args.seed)
+        moves = []
+        for _ in range(args.moves):
+            source, target = rng.sample(names, 2)
+            moves.append((source, target, rng.sample(names, min(args.pool_size, len(names)))))
+
+        uncached = _time_moves(_route_move_uncached, system_map, moves, pads)
+        system_map.clear_route_cache()
+        _time_moves(_route_move, system_map, moves, pads)
+        cached = _time_moves(_route_move, system_map, moves, pads)
+        print(f"{transporters:>5} {len(names):>10} {uncached * 1e6:>17.1f} {cached * 1e6:>15.1f} {uncached / cached:>7.1f}x")
+        available_rows.append((transporters, len(names), system_map, rng))
+
+    print()
+    print(f"{'arms':>5} {'locations':>10} {'copy us/query':>14} {'view us/query':>14} {'speedup':>8}")
+    for transporters, locations, system_map, rng in available_rows:
+        names = [location.name for location in system_map.locations]
+        occupied = rng.sample(names, int(len(names) * args.occupancy))
+        for i, name in enumerate(occupied):
+            system_map.get_location(name).initialize_labware(LabwareInstance(f"plate_{i}", "96 well"))
+        # labware moves from where it is to a free location
+        free = [name for name in names if name not in occupied]
+        queries = [(rng.choice(occupied), rng.choice(free)) for _ in range(args.moves)]
+        copied = _time_queries(_available_paths_copy, system_map, queries)  # type: ignore
+        viewed = _time_queries(_available_paths_view, system_map, queries)  # type: ignore
+        print(f"{transporters:>5} {locations:>10} {copied * 1e6:>14.1f} {viewed * 1e6:>14.1f} {copied / viewed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Measures the total work of the reservation coordinator's ticks with and without sharding the coordinator by zone.
+
+Runs generated workcells of a growing number of transporters in a line, joined by handoff pads, with a thread per
+transporter on the virtual clock.  A single tick loop reclaims expired leases and rescans the waiting requests of every
+shard that changed since its last rescan.  Unsharded, any change rescans every waiting request of the workcell.  Zoned,
+each transporter's positions form a zone and a change only rescans the requests waiting in its zone, the handoff pads are
+kept by a shared shard.  Reports the ticks, the shard rescans, the waiting requests rescanned over the run, the largest
+tick's wall time, which holds up the event loop, the total wall time spent ticking and the makespan.
+
+Usage:
+    python benchmarks/sharded_ticks.py --transporters 2 4 6 --seeds 0 1 2
+"""
+import argparse
+import logging
+import time
+from typing import List
+
+from orca.simulation.generator import WorkcellSpec, generate_workcell
+from orca.simulation.runner import simulate_workflow_runs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transporters", nargs="+", type=int, default=[2, 4, 6])
+    parser.add_argument("--threads-per-transporter", type=int, default=1)
+    parser.add_argument("--devices-per-transporter", type=int, default=4)
+    parser.add_argument("--methods", type=int, default=3)
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0, 1, 2])
+    parser.add_argument("--max-duration", type=float, default=20000.0, help="Simulated seconds before unfinished runs are cancelled")
+    args = parser.parse_args()
+    logging.getLogger("orca").setLevel(logging.ERROR)
+
+    print(f"{'arms':>5} {'seed':>5} {'zoned':>6} {'ticks':>7} {'rescans':>8} {'rescanned':>10} "
+          f"{'max tick us':>12} {'total tick ms':>14} {'makespan s':>11} {'completed':>10}")
+    for transporters in args.transporters:
+        for seed in args.seeds:
+            for zoned in (False, True):
+                spec = WorkcellSpec(transporters=transporters, devices=args.devices_per_transporter * transporters,
+                                    threads=args.threads_per_transporter * transporters, methods_per_thread=args.methods,
+                                    seed=seed, zoned=zoned)
+                workcell = generate_workcell(spec)
+                coordinator = workcell.system.reservation_coordinator
+                tick_times: List[float] = []
+                rescanned: List[int] = []
+                on_tick = coordinator._on_tick
+                detect_dead_lock = coordinator._detect_dead_lock
+
+                async def timed_tick() -> None:
+                    start = time.perf_counter()
+                    await on_tick()
+                    tick_times.append(time.perf_counter() - start)
+
+                def counted_rescan(queue) -> None:  # type: ignore[no-untyped-def]
+                    rescanned.append(len(queue))
+                    detect_dead_lock(queue)
+                coordinator._on_tick = timed_tick  # type: ignore[method-assign]
+                coordinator._detect_dead_lock = counted_rescan  # type: ignore[method-assign]
+
+                result = simulate_workflow_runs(workcell.system, workcell.workflow, max_duration=args.max_duration)
+                print(f"{transporters:>5} {seed:>5} {str(zoned):>6} {len(tick_times):>7} {len(rescanned):>8} {sum(rescanned):>10} "
+                      f"{max(tick_times, default=0.0) * 1e6:>12.1f} {sum(tick_times) * 1e3:>14.1f} {result.makespan:>11.0f} "
+                      f"{result.completed_runs:>10}")
+                for error in result.errors[:3]:
+                    print(f"    error: {error}")
+
+
+if __name__ == "__main__":
+    main()
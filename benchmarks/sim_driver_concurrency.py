@@ -0,0 +1,74 @@
+"""Compares the wall-clock makespan of simulated drivers in blocking and concurrent mode.
+
+Each simulated device executes a sequence of commands while each simulated arm performs
+pick/place cycles.  On real hardware these operations overlap, so the concurrent makespan
+should approach the longest single sequence, while the blocking makespan grows with the
+total number of operations in the system.
+
+Usage:
+    python benchmarks/sim_driver_concurrency.py --devices 20 --arms 3 --operations 5
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+from orca.driver_management.drivers.simulation_labware_placeable.simulation_labware_placeable import SimulationDeviceDriver
+from orca.driver_management.drivers.simulation_robotic_arm.simulation_robotic_arm import SimulationRoboticArmDriver
+
+
+async def _run_device(driver: SimulationDeviceDriver, operations: int) -> None:
+    for _ in range(operations):
+        await driver.prepare_for_place("plate", "plate_type")
+        await driver.notify_placed("plate", "plate_type")
+        await driver.execute("run", {})
+        await driver.prepare_for_pick("plate", "plate_type")
+        await driver.notify_picked("plate", "plate_type")
+
+
+async def _run_arm(driver: SimulationRoboticArmDriver, operations: int) -> None:
+    for _ in range(operations):
+        await driver.pick("a", "plate_type")
+        await driver.place("b", "plate_type")
+
+
+async def _run_workcell(devices: int, arms: int, operations: int, sim_time: float, concurrent: bool) -> None:
+    device_drivers: List[SimulationDeviceDriver] = [
+        SimulationDeviceDriver(f"device_{i}", "device", sim_time, concurrent) for i in range(devices)
+    ]
+    arm_drivers: List[SimulationRoboticArmDriver] = [
+        SimulationRoboticArmDriver(f"arm_{i}", "arm", ["a", "b"], sim_time, concurrent) for i in range(arms)
+    ]
+    await asyncio.gather(
+        *[_run_device(d, operations) for d in device_drivers],
+        *[_run_arm(a, operations) for a in arm_drivers],
+    )
+
+
+def measure_makespan(devices: int, arms: int, operations: int, sim_time: float, concurrent: bool) -> float:
+    start = time.perf_counter()
+    asyncio.run(_run_workcell(devices, arms, operations, sim_time, concurrent))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, default=20)
+    parser.add_argument("--arms", type=int, default=3)
+    parser.add_argument("--operations", type=int, default=5, help="Command cycles per device and pick/place cycles per arm")
+    parser.add_argument("--sim-time", type=float, default=0.01, help="Simulated seconds per driver operation")
+    args = parser.parse_args()
+
+    blocking = measure_makespan(args.devices, args.arms, args.operations, args.sim_time, concurrent=False)
+    concurrent = measure_makespan(args.devices, args.arms, args.operations, args.sim_time, concurrent=True)
+    ideal = args.operations * 5 * args.sim_time
+
+    print(f"devices={args.devices} arms={args.arms} operations={args.operations} sim_time={args.sim_time}s")
+    print(f"blocking makespan:   {blocking:8.3f}s")
+    print(f"concurrent makespan: {concurrent:8.3f}s")
+    print(f"ideal makespan:      {ideal:8.3f}s (longest single device sequence)")
+    print(f"speedup:             {blocking / concurrent:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""Throughput benchmark suite for simulated workflows.
+
+Runs each scenario with an increasing number of plates on the virtual clock, so hours of lab time
+take seconds, and reports per configuration:
+  - plates/hour of simulated time and simulated makespan
+  - mean and p99 reservation wait (simulated seconds)
+  - event-loop lag, the wall-clock time for the loop to come back to a probe that yields control
+  - peak memory (max RSS) and CPU time per plate
+
+Plates are fed in as a stacker would, at most --concurrent-plates of them in the workcell at a time, since a workcell
+holding more plates than its devices and pads have room for deadlocks however its reservations are ordered.
+
+Each configuration runs in a fresh process so memory and CPU numbers are not shared between runs.
+Results are written as JSON for tracking regressions between releases.
+
+Scenarios:
+  smc        examples/smc_assay, one workflow instance per plate, with representative device durations
+  linear     a synthetic line of devices served by a single arm, one thread per plate
+  generated  a generated two-arm workcell with pooled devices, see orca.simulation.generator, one thread per plate
+
+Usage:
+    python benchmarks/throughput.py --plates 1 10 100 500 --output throughput.json
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import queue
+import runpy
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from orca.driver_management.drivers.simulation_base.duration_models import ConstantDuration, LookupDuration, OptionDuration
+from orca.driver_management.drivers.simulation_labware_placeable.simulation_labware_placeable import SimulationDeviceDriver
+from orca.driver_management.drivers.simulation_robotic_arm.simulation_robotic_arm import SimulationRoboticArmDriver
+from orca.events.event_bus import EventBus
+from orca.resource_models.devices import Device
+from orca.resource_models.labware import LabwareTemplate
+from orca.resource_models.transporter_resource import TransporterEquipment
+from orca.simulation.generator import WorkcellSpec, generate_workcell
+from orca.simulation.runner import simulate_workflow_runs
+from orca.simulation.stats import percentile
+from orca.system.SdkToSystemBuilder import SdkToSystemBuilder
+from orca.system.resource_registry import ResourceRegistry
+from orca.system.system import System
+from orca.system.system_map import SystemMap
+from orca.workflow_models.action_template import ActionTemplate
+from orca.workflow_models.method_template import MethodTemplate
+from orca.workflow_models.thread_template import ThreadTemplate
+from orca.workflow_models.workflow_templates import WorkflowTemplate
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None  # type: ignore
+
+SMC_EXAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "examples", "smc_assay", "smc_assay_example.py")
+
+# representative, not measured, handling times in seconds
+ARM_DURATIONS = ConstantDuration(12.0)
+DEVICE_DURATIONS = LookupDuration({
+    "run": 300.0,
+    "read": 900.0,
+    "delid": 15.0,
+    "prepare_for_pick": 5.0,
+    "prepare_for_place": 5.0,
+    "notify_picked": 0.0,
+    "notify_placed": 0.0,
+}, default=5.0)
+
+
+def _apply_durations(system: System) -> None:
+    for transporter in system.transporters:
+        if isinstance(transporter.sim_driver, SimulationRoboticArmDriver):
+            transporter.sim_driver.set_duration_model(ARM_DURATIONS)
+    for equipment in system.equipments:
+        driver = getattr(equipment, "sim_driver", None)
+        if not isinstance(driver, SimulationDeviceDriver):
+            continue
+        if driver.mocking_type == "shaker":
+            driver.set_duration_model(OptionDuration("shake_time", default=DEVICE_DURATIONS))
+        elif driver.mocking_type == "vspin":
+            driver.set_duration_model(OptionDuration("time", default=DEVICE_DURATIONS))
+        else:
+            driver.set_duration_model(DEVICE_DURATIONS)
+
+
+def build_smc() -> Tuple[System, WorkflowTemplate]:
+    namespace = runpy.run_path(SMC_EXAMPLE, run_name="smc_assay")
+    system: System = namespace["system"]
+    _apply_durations(system)
+    return system, namespace["smc_workflow"]
+
+
+def build_linear(stations: int = 4) -> Tuple[System, WorkflowTemplate]:
+    plate = LabwareTemplate("plate", "96 well")
+    devices = [Device(f"station_{i}", SimulationDeviceDriver(f"station_{i}_driver", "station")) for i in range(stations)]
+    stacker_in = Device("stacker_in", SimulationDeviceDriver("stacker_in_driver", "stacker"))
+    stacker_out = Device("stacker_out", SimulationDeviceDriver("stacker_out_driver", "stacker"))
+    positions = ["stacker_in", "stacker_out"] + [d.name for d in devices]
+    arm = TransporterEquipment("arm", SimulationRoboticArmDriver("arm_driver", "arm", positions))
+
+    registry = ResourceRegistry()
+    registry.add_resources([arm, stacker_in, stacker_out, *devices])
+    system_map = SystemMap(registry)
+    system_map.assign_resources({r.name: r for r in [stacker_in, stacker_out, *devices]})
+
+    methods = [MethodTemplate(f"step_{i}", [ActionTemplate(d, "run", [plate])]) for i, d in enumerate(devices)]
+    thread = ThreadTemplate(plate, system_map.get_location("stacker_in"), system_map.get_location("stacker_out"), methods)
+    workflow = WorkflowTemplate("linear")
+    workflow.add_thread(thread, True)
+    system = SdkToSystemBuilder("linear", "synthetic linear workcell", [plate], registry, system_map, methods, [workflow], EventBus()).get_system()
+    _apply_durations(system)
+    return system, workflow
+
+
+def build_generated() -> Tuple[System, WorkflowTemplate]:
+    workcell = generate_workcell(WorkcellSpec(threads=1, arm_duration=12.0, device_duration=300.0))
+    return workcell.system, workcell.workflow
+
+
+SCENARIOS: Dict[str, Callable[[], Tuple[System, WorkflowTemplate]]] = {
+    "smc": build_smc,
+    "linear": build_linear,
+    "generated": build_generated,
+}
+
+
+def run_config(scenario: str, plates: int, max_duration: float, lag_probe_interval: float,
+               concurrent_plates: Optional[int]) -> Dict[str, Any]:
+    system, workflow = SCENARIOS[scenario]()
+    logging.getLogger("orca").setLevel(logging.ERROR)
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    result = simulate_workflow_runs(system, workflow, plates, max_duration, lag_probe_interval, concurrent_plates)
+    wall_time = time.perf_counter() - wall_start
+    cpu_time = time.process_time() - cpu_start
+
+    waits = result.reservation_waits
+    lag_ms = [lag * 1000.0 for lag in result.loop_lag]
+    return {
+        "scenario": scenario,
+        "plates": plates,
+        "concurrent_plates": concurrent_plates,
+        "completed_plates": result.completed_runs,
+        "failed_plates": result.failed_runs,
+        "timed_out": result.timed_out,
+        "makespan_s": result.makespan,
+        "plates_per_hour": result.throughput_per_hour,
+        "reservation_wait_mean_s": sum(waits) / len(waits) if waits else 0.0,
+        "reservation_wait_p99_s": percentile(waits, 99),
+        "reservation_requests": len(waits),
+        "loop_lag_mean_ms": sum(lag_ms) / len(lag_ms) if lag_ms else 0.0,
+        "loop_lag_p99_ms": percentile(lag_ms, 99),
+        "loop_lag_max_ms": max(lag_ms, default=0.0),
+        "peak_memory_mb": _peak_memory_mb(),
+        "cpu_time_s": cpu_time,
+        "cpu_time_per_plate_s": cpu_time / plates,
+        "wall_time_s": wall_time,
+        "errors": result.errors[:5],
+    }
+
+
+def _peak_memory_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return max_rss / (1024.0 * 1024.0) if sys.platform == "darwin" else max_rss / 1024.0
+
+
+def _worker(results: "multiprocessing.Queue[Dict[str, Any]]", *args: Any) -> None:
+    try:
+        results.put(run_config(*args))
+    except Exception as e:
+        results.put({"error": repr(e)})
+
+
+def run_isolated(scenario: str, plates: int, max_duration: float, lag_probe_interval: float,
+                 concurrent_plates: Optional[int], timeout: float) -> Dict[str, Any]:
+    context = multiprocessing.get_context("spawn")
+    results: "multiprocessing.Queue[Dict[str, Any]]" = context.Queue()
+    process = context.Process(target=_worker, args=(results, scenario, plates, max_duration, lag_probe_interval, concurrent_plates))
+    process.start()
+    try:
+        result = results.get(timeout=timeout)
+    except queue.Empty:
+        process.terminate()
+        result = {"error": f"exceeded wall-clock timeout of {timeout}s"}
+    process.join()
+    result.setdefault("scenario", scenario)
+    result.setdefault("plates", plates)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS.keys()), choices=list(SCENARIOS.keys()))
+    parser.add_argument("--plates", nargs="+", type=int, default=[1, 10, 100, 500])
+    parser.add_argument("--max-duration", type=float, default=7 * 24 * 3600.0, help="Simulated seconds before unfinished plates are abandoned")
+    parser.add_argument("--concurrent-plates", type=int, default=10, help="Plates in the workcell at a time, 0 starts every plate at once")
+    parser.add_argument("--lag-probe-interval", type=float, default=60.0, help="Simulated seconds between event-loop lag samples")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Wall-clock seconds allowed per configuration")
+    parser.add_argument("--output", type=str, default=None, help="File to write the JSON results to, default is stdout")
+    args = parser.parse_args()
+
+    results: List[Dict[str, Any]] = []
+    for scenario in args.scenarios:
+        for plates in args.plates:
+            result = run_isolated(scenario, plates, args.max_duration, args.lag_probe_interval,
+                                  args.concurrent_plates or None, args.timeout)
+            results.append(result)
+            print(f"{scenario:>9} plates={plates:<5} " + (f"error: {result['error']}" if "error" in result else
+                  f"completed={result['completed_plates']:<5} plates/h={result['plates_per_hour']:8.2f} "
+                  f"wall={result['wall_time_s']:7.2f}s"), file=sys.stderr)
+
+    report = {
+        "benchmark": "throughput",
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "max_duration_s": args.max_duration,
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
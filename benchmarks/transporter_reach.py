@@ -0,0 +1,83 @@
+"""Measures the cost of building a SystemMap for transporters with many teachpoints.
+
+SystemMap represents a transporter's reach as a hub, an edge from each taught position to the transporter and back,
+so the edge count grows linearly with the teachpoints.  The clique numbers build the graph SystemMap built before, two
+edges for every pair of taught positions, directly on the graph handler.  Memory is the peak traced by tracemalloc
+while building.
+
+Usage:
+    python benchmarks/transporter_reach.py --teachpoints 50 100 300 600 --transporters 2
+"""
+import argparse
+import itertools
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from orca.driver_management.drivers.simulation_robotic_arm.simulation_robotic_arm import SimulationRoboticArmDriver
+from orca.resource_models.location import Location
+from orca.resource_models.resource_extras.teachpoints import Teachpoint
+from orca.resource_models.transporter_resource import TransporterEquipment
+from orca.system.resource_registry import ResourceRegistry
+from orca.system.system_map import SystemMap, _GRAPH_BACKENDS
+
+
+def _make_transporters(transporters: int, teachpoints: int) -> List[TransporterEquipment]:
+    # neighbouring arms share one handoff position so the map is connected
+    arms: List[TransporterEquipment] = []
+    for arm in range(transporters):
+        names = [f"arm_{arm}_pos_{i}" for i in range(teachpoints - 1)] + [f"handoff_{arm}"]
+        if arm > 0:
+            names[0] = f"handoff_{arm - 1}"
+        driver = SimulationRoboticArmDriver(f"arm_{arm}_driver", "arm", [Teachpoint(name, 0.0, 0.0, 0.0) for name in names])
+        arms.append(TransporterEquipment(f"arm_{arm}", driver))
+    return arms
+
+
+def _build_hub(transporters: List[TransporterEquipment], backend: str) -> int:
+    registry = ResourceRegistry()
+    registry.add_resources(transporters)
+    system_map = SystemMap(registry, graph_backend=backend)
+    return len(system_map._graph.get_all_edges())
+
+
+def _build_clique(transporters: List[TransporterEquipment], backend: str) -> int:
+    graph = _GRAPH_BACKENDS[backend]()
+    for transporter in transporters:
+        positions = transporter.get_taught_positions()
+        for name in positions:
+            graph.add_node(name, Location(name))
+        for start, end in itertools.combinations(positions, 2):
+            graph.add_edge(start, end, transporter=transporter, weight=5.0)
+            graph.add_edge(end, start, transporter=transporter, weight=5.0)
+    return len(graph.get_all_edges())
+
+
+def _measure(build: Callable[[List[TransporterEquipment], str], int], transporters: int, teachpoints: int, backend: str) -> Tuple[int, float, float]:
+    arms = _make_transporters(transporters, teachpoints)
+    tracemalloc.start()
+    start = time.perf_counter()
+    edges = build(arms, backend)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return edges, elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teachpoints", nargs="+", type=int, default=[50, 100, 300])
+    parser.add_argument("--transporters", type=int, default=2)
+    parser.add_argument("--backend", choices=list(_GRAPH_BACKENDS), default="networkx")
+    args = parser.parse_args()
+
+    print(f"{'teachpoints':>12} {'clique edges':>13} {'hub edges':>10} {'clique ms':>10} {'hub ms':>8} {'clique MB':>10} {'hub MB':>8}")
+    for teachpoints in args.teachpoints:
+        clique_edges, clique_time, clique_peak = _measure(_build_clique, args.transporters, teachpoints, args.backend)
+        hub_edges, hub_time, hub_peak = _measure(_build_hub, args.transporters, teachpoints, args.backend)
+        print(f"{teachpoints:>12} {clique_edges:>13} {hub_edges:>10} {clique_time * 1e3:>10.1f} {hub_time * 1e3:>8.1f} "
+              f"{clique_peak / 1e6:>10.1f} {hub_peak / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -47,7 +47,7 @@ labwares = [
 # Setup your devices, each device needs a driver assigneed to it
 # Transorter equipment are devices capable of moving labwaare
 # For this simulation, the teachpoints are saved within a local file
-teachpoints_dir = "examples\\smc_assay\\teachpoints"
+teachpoints_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "teachpoints")
 ddr1_points = os.path.join(teachpoints_dir, "ddr1.xml")
 ddr2_points = os.path.join(teachpoints_dir, "ddr2.xml")
 ddr3_points = os.path.join(teachpoints_dir, "ddr3.xml")
@@ -102,6 +102,7 @@ resource_registry.add_resources([
     centrifuge, 
     plate_hotel,
     delidder,
+    smc_pro,
     ddr_1,
     ddr_2,
     ddr_3,
@@ -142,6 +143,7 @@ map.assign_resources({
     "centrifuge": centrifuge,
     "plate_hotel": plate_hotel,
     "delidder": delidder,
+    "smc_pro": smc_pro,
     "stacker_1": stacker_sample_start,
     "stacker_2": stacker_sample_end,
     "stacker_3": stacker_plate_1_start,
@@ -459,12 +461,17 @@ class SpawnNewOnFourthPlate(SystemBoundEventHandler):
         self._attach_thread = attach_thread
         self._previous_thread: ExecutingLabwareThread | None = None
         self._num_of_spawns = 0
+        self._thread_completed = asyncio.Event()
     
     def handle(self, event: str, context: ExecutionContext) -> None:
-        """Handles the THREAD.CREATED event by checking if the created thread is the one we are interested in."""
+        """Handles the THREAD.CREATED event of the thread we are interested in, and its THREAD.COMPLETED event to wake the spawns waiting for it."""
         assert isinstance(context, ThreadExecutionContext), "Context must be of type ThreadExecutionContext"
         if event == "THREAD.CREATED" and context.thread_name == self._attach_thread.name:
             self._handle_thread_created_event(context)
+        elif event == "THREAD.COMPLETED" and context.thread_name == self._attach_thread.name:
+            # wake the spawns waiting for a previous thread, then wait again on a fresh event
+            self._thread_completed.set()
+            self._thread_completed = asyncio.Event()
     
     def _handle_thread_created_event(self, context: ThreadExecutionContext):
         """Handles the THREAD.CREATED event by checking if the thread is the one we are interested in and setting the start location of the new thread."""
@@ -483,7 +490,7 @@ class SpawnNewOnFourthPlate(SystemBoundEventHandler):
         if self._previous_thread is None:
             return
         while self._previous_thread.status != LabwareThreadStatus.COMPLETED:
-            await asyncio.sleep(1)
+            await self._thread_completed.wait()
         thread_instance = self.system.create_and_register_thread_instance(self._attach_thread)
         thread_instance.start_location = self._previous_thread.end_location
         workflow_context = WorkflowExecutionContext(context.workflow_id, context.workflow_name)
@@ -495,8 +502,12 @@ class SpawnNewOnFourthPlate(SystemBoundEventHandler):
 # Create an instance of the SpawnNewOnFourthPlate event handler and add it to the workflow 
 tips_384_spawner = SpawnNewOnFourthPlate(tips_384_thread)
 # Add all event hooks to the workflow by subscribing to the THREAD.CREATED event
+final_plate_spawner = SpawnNewOnFourthPlate(final_plate_thread)
 smc_workflow.add_event_handler("THREAD.CREATED", tips_384_spawner)
-smc_workflow.add_event_handler("THREAD.CREATED", SpawnNewOnFourthPlate(final_plate_thread))
+smc_workflow.add_event_handler("THREAD.CREATED", final_plate_spawner)
+# and to the THREAD.COMPLETED event to start the next thread once the previous one has completed
+smc_workflow.add_event_handler("THREAD.COMPLETED", tips_384_spawner)
+smc_workflow.add_event_handler("THREAD.COMPLETED", final_plate_spawner)
 
 # Create an event bus to handle events in the system
 event_bus = EventBus()
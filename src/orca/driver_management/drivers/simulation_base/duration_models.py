@@ -0,0 +1,168 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+import random
+from typing import Any, Dict, Optional, Sequence
+
+
+@dataclass(frozen=True)
+class SimulatedOperation:
+    """ Describes a single simulated driver operation for a duration model to price.
+    Attributes:
+        driver_name (str): The name of the simulation driver running the operation.
+        mocking_type (Optional[str]): The type of equipment the driver is mocking, e.g. "vspin".
+        command (str): The command being executed, or the driver operation for labware interactions,
+            e.g. "spin", "initialize", "prepare_for_pick", "notify_placed", "pick", "place".
+        options (Dict[str, Any]): The options passed with the command.
+        labware_type (Optional[str]): The type of labware involved in the operation, if any.
+    """
+    driver_name: str
+    mocking_type: Optional[str]
+    command: str
+    options: Dict[str, Any] = field(default_factory=dict)
+    labware_type: Optional[str] = None
+
+
+class IDurationModel(ABC):
+    """ Determines how long a simulated operation takes."""
+
+    @abstractmethod
+    def get_duration(self, operation: SimulatedOperation) -> float:
+        raise NotImplementedError
+
+    def reseed(self, seed: Optional[int]) -> None:
+        """ Resets any random number generators used by the model.  Deterministic models ignore this."""
+        pass
+
+
+DurationSpec = float | IDurationModel
+
+
+def as_duration_model(spec: DurationSpec) -> IDurationModel:
+    """ Returns the spec as a duration model, wrapping plain numbers in a ConstantDuration."""
+    if isinstance(spec, IDurationModel):
+        return spec
+    return ConstantDuration(spec)
+
+
+class ConstantDuration(IDurationModel):
+    """ Every operation takes the same number of seconds."""
+    def __init__(self, seconds: float) -> None:
+        if seconds < 0:
+            raise ValueError(f"Duration must not be negative, got {seconds}")
+        self._seconds = float(seconds)
+
+    def get_duration(self, operation: SimulatedOperation) -> float:
+        return self._seconds
+
+    def __repr__(self) -> str:
+        return f"ConstantDuration({self._seconds})"
+
+
+class _RandomDuration(IDurationModel, ABC):
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self._rng = random.Random(seed)
+
+    def reseed(self, seed: Optional[int]) -> None:
+        self._rng.seed(seed)
+
+
+class NormalDuration(_RandomDuration):
+    """ Durations are drawn from a normal distribution, clipped at a minimum."""
+    def __init__(self, mean: float, stdev: float, seed: Optional[int] = None, minimum: float = 0.0) -> None:
+        """
+        Args:
+            mean (float): The mean duration in seconds.
+            stdev (float): The standard deviation of the duration in seconds.
+            seed (Optional[int]): The seed of the random number generator.
+            minimum (float): Samples below this value are clipped to it, default is 0.0.
+        """
+        super().__init__(seed)
+        self._mean = mean
+        self._stdev = stdev
+        self._minimum = minimum
+
+    def get_duration(self, operation: SimulatedOperation) -> float:
+        return max(self._minimum, self._rng.gauss(self._mean, self._stdev))
+
+
+class UniformDuration(_RandomDuration):
+    """ Durations are drawn uniformly between a low and high value."""
+    def __init__(self, low: float, high: float, seed: Optional[int] = None) -> None:
+        if low < 0 or high < low:
+            raise ValueError(f"Invalid uniform duration range [{low}, {high}]")
+        super().__init__(seed)
+        self._low = low
+        self._high = high
+
+    def get_duration(self, operation: SimulatedOperation) -> float:
+        return self._rng.uniform(self._low, self._high)
+
+
+class SampledDuration(_RandomDuration):
+    """ Durations are drawn from a set of observed durations, e.g. from a run log."""
+    def __init__(self, samples: Sequence[float], seed: Optional[int] = None) -> None:
+        if len(samples) == 0:
+            raise ValueError("At least one sample is required")
+        super().__init__(seed)
+        self._samples = list(samples)
+
+    def get_duration(self, operation: SimulatedOperation) -> float:
+        return self._rng.choice(self._samples)
+
+
+class LookupDuration(IDurationModel):
+    """ Looks up the duration model from a table keyed by an attribute of the operation.
+    By default the table is keyed by command, so labware interactions can be priced by name:
+
+        LookupDuration({"spin": 600, "prepare_for_pick": 15, "notify_placed": 0}, default=1.0)
+
+    Tables can be nested, e.g. a table keyed by mocking_type holding tables keyed by command.
+    """
+    _KEYS = ("command", "mocking_type", "driver_name", "labware_type")
+
+    def __init__(self, durations: Dict[str, DurationSpec], default: DurationSpec = 0.2, key: str = "command") -> None:
+        """
+        Args:
+            durations (Dict[str, DurationSpec]): The duration, in seconds or as a model, for each key.
+            default (DurationSpec): The duration used for keys not in the table, default is 0.2 seconds.
+            key (str): The attribute of the operation to look up: "command", "mocking_type", "driver_name" or "labware_type".
+        """
+        if key not in self._KEYS:
+            raise ValueError(f"Invalid lookup key '{key}', expected one of {self._KEYS}")
+        self._durations = {name: as_duration_model(spec) for name, spec in durations.items()}
+        self._default = as_duration_model(default)
+        self._key = key
+
+    def get_duration(self, operation: SimulatedOperation) -> float:
+        model = self._durations.get(getattr(operation, self._key), self._default)
+        return model.get_duration(operation)
+
+    def reseed(self, seed: Optional[int]) -> None:
+        for model in self._durations.values():
+            model.reseed(seed)
+        self._default.reseed(seed)
+
+
+class OptionDuration(IDurationModel):
+    """ Reads the duration from a command option, e.g. a shaker's "shake_time" or a centrifuge's "time"."""
+    def __init__(self, option_name: str, default: DurationSpec = 0.2, scale: float = 1.0, offset: float = 0.0) -> None:
+        """
+        Args:
+            option_name (str): The name of the option holding the duration.
+            default (DurationSpec): The duration used when the option is not given, default is 0.2 seconds.
+            scale (float): Multiplier converting the option value to seconds, e.g. 60 for minutes, default is 1.0.
+            offset (float): Seconds added to the option-derived duration, e.g. for ramp up and down, default is 0.0.
+        """
+        self._option_name = option_name
+        self._default = as_duration_model(default)
+        self._scale = scale
+        self._offset = offset
+
+    def get_duration(self, operation: SimulatedOperation) -> float:
+        value = operation.options.get(self._option_name)
+        if value is None:
+            return self._default.get_duration(operation)
+        return float(value) * self._scale + self._offset
+
+    def reseed(self, seed: Optional[int]) -> None:
+        self._default.reseed(seed)
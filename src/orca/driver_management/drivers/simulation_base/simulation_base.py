@@ -1,20 +1,40 @@
+import asyncio
 import logging
 import time
 from typing import Any, Dict, Optional
 
 from orca_driver_interface.driver_interfaces import IDriver
+from orca.driver_management.drivers.simulation_base.duration_models import ConstantDuration, IDurationModel, SimulatedOperation
 
 orca_logger = logging.getLogger("orca")
 
 class SimulationBaseDriver(IDriver):
-    def __init__(self, name: str, mocking_type: Optional[str] = None, sim_time: float = 0.2):
+    def __init__(self,
+                 name: str,
+                 mocking_type: Optional[str] = None,
+                 sim_time: float = 0.2,
+                 concurrent: bool = True,
+                 duration_model: Optional[IDurationModel] = None):
+        """ Initializes the SimulationBaseDriver.
+        Args:
+            name (str): The name of the driver.
+            mocking_type (Optional[str]): The type of equipment this simulation is mocking.
+            sim_time (float): The time to simulate for each operation when no duration model is given, default is 0.2 seconds.
+            concurrent (bool): If True, simulated operations await without blocking the event loop so operations on different drivers overlap.
+                If False, operations block the event loop with time.sleep, serializing the whole system.  Default is True.
+            duration_model (Optional[IDurationModel]): Determines the simulated time of each operation from its command and options.
+                Overrides sim_time when given.
+        """
         self._name: str = name
         self._mocking_type = mocking_type
         self._init_options: Dict[str, Any] = {}
         self._is_initialized: bool = False
-        self._is_running: bool = False
+        self._running_operations: int = 0
+        self._busy_time: float = 0.0
+        self._operation_count: int = 0
         self._connected: bool = False
-        self._sim_time = sim_time
+        self._duration_model: IDurationModel = duration_model if duration_model is not None else ConstantDuration(sim_time)
+        self._concurrent = concurrent
 
     @property
     def name(self) -> str:
@@ -26,7 +46,39 @@ class SimulationBaseDriver(IDriver):
 
     @property
     def is_running(self) -> bool:
-        return self._is_running
+        return self._running_operations > 0
+
+    @property
+    def busy_time(self) -> float:
+        """The total simulated time in seconds spent running operations since the last reset."""
+        return self._busy_time
+
+    @property
+    def operation_count(self) -> int:
+        """The number of simulated operations run since the last reset."""
+        return self._operation_count
+
+    def reset_statistics(self) -> None:
+        self._busy_time = 0.0
+        self._operation_count = 0
+
+    @property
+    def is_concurrent(self) -> bool:
+        return self._concurrent
+
+    def set_concurrent(self, concurrent: bool) -> None:
+        self._concurrent = concurrent
+
+    @property
+    def mocking_type(self) -> Optional[str]:
+        return self._mocking_type
+
+    @property
+    def duration_model(self) -> IDurationModel:
+        return self._duration_model
+
+    def set_duration_model(self, duration_model: IDurationModel) -> None:
+        self._duration_model = duration_model
 
     @property
     def is_connected(self) -> bool:
@@ -42,17 +94,31 @@ class SimulationBaseDriver(IDriver):
         self._init_options = init_options
 
     async def initialize(self) -> None:
-        self._sleep()
+        await self._simulate("initialize", self._init_options)
         self._is_initialized = True
 
     async def execute(self, command: str, options: Dict[str, Any]) -> None:
         orca_logger.info(f"{self._name} executing command: {command}")
         if len(options.keys()) > 0:
             orca_logger.info(f"Options: {options}")
-        self._sleep()
+        await self._simulate(command, options)
         orca_logger.info(f"{self._name} executed command: {command}")
 
-    def _sleep(self) -> None:
-        self._is_running = True
-        time.sleep(self._sim_time)
-        self._is_running = False
\ No newline at end of file
+    def _get_duration(self, command: str, options: Optional[Dict[str, Any]] = None, labware_type: Optional[str] = None) -> float:
+        operation = SimulatedOperation(self._name, self._mocking_type, command, options or {}, labware_type)
+        return self._duration_model.get_duration(operation)
+
+    async def _simulate(self, command: str, options: Optional[Dict[str, Any]] = None, labware_type: Optional[str] = None) -> None:
+        await self._sleep(self._get_duration(command, options, labware_type))
+
+    async def _sleep(self, duration: float) -> None:
+        self._running_operations += 1
+        self._operation_count += 1
+        self._busy_time += duration
+        try:
+            if self._concurrent:
+                await asyncio.sleep(duration)
+            else:
+                time.sleep(duration)
+        finally:
+            self._running_operations -= 1
@@ -9,20 +9,20 @@ class SimulationDeviceDriver(SimulationBaseDriver, ILabwarePlaceableDriver):
 
     async def prepare_for_pick(self, labware_name: str, labware_type: str, barcode: Optional[str] = None, alias: Optional[str] = None) -> None:
         orca_logger.info(f"Driver: {self._name} preparing for pick...")
-        self._sleep()
+        await self._simulate("prepare_for_pick", labware_type=labware_type)
         orca_logger.info(f"Driver: {self._name} prepared for pick")
 
     async def prepare_for_place(self, labware_name: str, labware_type: str, barcode: Optional[str] = None, alias: Optional[str] = None) -> None:
         orca_logger.info(f"Driver: {self._name} preparing for place...")
-        self._sleep()
+        await self._simulate("prepare_for_place", labware_type=labware_type)
         orca_logger.info(f"Driver: {self._name} prepared for place")
 
     async def notify_picked(self, labware_name: str, labware_type: str, barcode: Optional[str] = None, alias: Optional[str] = None) -> None:
         orca_logger.info(f"Driver: {self._name} notified picked...")
-        self._sleep()
+        await self._simulate("notify_picked", labware_type=labware_type)
         orca_logger.info(f"Driver: {self._name} notified picked")
 
     async def notify_placed(self, labware_name: str, labware_type: str, barcode: Optional[str] = None, alias: Optional[str] = None) -> None:
         orca_logger.info(f"Driver: {self._name} notified placed...")
-        self._sleep()
+        await self._simulate("notify_placed", labware_type=labware_type)
         orca_logger.info(f"Driver: {self._name} notified placed")
\ No newline at end of file
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Any, Dict, List
 
@@ -53,15 +54,19 @@ class HumanTransferDriver(ITransporterDriver):
     async def pick(self, position_name: str, labware_type: str) -> None:
         self._validate_position(position_name)
         orca_logger.info(f"Driver: {self._name} picking from {position_name}, labware type: {labware_type} picking...")
-        input(f"Press Enter once the labware {labware_type} is picked up from {position_name}...")
+        await self._wait_for_operator(f"Press Enter once the labware {labware_type} is picked up from {position_name}...")
         orca_logger.info(f"Driver: {self._name} picked from {position_name}, labware type: {labware_type} picked")
 
     async def place(self, position_name: str, labware_type: str) -> None:
         self._validate_position(position_name)
         orca_logger.info(f"Driver: {self._name} placing to {position_name}, labware type: {labware_type} placing...")
-        input(f"Press Enter once the labware {labware_type} is placed to {position_name}...")
+        await self._wait_for_operator(f"Press Enter once the labware {labware_type} is placed to {position_name}...")
         orca_logger.info(f"Driver: {self._name} placed to {position_name}, labware type: {labware_type} placed")
 
+    async def _wait_for_operator(self, prompt: str) -> None:
+        # input() blocks, so wait for the operator on a worker thread to keep the rest of the system running
+        await asyncio.to_thread(input, prompt)
+
     def _validate_position(self, position_name: str) -> None:
         if position_name not in self._positions:
             raise ValueError(f"The position '{position_name}' is not taught for {self._name}")
@@ -1,62 +1,130 @@
+from dataclasses import dataclass
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 
+from orca.driver_management.drivers.simulation_base.duration_models import IDurationModel
 from orca.driver_management.drivers.simulation_base.simulation_base import SimulationBaseDriver
 from orca.resource_models.resource_extras.teachpoints import Teachpoint
 from orca_driver_interface.transporter_interfaces import ITransporterDriver
 
 orca_logger = logging.getLogger("orca")
 
+
+@dataclass(frozen=True)
+class JointVelocities:
+    """ The speed of each joint of a simulated arm, in teachpoint joint units (e.g. degrees) per second."""
+    shoulder: float = 90.0
+    elbow: float = 90.0
+    wrist: float = 180.0
+
+    def __post_init__(self) -> None:
+        if self.shoulder <= 0 or self.elbow <= 0 or self.wrist <= 0:
+            raise ValueError(f"Joint velocities must be positive: {self}")
+
+
 class SimulationRoboticArmDriver(SimulationBaseDriver, ITransporterDriver):
-    """ A simulation driver for a robotic arm that can pick and place labware."""
-    def __init__(self, 
-                 name: str, 
-                 mocking_type: Optional[str] = None, 
-                 teachpoints: str | List[str] | None = None, 
-                 sim_time: float = 0.2
+    """ A simulation driver for a robotic arm that can pick and place labware.
+    Each pick and place takes the time to travel from the arm's current teachpoint to the target teachpoint in joint space,
+    with all joints moving at once, plus the handling time given by the duration model."""
+    def __init__(self,
+                 name: str,
+                 mocking_type: Optional[str] = None,
+                 teachpoints: str | List[str] | List[Teachpoint] | None = None,
+                 sim_time: float = 0.2,
+                 concurrent: bool = True,
+                 duration_model: Optional[IDurationModel] = None,
+                 joint_velocities: Optional[JointVelocities] = None
                  ) -> None:
         """ Initializes the SimulationRoboticArmDriver with a name, mocking type, and optional teachpoints.
         Args:
             name (str): The name of the driver.
             mocking_type (Optional[str]): The type of equipment this simulation is mocking, e.g., "robotic_arm".
-            teachpoints (str | List[str] | None): The teachpoints to use for the robotic arm, can be a file path or a list of position names.
-            sim_time (float): The time to simulate for each operation, default is 0.2 seconds.
+            teachpoints (str | List[str] | List[Teachpoint] | None): The teachpoints to use for the robotic arm, can be a file path, a list of position names or a list of teachpoints.
+                Position names have no joint values, so travel between them takes no time.
+            sim_time (float): The handling time to simulate for each operation, default is 0.2 seconds.
+            concurrent (bool): If True, simulated operations do not block the event loop, default is True.
+            duration_model (Optional[IDurationModel]): Determines the simulated handling time of each pick and place, overrides sim_time when given.
+            joint_velocities (Optional[JointVelocities]): The joint speeds used to compute travel time between teachpoints.
         """
-        super().__init__(name, mocking_type, sim_time)
-        self._positions: List[str] = []
+        super().__init__(name, mocking_type, sim_time, concurrent, duration_model)
+        self._teachpoints: Dict[str, Teachpoint] = {}
+        self._current_position: Optional[Teachpoint] = None
+        self._joint_velocities = joint_velocities if joint_velocities is not None else JointVelocities()
         self.set_teachpoints(teachpoints if teachpoints is not None else [])
 
+    @property
+    def current_position(self) -> Optional[str]:
+        """ The name of the teachpoint the arm last moved to, None if it has not moved yet."""
+        return self._current_position.name if self._current_position is not None else None
 
-    async def initialize(self) -> None:
-        self._sleep()
-        self._is_initialized = True
+    @property
+    def joint_velocities(self) -> JointVelocities:
+        return self._joint_velocities
+
+    def set_joint_velocities(self, joint_velocities: JointVelocities) -> None:
+        self._joint_velocities = joint_velocities
+
+    def set_init_options(self, init_options: Dict[str, Any]) -> None:
+        super().set_init_options(init_options)
+        if "positions" in init_options:
+            self.set_teachpoints(init_options["positions"])
 
     async def pick(self, position_name: str, labware_type: str) -> None:
         self._validate_position(position_name)
         orca_logger.info(f"Driver: {self._name} picking from {position_name}, labware type: {labware_type} picking...")
-        self._sleep()
+        await self._move_and_handle("pick", position_name, labware_type)
         orca_logger.info(f"Driver: {self._name} picked from {position_name}, labware type: {labware_type} picked")
 
     async def place(self, position_name: str, labware_type: str) -> None:
         self._validate_position(position_name)
         orca_logger.info(f"Driver: {self._name} placing to {position_name}, labware type: {labware_type} placing...")
-        self._sleep()
+        await self._move_and_handle("place", position_name, labware_type)
         orca_logger.info(f"Driver: {self._name} placed to {position_name}, labware type: {labware_type} placed")
 
+    async def _move_and_handle(self, command: str, position_name: str, labware_type: str) -> None:
+        target = self._teachpoints[position_name]
+        travel_time = self.get_travel_time(self.current_position, position_name)
+        handling_time = self._get_duration(command, {"position": position_name, "travel_time": travel_time}, labware_type)
+        await self._sleep(travel_time + handling_time)
+        self._current_position = target
+
+    def get_travel_time(self, start: Optional[str], end: str) -> float:
+        """ Returns the time in seconds to move between two teachpoints, the slowest joint determines the travel time.
+        Args:
+            start (Optional[str]): The starting teachpoint, None if the arm's position is unknown, which costs no travel time.
+            end (str): The target teachpoint.
+        """
+        self._validate_position(end)
+        if start is None:
+            return 0.0
+        self._validate_position(start)
+        a = self._teachpoints[start]
+        b = self._teachpoints[end]
+        velocities = self._joint_velocities
+        return max(
+            abs((b.shoulder or 0.0) - (a.shoulder or 0.0)) / velocities.shoulder,
+            abs((b.elbow or 0.0) - (a.elbow or 0.0)) / velocities.elbow,
+            abs((b.wrist or 0.0) - (a.wrist or 0.0)) / velocities.wrist,
+        )
+
     def _validate_position(self, position_name: str) -> None:
-        if position_name not in self._positions:
+        if position_name not in self._teachpoints:
             raise ValueError(f"The position '{position_name}' is not taught for {self._name}")
 
     def get_taught_positions(self) -> List[str]:
-        return self._positions
-    
-    def set_teachpoints(self, teachpoints: str | List[str]) -> None:
+        return list(self._teachpoints.keys())
+
+    def get_teachpoints(self) -> List[Teachpoint]:
+        return list(self._teachpoints.values())
+
+    def set_teachpoints(self, teachpoints: str | List[str] | List[Teachpoint]) -> None:
         if isinstance(teachpoints, str):
-            self._positions = self._load_taught_positions(teachpoints)
+            points = Teachpoint.load_teachpoints_from_file(teachpoints)
         elif isinstance(teachpoints, list):
-            self._positions = teachpoints
-
-    def _load_taught_positions(self, filepath: str) -> List[str]:
-        return [t.name for t in Teachpoint.load_teachpoints_from_file(filepath)]
-  
\ No newline at end of file
+            points = [t if isinstance(t, Teachpoint) else Teachpoint(t, 0.0, 0.0, 0.0) for t in teachpoints]
+        else:
+            return
+        self._teachpoints = {t.name: t for t in points}
+        if self._current_position is not None and self._current_position.name not in self._teachpoints:
+            self._current_position = None
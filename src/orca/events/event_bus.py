@@ -32,6 +32,9 @@ class EventBus(IEventBus):
     def subscribe(self, event_name: str, handler: EventHandlerType) -> None:
         if event_name not in self._subscribers:
             self._subscribers[event_name] = []
+        # handlers are subscribed again each time a workflow template is instantiated
+        if handler in self._subscribers[event_name]:
+            return
         self._subscribers[event_name].append(handler)
 
     def unsubscribe(self, event_name: str, handler: EventHandlerType) -> None:
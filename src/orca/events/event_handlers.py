@@ -27,14 +27,21 @@ class Spawn(SystemBoundEventHandler):
         assert context.method_id is not None, "Method ID must be provided in the context for Spawn event handler"
         if context.method_name != self._parent_method.name:
             return
+        # the same workflow template may be running as several workflow instances
+        if context.workflow_id != self._parent_workflow_id:
+            return
 
         if event == "METHOD.IN_PROGRESS":
             workflow = self.system.get_executing_workflow(self._parent_workflow_id)
+            start_after = None
             if self._join_method:
                 method = self.system.get_executing_method(context.method_id)
                 self._spawn_thread.set_wrapped_method(method)
+                # a joining thread starts once the method holds its action's location, so it doesn't take up shared
+                # resources, e.g. a delidder, while the method still waits for that location
+                start_after = method.action_resolved
             thread_instance = self.system.create_and_register_thread_instance(self._spawn_thread)
-            workflow.add_and_start_thread(thread_instance)
+            workflow.add_and_start_thread(thread_instance, start_after)
             # thread = self.system.start_labware_thread(self._spawn_thread)
             # self.system.add_thread(thread)        
 
@@ -72,6 +72,16 @@ class ILabwarePlaceable(ABC):
     @property
     def labware(self) -> Optional[LabwareInstance]:
         raise NotImplementedError
+
+    @property
+    def capacity(self) -> int:
+        """The number of labware the resource holds at once, e.g. the slots of a plate hotel or stacker."""
+        return 1
+
+    @property
+    def labwares(self) -> List[LabwareInstance]:
+        """All labware the resource holds, including labware loaded into it rather than on its stage."""
+        return [self.labware] if self.labware is not None else []
     
     def initialize_labware(self, labware: LabwareInstance) -> None:
         # TODO: Make async in future
@@ -1,29 +1,40 @@
 from orca.driver_management.driver_interfaces import ISealer, ITempGettable, ITempSettable
 from orca.driver_management.drivers.sealers.a4s_sealer import A4SSealerDriver
+from orca.driver_management.drivers.simulation_base.simulation_base import SimulationBaseDriver
 from orca.driver_management.drivers.simulation_labware_placeable.simulation_labware_placeable import SimulationDeviceDriver
 from orca.resource_models.base_resource import Equipment, EquipmentLabwareRegistry, ILabwarePlaceable, ISimulationable, orca_logger
+from orca.resource_models.device_error import DeviceBusyError
 from orca.resource_models.labware import LabwareInstance
 
 
 from orca_driver_interface.driver_interfaces import ILabwarePlaceableDriver
 
 
+import asyncio
 from typing import List, Optional
 
 
 class Device(Equipment, ILabwarePlaceable, ISimulationable):
     """A class that represents a device that can operate on labware."""
-    def __init__(self, name: str, driver: ILabwarePlaceableDriver, sim: bool = False) -> None:
+    def __init__(self, name: str, driver: ILabwarePlaceableDriver, sim: bool = False, capacity: int = 1) -> None:
         """Initialize the device with a name and a driver.
+        If the driver is already a simulation driver, it is also used while simulating so its duration model is kept.
         Args:
             name (str): The name of the device.
             driver (ILabwarePlaceableDriver): The driver for the device.
+            capacity (int): The number of labware the device holds at once, e.g. the slots of a plate hotel or stacker.
+                Labware is placed and picked through the device's single stage one at a time.
         """
+        if capacity < 1:
+            raise ValueError(f"Device {name} must hold at least one labware, got capacity {capacity}")
         super().__init__(name, driver)
+        self._capacity = capacity
         self._live_driver: ILabwarePlaceableDriver = driver
-        self._sim_driver: ILabwarePlaceableDriver = SimulationDeviceDriver(name, driver.name)
+        self._sim_driver: ILabwarePlaceableDriver = driver if isinstance(driver, SimulationBaseDriver) else SimulationDeviceDriver(name, driver.name)
         self._driver: ILabwarePlaceableDriver = driver
         self._labware_reg = EquipmentLabwareRegistry()
+        # set whenever the stage is cleared, then replaced for the next wait
+        self._stage_cleared = asyncio.Event()
         self._sim = False
         self.set_simulating(sim)
 
@@ -40,6 +51,17 @@ class Device(Equipment, ILabwarePlaceable, ISimulationable):
         else:
             self._driver = self._live_driver
 
+    @property
+    def sim_driver(self) -> ILabwarePlaceableDriver:
+        """Returns the driver used while simulating."""
+        return self._sim_driver
+
+    def set_sim_driver(self, driver: ILabwarePlaceableDriver) -> None:
+        """Sets the driver used while simulating, e.g. a SimulationDeviceDriver with a duration model matching the real device."""
+        self._sim_driver = driver
+        if self._sim:
+            self._driver = self._sim_driver
+
     @property
     def labware(self) -> Optional[LabwareInstance]:
         return self._labware_reg.stage
@@ -48,19 +70,43 @@ class Device(Equipment, ILabwarePlaceable, ISimulationable):
     def loaded_labware(self) -> List[LabwareInstance]:
         return self._labware_reg.loaded_labware
 
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def labwares(self) -> List[LabwareInstance]:
+        stage = self._labware_reg.stage
+        return self._labware_reg.loaded_labware + ([stage] if stage is not None else [])
+
     def initialize_labware(self, labware: LabwareInstance) -> None:
         if labware in self._labware_reg.loaded_labware:
             return
-        else:
+        elif self._capacity == 1:
             self._labware_reg.set_stage(labware)
+        elif len(self.labwares) >= self._capacity:
+            raise DeviceBusyError(f"{self} - All {self._capacity} slots contain labware.  Unable to initialize {labware}")
+        else:
+            self._labware_reg.initialize_labware(labware)
+
+    async def _await_stage(self, labware: LabwareInstance) -> None:
+        # labware of a device with several slots is picked and placed through its stage one at a time
+        while self._capacity > 1 and self._labware_reg.stage not in (None, labware):
+            await self._stage_cleared.wait()
+
+    def _notify_stage_cleared(self) -> None:
+        self._stage_cleared.set()
+        self._stage_cleared = asyncio.Event()
 
     async def prepare_for_place(self, labware: LabwareInstance) -> None:
+        await self._await_stage(labware)
         if self._labware_reg.stage is not None:
             raise ValueError(f"{self} - Stage already contains labware: {self._labware_reg.stage}.  Unable to place {labware}")
         orca_logger.info(f"{self} - preparing for place of {labware}")
         await self._driver.prepare_for_place(labware.name, labware.labware_type)
 
     async def prepare_for_pick(self, labware: LabwareInstance) -> None:
+        await self._await_stage(labware)
         if self._labware_reg.stage == labware:
             return
         else:
@@ -74,6 +120,7 @@ class Device(Equipment, ILabwarePlaceable, ISimulationable):
                               "The wrong labware may have been picked.")
         orca_logger.info(f"{self} - labware {labware} picked from stage")
         self._labware_reg.set_stage(None)
+        self._notify_stage_cleared()
         await self._driver.notify_picked(labware.name, labware.labware_type)
 
     async def notify_placed(self, labware: LabwareInstance) -> None:
@@ -84,6 +131,7 @@ class Device(Equipment, ILabwarePlaceable, ISimulationable):
         orca_logger.info(f"{self} - labware {labware} received on stage")
         await self._driver.notify_placed(labware.name, labware.labware_type)
         self._labware_reg.load_labware_from_stage(labware)
+        self._notify_stage_cleared()
 
     def __str__(self) -> str:
         return f"Equipment: {self._name}"
@@ -41,10 +41,27 @@ class Location(ILabwarePlaceable):
     @property
     def labware(self) -> Optional[LabwareInstance]:
         return self._resource.labware
+
+    @property
+    def capacity(self) -> int:
+        return self._resource.capacity
+
+    @property
+    def labwares(self) -> List[LabwareInstance]:
+        return self._resource.labwares
+
+    @property
+    def has_free_slot(self) -> bool:
+        """Whether labware can be placed now.  A location with a single slot is free while no labware is on it, one with
+        several slots while its stage is clear and it holds fewer labware than its capacity."""
+        if self.capacity == 1:
+            return self.labware is None
+        return self.labware is None and len(self.labwares) < self.capacity
     
     def initialize_labware(self, labware: LabwareInstance) -> None:
         # TODO: this will need to be restricted to only initilaizing the labware
         self._resource.initialize_labware(labware)
+        self._notify_labware_observers("initialized", labware)
 
     @property
     def resource(self) -> ILabwarePlaceable:
@@ -64,29 +81,30 @@ class Location(ILabwarePlaceable):
 
     async def prepare_for_pick(self, labware: LabwareInstance) -> None:
         await self._resource.prepare_for_pick(labware)
+        # a resource may bring the labware onto its stage to be picked, e.g. a stacker
+        self._notify_labware_observers("staged", labware)
 
     async def notify_picked(self, labware: LabwareInstance) -> None:
         await self._resource.notify_picked(labware)
-        for observer in self._labware_observers:
-            observer.notify_labware_location_change("picked", self, labware)
+        self._notify_labware_observers("picked", labware)
     
     async def notify_placed(self, labware: LabwareInstance) -> None:
         await self._resource.notify_placed(labware)
+        self._notify_labware_observers("placed", labware)
+
+    def _notify_labware_observers(self, event: str, labware: LabwareInstance) -> None:
         for observer in self._labware_observers:
-            observer.notify_labware_location_change("placed", self, labware)
+            observer.notify_labware_location_change(event, self, labware)
 
     def __str__(self) -> str:
         return f"Location: {self._teachpoint_name}"
     
     def add_observer(self, observer: IResourceLocationObserver | ILabwareLocationObserver) -> None:
-        if isinstance(observer, ILabwareLocationObserver):
-            if observer in self._labware_observers:
-                return
+        if not isinstance(observer, (ILabwareLocationObserver, IResourceLocationObserver)):
+            raise NotImplementedError(f"Observer type {type(observer)} not supported")
+        # an observer may implement both interfaces, e.g. the SystemMap
+        if isinstance(observer, ILabwareLocationObserver) and observer not in self._labware_observers:
             self._labware_observers.append(observer)
-        elif isinstance(observer, IResourceLocationObserver):
-            if observer in self._resource_observers:
-                return
+        if isinstance(observer, IResourceLocationObserver) and observer not in self._resource_observers:
             self._resource_observers.append(observer)
-        else:
-            raise NotImplementedError(f"Observer type {type(observer)} not supported")
     
\ No newline at end of file
@@ -1,8 +1,9 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from orca_driver_interface.driver_interfaces import ILabwarePlaceableDriver
 from orca.driver_management.drivers.null_plate_pad.null_plate_pad import NullPlatePadDriver
 from orca.resource_models.devices import Device
 from orca.resource_models.base_resource import ILabwarePlaceable
+from orca.resource_models.device_error import DeviceBusyError
 from orca.resource_models.labware import LabwareInstance
 
 
@@ -10,14 +11,23 @@ class PlatePad(Device, ILabwarePlaceable):
 
     def __init__(self, name: str, driver: ILabwarePlaceableDriver = NullPlatePadDriver("Basic Plate Pad")) -> None:
         super().__init__(name, driver)
+        if isinstance(driver, NullPlatePadDriver):
+            # a plain plate pad has no hardware to mock, so handoffs through it cost nothing in simulation
+            self.set_sim_driver(driver)
         self._is_initialized = False
         self._labware: Optional[LabwareInstance] = None
 
     @property
     def labware(self) -> Optional[LabwareInstance]:
         return self._labware
-    
+
+    @property
+    def labwares(self) -> List[LabwareInstance]:
+        return [self._labware] if self._labware is not None else []
+
     def initialize_labware(self, labware: LabwareInstance) -> None:
+        if self._labware is not None:
+            raise DeviceBusyError(f"{self} - Plate pad already contains labware: {self._labware}.  Unable to initialize {labware}")
         self._labware = labware
 
     def set_init_options(self, init_options: Dict[str, Any]) -> None:
@@ -1,15 +1,22 @@
 import asyncio
+from contextlib import asynccontextmanager
 import logging
 from orca.driver_management.drivers.simulation_robotic_arm.simulation_robotic_arm import SimulationRoboticArmDriver
 from orca.resource_models.base_resource import Equipment, ISimulationable
 from orca_driver_interface.transporter_interfaces import ITransporterDriver
 from orca.resource_models.location import Location
-from typing import List, Optional
+from abc import ABC
+from typing import AsyncIterator, List, Optional
 from orca.resource_models.labware import LabwareInstance
 
 orca_logger = logging.getLogger("orca")
 
 
+class ITransporterLabwareObserver(ABC):
+    def notify_transporter_labware_change(self, event: str, transporter: "TransporterEquipment", labware: LabwareInstance) -> None:
+        pass
+
+
 class TransporterEquipment(Equipment, ISimulationable):
     """
     Represents a transporter equipment capable of picking and placing labware between locations.
@@ -22,11 +29,15 @@ class TransporterEquipment(Equipment, ISimulationable):
         """
         super().__init__(name, driver)
         self._live_driver: ITransporterDriver = driver
-        self._sim_driver: ITransporterDriver = SimulationRoboticArmDriver(name, driver.name, driver.get_taught_positions())
+        self._sim_driver: ITransporterDriver = driver if isinstance(driver, SimulationRoboticArmDriver) \
+            else SimulationRoboticArmDriver(name, driver.name, driver.get_taught_positions())
         self._driver: ITransporterDriver = self._live_driver
         self._labware: Optional[LabwareInstance] = None
         self._lock = asyncio.Lock()
+        self._transfer_lock = asyncio.Lock()
+        self._queued_transfers = 0
         self._is_simulating: bool = False
+        self._labware_observers: List[ITransporterLabwareObserver] = []
         self.set_simulating(sim)
 
     @property
@@ -41,9 +52,40 @@ class TransporterEquipment(Equipment, ISimulationable):
         else:
             self._driver = self._live_driver
 
+    @property
+    def sim_driver(self) -> ITransporterDriver:
+        """Returns the driver used while simulating."""
+        return self._sim_driver
+
+    def set_sim_driver(self, driver: ITransporterDriver) -> None:
+        """Sets the driver used while simulating, e.g. a SimulationRoboticArmDriver with a duration model matching the real arm."""
+        self._sim_driver = driver
+        if self._is_simulating:
+            self._driver = self._sim_driver
+
     @property
     def labware(self) -> Optional[LabwareInstance]:
         return self._labware
+
+    @property
+    def transfer_lock(self) -> asyncio.Lock:
+        """Held by a move from preparing its source and target until the place completes, so another move cannot use the transporter in between."""
+        return self._transfer_lock
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of moves holding or waiting for the transfer lock."""
+        return self._queued_transfers
+
+    @asynccontextmanager
+    async def transfer(self) -> AsyncIterator[None]:
+        """Holds the transfer lock for a move, the move is counted in queue_depth while it waits and while it holds the lock."""
+        self._queued_transfers += 1
+        try:
+            async with self._transfer_lock:
+                yield
+        finally:
+            self._queued_transfers -= 1
     
     async def pick(self, location: Location) -> None:
         async with self._lock:
@@ -55,6 +97,7 @@ class TransporterEquipment(Equipment, ISimulationable):
             await self._driver.pick(location.teachpoint_name, location.labware.labware_type)
             orca_logger.info(f"{self._name} pick {location.labware} from {location}: picked")
             self._labware = location.labware
+            self._notify_labware_observers("picked", self._labware)
 
     async def place(self, location: Location) -> None:
         async with self._lock:
@@ -65,8 +108,16 @@ class TransporterEquipment(Equipment, ISimulationable):
             orca_logger.info(f"{self._name} place {self._labware} to {location}: placing...")
             await self._driver.place(location.teachpoint_name, self._labware.labware_type)
             orca_logger.info(f"{self._name} place {self._labware} to {location}: placed")
-            
-            self._labware = None
+            labware, self._labware = self._labware, None
+            self._notify_labware_observers("placed", labware)
+
+    def add_observer(self, observer: ITransporterLabwareObserver) -> None:
+        if observer not in self._labware_observers:
+            self._labware_observers.append(observer)
+
+    def _notify_labware_observers(self, event: str, labware: LabwareInstance) -> None:
+        for observer in self._labware_observers:
+            observer.notify_transporter_labware_change(event, self, labware)
 
     def get_taught_positions(self) -> List[str]:
         return self._driver.get_taught_positions()
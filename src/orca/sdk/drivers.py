@@ -1,14 +1,23 @@
 from orca.driver_management.drivers.simulation_labware_placeable.simulation_labware_placeable import SimulationDeviceDriver
-from orca.driver_management.drivers.simulation_robotic_arm.simulation_robotic_arm import SimulationRoboticArmDriver
+from orca.driver_management.drivers.simulation_robotic_arm.simulation_robotic_arm import SimulationRoboticArmDriver, JointVelocities
 from orca.driver_management.drivers.simulation_robotic_arm.human_transfer import HumanTransferDriver
 from orca.driver_management.drivers.sealers.a4s_sealer import A4SSealerDriver
 from orca.resource_models.devices import Sealer
 from orca.driver_management.drivers.method_executables.venus import VenusProtocolDriver
+from orca.driver_management.drivers.simulation_base.duration_models import IDurationModel, ConstantDuration, NormalDuration, UniformDuration, SampledDuration, LookupDuration, OptionDuration
 __all__ = [
     "SimulationDeviceDriver",
     "SimulationRoboticArmDriver",
+    "JointVelocities",
     "HumanTransferDriver",
     "A4SSealerDriver",
     "Sealer",
-    "VenusProtocolDriver"
+    "VenusProtocolDriver",
+    "IDurationModel",
+    "ConstantDuration",
+    "NormalDuration",
+    "UniformDuration",
+    "SampledDuration",
+    "LookupDuration",
+    "OptionDuration",
 ]
\ No newline at end of file
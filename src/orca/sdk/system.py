@@ -2,8 +2,13 @@ from orca.system.SdkToSystemBuilder import SdkToSystemBuilder
 from orca.system.executors import WorkflowExecutor
 from orca.system.resource_registry import ResourceRegistry
 from orca.system.executors import StandalonMethodExecutor
+from orca.system.event_loop_monitor import EventLoopMonitor, EventLoopStats, LoopStall
+from orca.system.move_duration_estimator import DurationEstimate, MoveDurationEstimator
 from orca.system.system_map import SystemMap
 from orca.workflow_models.labware_threads.executing_labware_thread import ExecutingLabwareThread
+from orca.simulation.runner import SimulationRunResult, simulate_workflow_runs
+from orca.simulation.capacity_planner import CapacityPlanner, CapacityPlanResult
+from orca.simulation.generator import GeneratedWorkcell, WorkcellSpec, generate_workcell
 
 
 __all__ = [
@@ -12,7 +17,19 @@ __all__ = [
     "StandalonMethodExecutor",
     "ResourceRegistry",
     "ExecutingLabwareThread",
-    "SystemMap"
+    "SystemMap",
+    "EventLoopMonitor",
+    "EventLoopStats",
+    "LoopStall",
+    "MoveDurationEstimator",
+    "DurationEstimate",
+    "SimulationRunResult",
+    "simulate_workflow_runs",
+    "WorkcellSpec",
+    "GeneratedWorkcell",
+    "generate_workcell",
+    "CapacityPlanner",
+    "CapacityPlanResult",
 ]
 
 
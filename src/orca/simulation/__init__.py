@@ -0,0 +1,6 @@
+from orca.simulation.virtual_clock import VirtualTimeEventLoop, run_in_virtual_time
+
+__all__ = [
+    "VirtualTimeEventLoop",
+    "run_in_virtual_time",
+]
@@ -0,0 +1,135 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import itertools
+import zlib
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from orca.simulation.runner import SimulationRunResult, get_simulation_drivers, simulate_workflow_runs
+from orca.simulation.stats import percentile
+from orca.system.system import System
+from orca.workflow_models.workflow_templates import WorkflowTemplate
+
+SystemFactory = Callable[[], Tuple[System, WorkflowTemplate]]
+
+
+@dataclass
+class CapacityPlanResult:
+    """ The simulated outcomes of one pool size configuration over many seeded samples.
+    Attributes:
+        pool_sizes (Dict[str, int]): The number of devices used from each resource pool.
+        samples (List[SimulationRunResult]): The result of each seeded simulation.
+    """
+    pool_sizes: Dict[str, int]
+    samples: List[SimulationRunResult] = field(default_factory=list)
+
+    @property
+    def makespans(self) -> List[float]:
+        return [s.makespan for s in self.samples]
+
+    @property
+    def throughputs(self) -> List[float]:
+        """ Completed workflow runs per simulated hour for each sample."""
+        return [s.throughput_per_hour for s in self.samples]
+
+    @property
+    def timed_out_samples(self) -> int:
+        return sum(1 for s in self.samples if s.timed_out)
+
+    @property
+    def mean_makespan(self) -> float:
+        return _mean(self.makespans)
+
+    @property
+    def mean_throughput(self) -> float:
+        return _mean(self.throughputs)
+
+    def makespan_percentile(self, q: float) -> float:
+        return percentile(self.makespans, q)
+
+    def throughput_percentile(self, q: float) -> float:
+        return percentile(self.throughputs, q)
+
+    def mean_utilization(self) -> Dict[str, float]:
+        """ The mean fraction of the makespan each simulated resource was busy, over all samples."""
+        utilizations = [s.utilization() for s in self.samples]
+        names = sorted({name for u in utilizations for name in u})
+        return {name: _mean([u.get(name, 0.0) for u in utilizations]) for name in names}
+
+
+class CapacityPlanner:
+    """ Estimates the throughput effect of adding or removing devices from resource pools by running many seeded simulations
+    of a workflow for each candidate configuration in parallel across processes.
+
+    Systems are not shared between processes, each simulation builds its own from the system factory, so the factory must be
+    picklable, e.g. a module level function returning the system and workflow built with the SDK.  A configuration maps a resource pool
+    name to the number of its devices to use, so candidate equipment is modelled by adding it to the pool in the factory:
+
+        planner = CapacityPlanner(build_system)
+        results = planner.plan([{"shaker_collection": n} for n in (4, 6, 8, 10)], samples=20)
+    """
+    def __init__(self, system_factory: SystemFactory, max_workers: Optional[int] = None) -> None:
+        """
+        Args:
+            system_factory (SystemFactory): Builds a fresh system and the workflow to plan for.
+            max_workers (Optional[int]): The number of worker processes, defaults to the number of CPUs.
+        """
+        self._system_factory = system_factory
+        self._max_workers = max_workers
+
+    def plan(self,
+             configurations: Sequence[Mapping[str, int]],
+             samples: int = 10,
+             runs: int = 1,
+             max_duration: Optional[float] = None,
+             seed: int = 0) -> List[CapacityPlanResult]:
+        """ Simulates every configuration with the same set of seeds.
+        Args:
+            configurations (Sequence[Mapping[str, int]]): The pool sizes to evaluate, pools not listed keep all their devices.
+            samples (int): The number of seeded simulations per configuration, default is 10.
+            runs (int): The number of concurrent workflow runs in each simulation, default is 1.
+            max_duration (Optional[float]): The simulated seconds after which a simulation is stopped.
+            seed (int): The base seed, sample i reseeds every simulation driver's duration model from seed + i.
+        Returns:
+            List[CapacityPlanResult]: A result per configuration, in the order given.
+        """
+        if samples < 1:
+            raise ValueError("At least one sample is required")
+        results = [CapacityPlanResult(dict(config)) for config in configurations]
+        jobs = list(itertools.product(range(len(results)), range(samples)))
+        with ProcessPoolExecutor(self._max_workers) as executor:
+            futures = [executor.submit(simulate_configuration, self._system_factory, results[c].pool_sizes, seed + s, runs, max_duration)
+                       for c, s in jobs]
+            for (c, _), future in zip(jobs, futures):
+                results[c].samples.append(future.result())
+        return results
+
+
+def simulate_configuration(system_factory: SystemFactory,
+                           pool_sizes: Mapping[str, int],
+                           seed: int,
+                           runs: int = 1,
+                           max_duration: Optional[float] = None) -> SimulationRunResult:
+    """ Builds a system, applies the pool sizes and seed, and simulates the workflow.  Runs in the planner's worker processes."""
+    system, workflow = system_factory()
+    apply_pool_sizes(system, pool_sizes)
+    reseed_simulation(system, seed)
+    return simulate_workflow_runs(system, workflow, runs, max_duration)
+
+
+def apply_pool_sizes(system: System, pool_sizes: Mapping[str, int]) -> None:
+    """ Limits each named resource pool to its first n devices."""
+    for name, size in pool_sizes.items():
+        pool = system.get_resource_pool(name)
+        if size < 1 or size > len(pool.resources):
+            raise ValueError(f"Pool {name} has {len(pool.resources)} devices, unable to use {size}")
+        del pool.resources[size:]
+
+
+def reseed_simulation(system: System, seed: int) -> None:
+    """ Reseeds the duration model of every simulation driver, each driver gets its own stream derived from the seed and its name."""
+    for name, driver in get_simulation_drivers(system).items():
+        driver.duration_model.reseed(zlib.crc32(f"{seed}:{name}".encode()))
+
+
+def _mean(values: Sequence[float]) -> float:
+    return sum(values) / len(values) if len(values) > 0 else 0.0
@@ -0,0 +1,179 @@
+from dataclasses import dataclass
+import random
+from typing import Dict, List, Optional
+
+from orca.driver_management.drivers.null_plate_pad.null_plate_pad import NullPlatePadDriver
+from orca.driver_management.drivers.simulation_base.duration_models import ConstantDuration, OptionDuration
+from orca.driver_management.drivers.simulation_labware_placeable.simulation_labware_placeable import SimulationDeviceDriver
+from orca.driver_management.drivers.simulation_robotic_arm.simulation_robotic_arm import SimulationRoboticArmDriver
+from orca.events.event_bus import EventBus
+from orca.resource_models.base_resource import Equipment
+from orca.resource_models.devices import Device
+from orca.resource_models.labware import LabwareTemplate
+from orca.resource_models.plate_pad import PlatePad
+from orca.resource_models.resource_extras.teachpoints import Teachpoint
+from orca.resource_models.resource_pool import EquipmentResourcePool
+from orca.resource_models.transporter_resource import TransporterEquipment
+from orca.system.SdkToSystemBuilder import SdkToSystemBuilder
+from orca.system.move_duration_estimator import MoveDurationEstimator
+from orca.system.resource_registry import ResourceRegistry
+from orca.system.system import System
+from orca.system.system_map import SystemMap
+from orca.workflow_models.action_template import ActionTemplate
+from orca.workflow_models.method_template import MethodTemplate
+from orca.workflow_models.thread_template import ThreadTemplate
+from orca.workflow_models.workflow_templates import WorkflowTemplate
+
+
+@dataclass(frozen=True)
+class WorkcellSpec:
+    """ Describes a synthetic workcell and workflow to generate for scaling tests.
+
+    Transporters are laid out in a line.  Neighbouring transporters share handoff plate pads, labware enters at a stacker
+    reachable by the first transporter and leaves at a stacker reachable by the last.  Devices are spread round robin over the
+    transporters and each is reachable by `device_reach` neighbouring transporters.
+
+    Attributes:
+        transporters (int): The number of robotic arms.
+        devices (int): The number of devices, not counting the stackers and handoff pads.
+        device_types (int): The number of distinct device types, devices of the same type are interchangeable.
+        shared_positions (int): The number of handoff plate pads shared by each pair of neighbouring transporters.
+        device_reach (int): The number of neighbouring transporters that can reach each device.
+        use_pools (bool): If True, actions target a resource pool of every device of a type rather than a single device.
+        threads (int): The number of concurrent labware threads in the generated workflow.
+        methods_per_thread (int): The number of methods each thread runs, each method is a single action.
+        device_duration (float): The mean simulated time of a device action in seconds, actual times vary by +/-50%.
+        arm_duration (float): The simulated handling time of each pick and place in seconds, travel time is added from the teachpoints.
+        seed (int): Seeds the layout, workflow and durations so the same spec always generates the same workcell.
+        graph_backend (str): The SystemMap graph backend, "networkx" or "compact".
+        route_alternatives (int): The routes considered when the transporters on the shortest routes are saturated, see MoveHandler.
+        lookahead_hops (Optional[int]): The hops of a route reserved together before labware is picked, None for the whole route.
+        avoid_deadlocks (bool): If True, the reservation coordinator avoids deadlocks between threads over device locations.
+        stacker_capacity (int): The plates each stacker holds at once, the stackers hold every thread's plate if None.
+        zoned (bool): If True, reservations are coordinated per zone with the handoff pads as the transfer locations, so
+            each transporter's positions form a zone unless devices reachable by several transporters join them.
+        learn_move_durations (bool): If True, a MoveDurationEstimator learns the simulated move durations and costs the
+            routes with them.
+    """
+    transporters: int = 2
+    devices: int = 8
+    device_types: int = 4
+    shared_positions: int = 1
+    device_reach: int = 1
+    use_pools: bool = True
+    threads: int = 4
+    methods_per_thread: int = 3
+    device_duration: float = 60.0
+    arm_duration: float = 10.0
+    seed: int = 0
+    graph_backend: str = "networkx"
+    route_alternatives: int = 1
+    lookahead_hops: Optional[int] = 1
+    avoid_deadlocks: bool = False
+    stacker_capacity: Optional[int] = 1
+    zoned: bool = False
+    learn_move_durations: bool = False
+
+    def __post_init__(self) -> None:
+        if self.transporters < 1:
+            raise ValueError("At least one transporter is required")
+        if self.device_types < 1 or self.devices < self.device_types:
+            raise ValueError(f"Each of the {self.device_types} device types needs at least one device, got {self.devices} devices")
+        if self.transporters > 1 and self.shared_positions < 1:
+            raise ValueError("Neighbouring transporters must share at least one position for the workcell to be connected")
+        if self.device_reach < 1:
+            raise ValueError("Each device must be reachable by at least one transporter")
+        if self.stacker_capacity is not None and self.stacker_capacity < 1:
+            raise ValueError("Each stacker must hold at least one plate")
+        if self.threads < 1 or self.methods_per_thread < 0:
+            raise ValueError("At least one thread and a non-negative number of methods per thread are required")
+
+
+@dataclass
+class GeneratedWorkcell:
+    """ The objects generated from a WorkcellSpec.  The system runs in simulation, e.g. with simulate_workflow_runs."""
+    spec: WorkcellSpec
+    resource_registry: ResourceRegistry
+    system_map: SystemMap
+    labware_templates: List[LabwareTemplate]
+    methods: List[MethodTemplate]
+    workflow: WorkflowTemplate
+    system: System
+
+
+def generate_workcell(spec: WorkcellSpec) -> GeneratedWorkcell:
+    """ Generates a workcell, workflow and system from a spec.  The same spec always generates the same workcell.
+    Args:
+        spec (WorkcellSpec): Describes the workcell to generate.
+    Returns:
+        GeneratedWorkcell: The resource registry, system map, templates and built system.
+    """
+    rng = random.Random(spec.seed)
+    reach: Dict[int, List[str]] = {arm: [] for arm in range(spec.transporters)}
+
+    stacker_capacity = spec.stacker_capacity if spec.stacker_capacity is not None else spec.threads
+    stacker_in = Device("stacker_in", SimulationDeviceDriver("stacker_in_driver", "stacker", sim_time=0.0), capacity=stacker_capacity)
+    stacker_out = Device("stacker_out", SimulationDeviceDriver("stacker_out_driver", "stacker", sim_time=0.0), capacity=stacker_capacity)
+    reach[0].append(stacker_in.name)
+    reach[spec.transporters - 1].append(stacker_out.name)
+
+    pads: List[PlatePad] = []
+    for arm in range(spec.transporters - 1):
+        for k in range(spec.shared_positions):
+            pad = PlatePad(f"handoff_{arm}_{k}", NullPlatePadDriver(f"handoff_{arm}_{k}_driver"))
+            pads.append(pad)
+            reach[arm].append(pad.name)
+            reach[arm + 1].append(pad.name)
+
+    devices_by_type: Dict[int, List[Device]] = {t: [] for t in range(spec.device_types)}
+    devices: List[Device] = []
+    for i in range(spec.devices):
+        device_type = i % spec.device_types
+        driver = SimulationDeviceDriver(f"device_{i}_driver", f"type_{device_type}",
+                                        duration_model=OptionDuration("time", default=spec.device_duration))
+        device = Device(f"device_{i}", driver)
+        devices.append(device)
+        devices_by_type[device_type].append(device)
+        first_arm = i % spec.transporters
+        for offset in range(min(spec.device_reach, spec.transporters)):
+            reach[(first_arm + offset) % spec.transporters].append(device.name)
+
+    transporters: List[TransporterEquipment] = []
+    arm_duration = ConstantDuration(spec.arm_duration)
+    for arm, positions in reach.items():
+        teachpoints = [Teachpoint(name, rng.uniform(-180, 180), rng.uniform(-150, 150), rng.uniform(-90, 90)) for name in positions]
+        driver = SimulationRoboticArmDriver(f"arm_{arm}_driver", "arm", teachpoints, duration_model=arm_duration)
+        transporters.append(TransporterEquipment(f"arm_{arm}", driver))
+
+    pools: Dict[int, EquipmentResourcePool] = {}
+    if spec.use_pools:
+        pools = {t: EquipmentResourcePool(f"type_{t}_pool", list(members)) for t, members in devices_by_type.items()}
+
+    registry = ResourceRegistry()
+    registry.add_resources([*transporters, stacker_in, stacker_out, *pads, *devices, *pools.values()])
+    system_map = SystemMap(registry, graph_backend=spec.graph_backend)
+    system_map.assign_resources({r.name: r for r in [stacker_in, stacker_out, *pads, *devices]})
+
+    labware_templates: List[LabwareTemplate] = []
+    methods: List[MethodTemplate] = []
+    workflow = WorkflowTemplate(f"generated_workflow_{spec.seed}")
+    for t in range(spec.threads):
+        plate = LabwareTemplate(f"plate_{t}", "96 well")
+        labware_templates.append(plate)
+        thread_methods: List[MethodTemplate] = []
+        for m in range(spec.methods_per_thread):
+            device_type = rng.randrange(spec.device_types)
+            resource: Equipment | EquipmentResourcePool = pools[device_type] if spec.use_pools else rng.choice(devices_by_type[device_type])
+            duration = round(spec.device_duration * rng.uniform(0.5, 1.5), 1)
+            method = MethodTemplate(f"plate_{t}_step_{m}", [ActionTemplate(resource, "run", [plate], options={"time": duration})])
+            thread_methods.append(method)
+        methods.extend(thread_methods)
+        thread = ThreadTemplate(plate, system_map.get_location(stacker_in.name), system_map.get_location(stacker_out.name), thread_methods)
+        workflow.add_thread(thread, True)
+
+    builder = SdkToSystemBuilder(f"generated_{spec.seed}", f"Generated workcell: {spec}", labware_templates,
+                                 registry, system_map, methods, [workflow], EventBus(), route_alternatives=spec.route_alternatives,
+                                 lookahead_hops=spec.lookahead_hops, avoid_deadlocks=spec.avoid_deadlocks,
+                                 transfer_locations=[pad.name for pad in pads] if spec.zoned else None,
+                                 move_duration_estimator=MoveDurationEstimator(system_map) if spec.learn_move_durations else None)
+    return GeneratedWorkcell(spec, registry, system_map, labware_templates, methods, workflow, builder.get_system())
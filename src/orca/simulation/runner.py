@@ -0,0 +1,141 @@
+import asyncio
+from dataclasses import dataclass, field
+import time
+from typing import Dict, List, Optional
+
+from orca.driver_management.drivers.simulation_base.simulation_base import SimulationBaseDriver
+from orca.simulation.virtual_clock import run_in_virtual_time
+from orca.system.executors import WorkflowExecutor
+from orca.system.system import System
+from orca.workflow_models.workflow_templates import WorkflowTemplate
+
+
+@dataclass
+class SimulationRunResult:
+    """ The outcome of running one or more concurrent instances of a workflow in simulation.
+    Attributes:
+        runs (int): The number of workflow instances started.
+        completed_runs (int): The number of workflow instances that completed.
+        failed_runs (int): The number of workflow instances that raised an error.
+        makespan (float): Simulated seconds until the last instance completed, or until the simulation was stopped.
+        timed_out (bool): True if the simulation reached its max duration before every instance completed.
+        reservation_waits (List[float]): Simulated seconds each granted reservation request waited.
+        reclaimed_leases (Dict[str, int]): The reservations reclaimed from threads by reason, see ThreadReservationCoordinator.
+        loop_lag (List[float]): Wall-clock seconds the event loop took to come back to a probe yielding control.
+        busy_time (Dict[str, float]): Simulated seconds each simulated resource spent running operations.
+        errors (List[str]): The errors raised by failed instances.
+    """
+    runs: int
+    completed_runs: int
+    failed_runs: int
+    makespan: float
+    timed_out: bool
+    reservation_waits: List[float] = field(default_factory=list)
+    reclaimed_leases: Dict[str, int] = field(default_factory=dict)
+    loop_lag: List[float] = field(default_factory=list)
+    busy_time: Dict[str, float] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def throughput_per_hour(self) -> float:
+        """ Completed workflow instances per simulated hour."""
+        if self.makespan <= 0:
+            return 0.0
+        return self.completed_runs * 3600.0 / self.makespan
+
+    def utilization(self) -> Dict[str, float]:
+        """ The fraction of the makespan each simulated resource was busy."""
+        if self.makespan <= 0:
+            return {name: 0.0 for name in self.busy_time}
+        return {name: busy / self.makespan for name, busy in self.busy_time.items()}
+
+
+def simulate_workflow_runs(system: System,
+                           workflow: WorkflowTemplate,
+                           runs: int = 1,
+                           max_duration: Optional[float] = None,
+                           lag_probe_interval: Optional[float] = None,
+                           concurrent_runs: Optional[int] = None) -> SimulationRunResult:
+    """ Runs several instances of a workflow concurrently in simulation on a virtual clock.
+    Must be called from outside a running event loop.
+    Args:
+        system (System): The system to run the workflow on.
+        workflow (WorkflowTemplate): The workflow to run.
+        runs (int): The number of workflow instances to run, default is 1.
+        max_duration (Optional[float]): The simulated seconds after which unfinished instances are cancelled.
+        lag_probe_interval (Optional[float]): If given, the event loop lag is sampled every interval simulated seconds.
+        concurrent_runs (Optional[int]): If given, at most this many instances run at a time and each further instance
+            starts as one completes, as plates are fed from a stacker.  Every instance starts at once if None.
+    Returns:
+        SimulationRunResult: The makespan, completion counts and collected statistics.
+    """
+    for driver in get_simulation_drivers(system).values():
+        driver.reset_statistics()
+    system.reservation_coordinator.reset_statistics()
+    result = run_in_virtual_time(_simulate(system, workflow, runs, max_duration, lag_probe_interval, concurrent_runs))
+    result.reservation_waits = system.reservation_coordinator.reservation_wait_times
+    result.reclaimed_leases = system.reservation_coordinator.reclaimed_leases
+    result.busy_time = {name: driver.busy_time for name, driver in get_simulation_drivers(system).items()}
+    return result
+
+
+async def _simulate(system: System,
+                    workflow: WorkflowTemplate,
+                    runs: int,
+                    max_duration: Optional[float],
+                    lag_probe_interval: Optional[float],
+                    concurrent_runs: Optional[int]) -> SimulationRunResult:
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
+    finish_times: List[float] = []
+    loop_lag: List[float] = []
+
+    admission = asyncio.Semaphore(concurrent_runs) if concurrent_runs else None
+
+    async def run_once() -> None:
+        if admission is None:
+            await WorkflowExecutor(workflow, system).start(sim=True)
+        else:
+            async with admission:
+                await WorkflowExecutor(workflow, system).start(sim=True)
+        finish_times.append(loop.time())
+
+    probe = asyncio.create_task(_probe_loop_lag(loop_lag, lag_probe_interval)) if lag_probe_interval else None
+    tasks = [asyncio.create_task(run_once()) for _ in range(runs)]
+    _, pending = await asyncio.wait(tasks, timeout=max_duration)
+    end_time = loop.time()
+    for task in pending:
+        task.cancel()
+    if probe is not None:
+        probe.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+    errors = [repr(t.exception()) for t in tasks if t.done() and not t.cancelled() and t.exception() is not None]
+    timed_out = len(pending) > 0
+    return SimulationRunResult(
+        runs=runs,
+        completed_runs=len(finish_times),
+        failed_runs=len(errors),
+        makespan=(end_time if timed_out else max(finish_times, default=end_time)) - start_time,
+        timed_out=timed_out,
+        loop_lag=loop_lag,
+        errors=errors,
+    )
+
+
+async def _probe_loop_lag(samples: List[float], interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        start = time.perf_counter()
+        await asyncio.sleep(0)
+        samples.append(time.perf_counter() - start)
+
+
+def get_simulation_drivers(system: System) -> Dict[str, SimulationBaseDriver]:
+    """ Returns the simulation driver of each resource that simulates with one, keyed by resource name."""
+    drivers: Dict[str, SimulationBaseDriver] = {}
+    for resource in system.resources:
+        driver = getattr(resource, "sim_driver", None)
+        if isinstance(driver, SimulationBaseDriver):
+            drivers[resource.name] = driver
+    return drivers
@@ -0,0 +1,12 @@
+from typing import Sequence
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """ Returns the q-th percentile (0-100) of the values using linear interpolation, 0.0 for no values."""
+    if len(values) == 0:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
@@ -0,0 +1,106 @@
+import asyncio
+import selectors
+from typing import Any, Coroutine, List, Optional, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+class _VirtualTimeSelector(selectors.BaseSelector):
+    """ Wraps the platform selector and advances the owning loop's virtual clock instead of sleeping.
+
+    Real I/O (e.g. the loop's self-pipe used by call_soon_threadsafe) is still polled, so executors
+    and other threads can wake the loop.  When nothing is ready and a timer is pending, the clock
+    jumps straight to that timer.
+    """
+    def __init__(self, loop: "VirtualTimeEventLoop") -> None:
+        self._loop = loop
+        self._selector = selectors.DefaultSelector()
+
+    def register(self, fileobj: Any, events: int, data: Any = None) -> selectors.SelectorKey:
+        return self._selector.register(fileobj, events, data)
+
+    def unregister(self, fileobj: Any) -> selectors.SelectorKey:
+        return self._selector.unregister(fileobj)
+
+    def modify(self, fileobj: Any, events: int, data: Any = None) -> selectors.SelectorKey:
+        return self._selector.modify(fileobj, events, data)
+
+    def select(self, timeout: Optional[float] = None) -> List[Tuple[selectors.SelectorKey, int]]:
+        if timeout is None:
+            # nothing is scheduled, only real I/O or another thread can make progress
+            return self._selector.select(None)
+        events = self._selector.select(0)
+        if events or timeout <= 0:
+            return events
+        self._loop._advance(timeout)
+        return []
+
+    def close(self) -> None:
+        self._selector.close()
+
+    def get_map(self) -> Any:
+        return self._selector.get_map()
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """ An event loop running on a simulated clock.
+
+    loop.time() starts at start_time and only moves forward when every task is waiting on a timer,
+    at which point it jumps to the next timer.  Every asyncio.sleep, wait_for timeout and call_later
+    in the system (driver simulation times, thread polling sleeps, the reservation tick loop) therefore
+    costs no wall-clock time while keeping its ordering and relative timing.
+    Work done outside the loop (threads, executors, blocking calls) does not advance the clock.
+    """
+    # read by the event loop monitor, which measures lag against the wall clock
+    follows_wall_clock = False
+
+    def __init__(self, start_time: float = 0.0) -> None:
+        self._virtual_time = start_time
+        super().__init__(_VirtualTimeSelector(self))
+
+    def time(self) -> float:
+        return self._virtual_time
+
+    def _advance(self, seconds: float) -> None:
+        self._virtual_time += seconds
+
+
+def run_in_virtual_time(main: Coroutine[Any, Any, T], start_time: float = 0.0) -> T:
+    """ Runs a coroutine to completion on a new VirtualTimeEventLoop, similar to asyncio.run.
+    Tasks still pending once the coroutine returns (e.g. the reservation tick loop) are cancelled.
+    Args:
+        main (Coroutine): The coroutine to run.
+        start_time (float): The virtual time the loop starts at, default is 0.0.
+    Returns:
+        The result of the coroutine.
+    """
+    loop = VirtualTimeEventLoop(start_time)
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(main)
+    finally:
+        try:
+            _cancel_all_tasks(loop)
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+
+def _cancel_all_tasks(loop: asyncio.AbstractEventLoop) -> None:
+    to_cancel = asyncio.all_tasks(loop)
+    if not to_cancel:
+        return
+    for task in to_cancel:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*to_cancel, return_exceptions=True))
+    for task in to_cancel:
+        if task.cancelled():
+            continue
+        if task.exception() is not None:
+            loop.call_exception_handler({
+                "message": "unhandled exception during virtual time shutdown",
+                "exception": task.exception(),
+                "task": task,
+            })
@@ -1,10 +1,11 @@
-from typing import List
+from typing import List, Optional
 
 from orca.resource_models.labware import LabwareTemplate
 from orca.events.event_bus_interface import IEventBus
 from orca.events.event_bus import SystemBoundEventBus
 from orca.system.system_info import SystemInfo
 from orca.system.thread_manager_interface import IThreadManager
+from orca.system.move_duration_estimator import MoveDurationEstimator
 from orca.system.reservation_manager.move_handler import MoveHandler
 from orca.system.registries import LabwareRegistry, TemplateRegistry
 from orca.system.reservation_manager.reservation_manager import LocationReservationManager, ThreadReservationCoordinator
@@ -37,6 +38,13 @@ class SdkToSystemBuilder:
                  methods: List[MethodTemplate],
                  workflows: List[WorkflowTemplate],
                  event_bus: IEventBus,
+                 move_duration_estimator: Optional[MoveDurationEstimator] = None,
+                 route_alternatives: int = 1,
+                 lookahead_hops: Optional[int] = 1,
+                 priority_aging: float = 60.0,
+                 avoid_deadlocks: bool = False,
+                 lease_duration: Optional[float] = None,
+                 transfer_locations: Optional[List[str]] = None,
                  ) -> None:
         """ Initializes the SdkToSystemBuilder with the necessary components to build a system.
         Args:
@@ -48,6 +56,22 @@ class SdkToSystemBuilder:
             methods (List[MethodTemplate]): A list of method templates to be used in the system.
             workflows (List[WorkflowTemplate]): A list of workflow templates to be used in the system.
             event_bus (IEventBus): The event bus to handle events in the system.
+            move_duration_estimator (Optional[MoveDurationEstimator]): Learns move durations and updates the route weights of the
+                system map, e.g. one persisting its estimates to a file. None leaves the route weights as they are.
+            route_alternatives (int): The number of cheapest routes through any transporter considered when the transporters on
+                the shortest routes are saturated, 1 only uses the shortest routes.
+            lookahead_hops (Optional[int]): The number of hops of a route reserved together before labware is picked, None
+                reserves the whole route.
+            priority_aging (float): The seconds a reservation request waits to gain a priority level over the requests
+                contending with it, so low priority threads are not starved.
+            avoid_deadlocks (bool): If True, locations are not granted when the running threads could then deadlock over the
+                locations of their remaining actions, rather than backing threads out of deadlocks once they happen.
+            lease_duration (Optional[float]): The seconds a reservation lasts unless the thread holding it renews it, so the
+                reservations of a thread that stopped without releasing them are reclaimed.  None never expires reservations,
+                those of a thread that ended are reclaimed either way.
+            transfer_locations (Optional[List[str]]): The locations joining the zones of the system map, e.g. the plate pads
+                handing labware between groups of transporters.  If given, reservations are coordinated per zone, see
+                SystemMap.get_zones, so the work of each tick is proportional to a zone rather than the whole system.
         """
         self._system_info: SystemInfo = SystemInfo(name, description=description, version="0.1.0", model_extra={})
         self._resource_reg: ResourceRegistry = resources_registry
@@ -69,9 +93,16 @@ class SdkToSystemBuilder:
         self._reservation_manager = LocationReservationManager(self._system_map)
         self._status_manager = StatusManager(self._event_bus)
 
+        zones = self._system_map.get_zones(transfer_locations) if transfer_locations is not None else None
         self._thread_reservation_coordinator = ThreadReservationCoordinator(self._system_map,
-                                                                            self._thread_registry)
-        self._move_hander = MoveHandler(self._thread_reservation_coordinator, self._system_map)
+                                                                            self._thread_registry,
+                                                                            priority_aging,
+                                                                            avoid_deadlocks,
+                                                                            lease_duration,
+                                                                            zones)
+        self._move_hander = MoveHandler(self._thread_reservation_coordinator, self._system_map, route_alternatives,
+                                       lookahead_hops=lookahead_hops)
+        self._move_duration_estimator = move_duration_estimator
         method_factory = ExecutingMethodFactory(self._event_bus, self._status_manager)
         self._executing_method_registry = ExecutingMethodRegistry(self._method_registry, method_factory)
         self._action_resolver = DynamicResourceActionResolver(self._thread_reservation_coordinator, self._system_map)
@@ -81,7 +112,8 @@ class SdkToSystemBuilder:
                                                                 self._thread_reservation_coordinator,
                                                                 self._action_resolver,
                                                                 self._executing_method_registry,
-                                                                self._system_map)
+                                                                self._system_map,
+                                                                self._move_duration_estimator)
         self._executing_thread_registry = ExecutingThreadRegistry(self._thread_registry,
                                                                   self._executing_thread_factory)
         
@@ -133,7 +165,9 @@ class SdkToSystemBuilder:
                 self._thread_manager, 
                 self._method_registry,
                 self._workflow_registry,
-                self._executing_workflow_registry
+                self._executing_workflow_registry,
+                self._thread_reservation_coordinator,
+                move_duration_estimator=self._move_duration_estimator
                 )
         self._event_bus.bind_system(system)
         
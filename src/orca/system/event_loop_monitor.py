@@ -0,0 +1,216 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+import inspect
+import logging
+import statistics
+import sys
+import threading
+import time
+import traceback
+from types import FrameType
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from orca.system.interfaces import IEventLoopMonitor
+
+orca_logger = logging.getLogger("orca")
+
+
+@dataclass(frozen=True)
+class LoopStall:
+    """ A period where the event loop did not get back to scheduling for longer than the stall threshold.
+    Attributes:
+        started_at (float): The wall-clock time (time.time()) the stall was detected.
+        duration (float): The seconds the event loop was unresponsive.
+        task (Optional[str]): The name of the task that was running, None if no task was running.
+        coroutine (Optional[str]): The innermost coroutine of the running task, e.g. "HumanTransferDriver.pick".
+        stack (List[str]): The stack of the event loop thread while stalled, innermost frame last.
+    """
+    started_at: float
+    duration: float
+    task: Optional[str] = None
+    coroutine: Optional[str] = None
+    stack: List[str] = field(default_factory=list)
+
+    @property
+    def blocking_call(self) -> Optional[str]:
+        """ The innermost frame of the stalled stack, where the event loop was blocked."""
+        return self.stack[-1].strip().splitlines()[0] if len(self.stack) > 0 else None
+
+
+@dataclass(frozen=True)
+class EventLoopStats:
+    """ Summary of the event loop lag measured by an EventLoopMonitor.
+    Attributes:
+        samples (int): The number of lag samples taken.
+        mean_lag (float): The mean seconds a heartbeat ran late.
+        p99_lag (float): The 99th percentile of the seconds a heartbeat ran late.
+        max_lag (float): The largest seconds a heartbeat ran late.
+        stalls (List[LoopStall]): The stalls recorded, most recent last.
+    """
+    samples: int
+    mean_lag: float
+    p99_lag: float
+    max_lag: float
+    stalls: List[LoopStall]
+
+
+class EventLoopMonitor(IEventLoopMonitor):
+    """ Measures how late the event loop runs a periodic heartbeat and records what was running when it stalls.
+
+    A blocking call in a coroutine, such as a driver calling time.sleep or input(), stops every other task in the system.
+    The heartbeat measures how late it was scheduled, and a watchdog thread captures the loop thread's stack once the heartbeat
+    is overdue by more than the stall threshold, so the blocking call can be found.  The watchdog only reads the stack, the
+    task the stalled coroutine belongs to is looked up on the loop once it runs again, from the tasks created while monitoring.
+    """
+    def __init__(self, interval: float = 0.1, stall_threshold: float = 0.5, max_samples: int = 10000, max_stalls: int = 100) -> None:
+        """
+        Args:
+            interval (float): The seconds between heartbeats, default is 0.1.
+            stall_threshold (float): The seconds a heartbeat may run late before it is recorded as a stall, default is 0.5.
+            max_samples (int): The number of most recent lag samples kept, default is 10000.
+            max_stalls (int): The number of most recent stalls kept, default is 100.
+        """
+        if interval <= 0 or stall_threshold <= 0:
+            raise ValueError("Interval and stall threshold must be positive")
+        self._interval = interval
+        self._stall_threshold = stall_threshold
+        self._lags: Deque[float] = deque(maxlen=max_samples)
+        self._stalls: Deque[LoopStall] = deque(maxlen=max_stalls)
+        self._max_lag = 0.0
+        self._task: Optional[asyncio.Task[None]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._beat_due: float = 0.0
+        self._snapshot: Optional[Tuple[float, Optional[FrameType], Optional[str], List[str]]] = None
+        # the tasks created on the monitored loop by the frame of their coroutine, pruned of finished tasks on each heartbeat
+        self._tasks_by_frame: Dict[int, asyncio.Task[Any]] = {}
+        self._previous_task_factory: Any = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def stall_threshold(self) -> float:
+        return self._stall_threshold
+
+    @property
+    def stalls(self) -> List[LoopStall]:
+        return list(self._stalls)
+
+    def get_stats(self) -> EventLoopStats:
+        lags = list(self._lags)
+        return EventLoopStats(samples=len(lags),
+                              mean_lag=sum(lags) / len(lags) if len(lags) > 0 else 0.0,
+                              p99_lag=_p99(lags),
+                              max_lag=self._max_lag,
+                              stalls=self.stalls)
+
+    def reset_statistics(self) -> None:
+        self._lags.clear()
+        self._stalls.clear()
+        self._max_lag = 0.0
+
+    def start(self) -> None:
+        """ Starts monitoring the running event loop, does nothing if already monitoring it.
+        Event loops on a simulated clock, e.g. VirtualTimeEventLoop, are not monitored, their clock does not follow the wall clock."""
+        loop = asyncio.get_running_loop()
+        if self.is_running and self._loop is loop:
+            return
+        if not getattr(loop, "follows_wall_clock", True):
+            return
+        self.stop()
+        self._loop = loop
+        self._loop_thread_id = threading.get_ident()
+        self._stopped = threading.Event()
+        self._tasks_by_frame = {}
+        for task in asyncio.all_tasks(loop):
+            self._track(task)
+        self._previous_task_factory = loop.get_task_factory()
+        loop.set_task_factory(self._create_task)
+        self._beat_due = time.perf_counter() + self._interval
+        self._task = loop.create_task(self._heartbeat(), name="event_loop_monitor")
+        self._watchdog = threading.Thread(target=self._watch, args=(self._stopped,), name="event_loop_watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+        self._task = None
+        if self._loop is not None and self._loop.get_task_factory() == self._create_task:
+            self._loop.set_task_factory(self._previous_task_factory)
+        self._tasks_by_frame.clear()
+
+    def _create_task(self, loop: asyncio.AbstractEventLoop, coro: Any, **kwargs: Any) -> "asyncio.Future[Any]":
+        if self._previous_task_factory is not None:
+            task = self._previous_task_factory(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        self._track(task)
+        return task
+
+    def _track(self, task: "asyncio.Future[Any]") -> None:
+        frame = getattr(task.get_coro(), "cr_frame", None) if isinstance(task, asyncio.Task) else None
+        if frame is not None:
+            self._tasks_by_frame[id(frame)] = task
+
+    async def _heartbeat(self) -> None:
+        try:
+            while True:
+                self._beat_due = time.perf_counter() + self._interval
+                await asyncio.sleep(self._interval)
+                self._record(max(0.0, time.perf_counter() - self._beat_due))
+                self._tasks_by_frame = {key: task for key, task in self._tasks_by_frame.items() if not task.done()}
+        finally:
+            self._stopped.set()
+
+    def _record(self, lag: float) -> None:
+        self._lags.append(lag)
+        self._max_lag = max(self._max_lag, lag)
+        if lag <= self._stall_threshold:
+            return
+        with self._lock:
+            snapshot, self._snapshot = self._snapshot, None
+        started_at, task_frame, coroutine, stack = snapshot if snapshot is not None else (time.time() - lag, None, None, [])
+        # the stalled task has usually finished its step by now, it is found by the frame of its coroutine captured meanwhile
+        task = self._tasks_by_frame.get(id(task_frame)) if task_frame is not None else None
+        stall = LoopStall(started_at, lag, task.get_name() if isinstance(task, asyncio.Task) else None, coroutine, stack)
+        self._stalls.append(stall)
+        orca_logger.warning(f"Event loop stalled for {lag:.3f}s while running {coroutine or task or 'unknown'} at {stall.blocking_call}")
+
+    def _watch(self, stopped: threading.Event) -> None:
+        poll_interval = min(self._interval, self._stall_threshold / 2)
+        captured_beat = None
+        while not stopped.wait(poll_interval):
+            beat_due = self._beat_due
+            if captured_beat != beat_due and time.perf_counter() - beat_due > self._stall_threshold:
+                captured_beat = beat_due
+                snapshot = self._capture()
+                with self._lock:
+                    self._snapshot = snapshot
+
+    def _capture(self) -> Tuple[float, Optional[FrameType], Optional[str], List[str]]:
+        # runs on the watchdog thread, so only the loop thread's frames are read and nothing of asyncio's state
+        frame = sys._current_frames().get(self._loop_thread_id) if self._loop_thread_id is not None else None
+        stack = traceback.format_stack(frame) if frame is not None else []
+        coroutine_frames: List[FrameType] = []
+        while frame is not None:
+            if frame.f_code.co_flags & inspect.CO_COROUTINE:
+                coroutine_frames.append(frame)
+            frame = frame.f_back
+        if len(coroutine_frames) == 0:
+            return time.time(), None, None, stack
+        # the innermost coroutine is where the loop is blocked, the outermost is the coroutine its task runs
+        innermost = coroutine_frames[0].f_code
+        return time.time(), coroutine_frames[-1], getattr(innermost, "co_qualname", innermost.co_name), stack
+
+
+def _p99(values: List[float]) -> float:
+    if len(values) < 2:
+        return values[0] if len(values) == 1 else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[98]
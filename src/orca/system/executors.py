@@ -1,9 +1,11 @@
+import asyncio
 from typing import Optional
 import uuid
 
 from orca.resource_models.labware import LabwareTemplate
 from orca.resource_models.location import Location
 from orca.events.execution_context import WorkflowExecutionContext
+from orca.simulation.virtual_clock import run_in_virtual_time
 from orca.system.interfaces import IMethodRegistry, IWorkflowRegistry
 from typing import Dict, List
 from orca.system.system_interface import ISystem
@@ -32,8 +34,29 @@ class WorkflowExecutor:
         This method creates a workflow instance, registers it with the system, and starts the execution."""
         if sim: 
             self._system.set_simulating(True)
-        executing_workflow = self._get_executing_workflow()
-        await executing_workflow.start()
+        self._system.event_loop_monitor.start()
+        try:
+            executing_workflow = self._get_executing_workflow()
+            await executing_workflow.start()
+        finally:
+            self._system.event_loop_monitor.stop()
+
+    def simulate(self, max_duration: Optional[float] = None) -> float:
+        """ Runs the workflow in simulation on a virtual clock and returns the simulated makespan.
+        Simulated time only advances while every task is waiting on a timer, so hours of lab time run in seconds of wall time.
+        Must be called from outside a running event loop.
+        Args:
+            max_duration (Optional[float]): The maximum simulated time in seconds, a TimeoutError is raised if the workflow runs longer.
+        Returns:
+            float: The simulated time in seconds taken to complete the workflow.
+        """
+        return run_in_virtual_time(self._simulate(max_duration))
+
+    async def _simulate(self, max_duration: Optional[float]) -> float:
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        await asyncio.wait_for(self.start(sim=True), max_duration)
+        return loop.time() - start_time
 
     def _get_executing_workflow(self):
         workflow_instance = self._system.create_and_register_workflow_instance(self._workflow_template )
@@ -115,4 +138,11 @@ class StandalonMethodExecutor:
     async def start(self, sim: bool = False) -> None:
         workflow_template = self._get_workflow_template()
         executor = WorkflowExecutor(workflow_template, self._system)
-        await executor.start(sim)
\ No newline at end of file
+        await executor.start(sim)
+
+    def simulate(self, max_duration: Optional[float] = None) -> float:
+        """ Runs the method in simulation on a virtual clock and returns the simulated makespan.
+        See WorkflowExecutor.simulate."""
+        workflow_template = self._get_workflow_template()
+        executor = WorkflowExecutor(workflow_template, self._system)
+        return executor.simulate(max_duration)
\ No newline at end of file
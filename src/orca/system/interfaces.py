@@ -9,6 +9,18 @@ from orca.workflow_models.workflow_templates import WorkflowTemplate
 
 
 
+class IEventLoopMonitor(ABC):
+    @abstractmethod
+    def start(self) -> None:
+        """Starts monitoring the running event loop."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Stops monitoring the event loop."""
+        raise NotImplementedError
+
+
 class ISystemInfo(ABC):
     @property
     @abstractmethod
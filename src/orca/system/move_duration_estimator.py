@@ -0,0 +1,157 @@
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple
+
+from orca.system.system_map import SystemMap
+from orca.workflow_models.actions.move_action import IMoveDurationObserver
+
+orca_logger = logging.getLogger("orca")
+
+
+@dataclass
+class DurationEstimate:
+    """ A smoothed estimate of a duration.
+    Attributes:
+        seconds (float): The exponentially weighted moving average of the measured seconds.
+        samples (int): The number of measurements included.
+    """
+    seconds: float
+    samples: int
+
+
+class MoveDurationEstimator(IMoveDurationObserver):
+    """ Learns how long each transporter takes to move labware and feeds the estimates into the system map's route weights.
+
+    Each move is measured as the pick at the source and the place at the target, and both are smoothed per transporter and
+    position.  A move's estimate is the pick estimate at its source plus the place estimate at its target, which maps onto
+    the system map's transporter hubs without giving every pair of positions its own edge.
+
+    Once weights are applied, the measured transporters' routes are costed in seconds.  Positions a measured transporter has
+    not been measured at are costed at the transporter's mean, so its unmeasured moves are neither favoured nor avoided.
+    Transporters that have not been measured keep their weights, and only transporters measured since the last update have
+    their weights rewritten.
+
+    Estimates are saved to and loaded from a JSON file if a path is given, so learned costs survive a restart.
+    """
+
+    def __init__(self,
+                 system_map: SystemMap,
+                 smoothing: float = 0.2,
+                 update_interval: int = 10,
+                 path: Optional[str] = None) -> None:
+        """ Initializes the estimator.
+        Args:
+            system_map (SystemMap): The system map whose route weights are updated.
+            smoothing (float): The weight of each new measurement in the moving average, between 0 and 1.
+            update_interval (int): The number of recorded moves between updates of the route weights.
+            path (Optional[str]): A JSON file to persist the estimates to. Estimates already in the file are loaded and applied.
+        """
+        if not 0 < smoothing <= 1:
+            raise ValueError(f"Smoothing must be in (0, 1], got {smoothing}")
+        if update_interval < 1:
+            raise ValueError(f"Update interval must be at least 1, got {update_interval}")
+        self._system_map = system_map
+        self._smoothing = smoothing
+        self._update_interval = update_interval
+        self._path = path
+        self._pick: Dict[Tuple[str, str], DurationEstimate] = {}
+        self._place: Dict[Tuple[str, str], DurationEstimate] = {}
+        self._moves_since_update = 0
+        self._changed: Set[str] = set()
+        if path is not None and os.path.exists(path):
+            self.load(path)
+            self.update_weights()
+
+    def record_move(self, transporter: str, source: str, target: str, pick_duration: float, place_duration: float) -> None:
+        self._update(self._pick, (transporter, source), pick_duration)
+        self._update(self._place, (transporter, target), place_duration)
+        self._changed.add(transporter)
+        self._moves_since_update += 1
+        if self._moves_since_update >= self._update_interval:
+            self.update_weights()
+
+    def get_pick_estimate(self, transporter: str, location: str) -> Optional[DurationEstimate]:
+        return self._pick.get((transporter, location))
+
+    def get_place_estimate(self, transporter: str, location: str) -> Optional[DurationEstimate]:
+        return self._place.get((transporter, location))
+
+    def get_move_estimate(self, transporter: str, source: str, target: str) -> Optional[float]:
+        """ Returns the estimated seconds to move from source to target, None unless both the pick and the place were measured."""
+        pick = self._pick.get((transporter, source))
+        place = self._place.get((transporter, target))
+        if pick is None or place is None:
+            return None
+        return pick.seconds + place.seconds
+
+    def update_weights(self) -> None:
+        """ Sets the system map's route weights of the transporters measured since the last update, and saves the estimates if
+        a path was given."""
+        self._moves_since_update = 0
+        if len(self._changed) == 0:
+            return
+        default_pick = self._mean(self._pick, None)
+        default_place = self._mean(self._place, None)
+        for transporter in sorted(self._changed):
+            positions = self._system_map.get_transporter_positions(transporter)
+            if len(positions) == 0:
+                # estimates loaded for a transporter that is not in this system
+                continue
+            mean_pick = self._mean(self._pick, transporter, default_pick)
+            mean_place = self._mean(self._place, transporter, default_place)
+            pick_weights = {p: self._seconds(self._pick, (transporter, p), mean_pick) for p in positions}
+            place_weights = {p: self._seconds(self._place, (transporter, p), mean_place) for p in positions}
+            self._system_map.set_transporter_weights(transporter, pick_weights, place_weights)
+        self._changed.clear()
+        if self._path is not None:
+            self.save(self._path)
+
+    def save(self, path: str) -> None:
+        data = {
+            "pick": self._to_json(self._pick),
+            "place": self._to_json(self._place),
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+    def load(self, path: str) -> None:
+        with open(path, "r") as f:
+            data = json.load(f)
+        self._pick.update(self._from_json(data.get("pick", {})))
+        self._place.update(self._from_json(data.get("place", {})))
+        self._changed.update(transporter for transporter, _ in [*self._pick, *self._place])
+        orca_logger.info(f"Loaded move duration estimates for {len(self._pick)} picks and {len(self._place)} places from {path}")
+
+    def _update(self, estimates: Dict[Tuple[str, str], DurationEstimate], key: Tuple[str, str], seconds: float) -> None:
+        estimate = estimates.get(key)
+        if estimate is None:
+            estimates[key] = DurationEstimate(seconds, 1)
+            return
+        estimate.seconds += self._smoothing * (seconds - estimate.seconds)
+        estimate.samples += 1
+
+    @staticmethod
+    def _mean(estimates: Dict[Tuple[str, str], DurationEstimate], transporter: Optional[str], default: Optional[float] = None) -> float:
+        values = [e.seconds for (t, _), e in estimates.items() if transporter is None or t == transporter]
+        if len(values) == 0:
+            return default if default is not None else 0.0
+        return sum(values) / len(values)
+
+    @staticmethod
+    def _seconds(estimates: Dict[Tuple[str, str], DurationEstimate], key: Tuple[str, str], default: float) -> float:
+        estimate = estimates.get(key)
+        return estimate.seconds if estimate is not None else default
+
+    @staticmethod
+    def _to_json(estimates: Dict[Tuple[str, str], DurationEstimate]) -> Dict[str, Dict[str, Dict[str, float]]]:
+        data: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (transporter, location), estimate in estimates.items():
+            data.setdefault(transporter, {})[location] = {"seconds": estimate.seconds, "samples": estimate.samples}
+        return data
+
+    @staticmethod
+    def _from_json(data: Dict[str, Dict[str, Dict[str, float]]]) -> Dict[Tuple[str, str], DurationEstimate]:
+        return {(transporter, location): DurationEstimate(float(e["seconds"]), int(e["samples"]))
+                for transporter, locations in data.items() for location, e in locations.items()}
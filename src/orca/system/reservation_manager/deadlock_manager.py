@@ -1,95 +1,171 @@
-from typing import Dict, List, Optional, Set
-from orca.resource_models.labware import LabwareInstance
-
-
-import networkx as nx # type: ignore
+from typing import Callable, Dict, Iterable, List, Optional, Set
 
+from orca.resource_models.labware import LabwareInstance
+from orca.resource_models.location import Location
 from orca.system.reservation_manager.interfaces import IReservationCollection
 from orca.system.reservation_manager.location_reservation import LocationReservation
-from orca.system.system_map import ILocationRegistry
 from orca.system.thread_registry_interface import IThreadRegistry
 
 
 class DeadlockGraph:
+    """A wait-for graph between threads, kept as requests wait and are granted rather than rebuilt for each scan.
+
+    A waiting thread may be granted any of its alternatives, e.g. any device of a pool or any of several routes, and each
+    alternative waits for the threads holding its locations.  A thread is deadlocked when every alternative waits for
+    another deadlocked thread, so a thread waiting for a device held by a deadlocked thread is not deadlocked while
+    another device of its pool can still free up.
+    """
     def __init__(self) -> None:
-        self._graph: nx.DiGraph = nx.DiGraph()
+        self._waits_for: Dict[str, List[Set[str]]] = {}
+
+    def set_waits_for(self, requester: str, alternatives: Iterable[Iterable[str]]) -> None:
+        """Replaces the threads each alternative of the requester waits for."""
+        options = [set(holders) - {requester} for holders in alternatives]
+        if options and all(options):
+            self._waits_for[requester] = options
+        else:
+            # an alternative waiting for no other thread can be granted once the location frees
+            self._waits_for.pop(requester, None)
 
-    def _add_edge(self, requester: str, holder: str) -> None:
-        if not self._graph.has_node(requester): # type: ignore
-            self._graph.add_node(requester) # type: ignore
-        if not self._graph.has_node(holder): # type: ignore
-            self._graph.add_node(holder) # type: ignore
-        self._graph.add_edge(requester, holder) # type: ignore
+    def remove_requester(self, requester: str) -> None:
+        self._waits_for.pop(requester, None)
 
     def reset(self) -> None:
-        self._graph.clear() # type: ignore
+        self._waits_for.clear()
 
     def is_deadlocked(self) -> bool:
-        try:
-            cycle = nx.find_cycle(self._graph, orientation='original') # type: ignore
-            return True
-        except nx.NetworkXNoCycle:
-            return False
+        return len(self.find_deadlocks()) > 0
 
     def find_cycle_nodes(self) -> set[str]:
-        try:
-            cycle = nx.find_cycle(self._graph, orientation='original') # type: ignore
-            return {node for node, _, _ in cycle}
-        except nx.NetworkXNoCycle:
-            return set()
+        return {node for deadlock in self.find_deadlocks() for node in deadlock}
+
+    def find_deadlock(self, node: str) -> List[str]:
+        """Returns the threads deadlocked in a cycle with the node, including the node, or an empty list."""
+        deadlocked = self._get_deadlocked(self._get_reachable(node))
+        if node not in deadlocked:
+            return []
+        return [t for t in self._get_reachable(node, deadlocked) if node in self._get_reachable(t, deadlocked)]
+
+    def find_deadlocks(self, requesters: Optional[Iterable[str]] = None) -> List[List[str]]:
+        """Returns every group of threads deadlocked in a cycle with each other, or only the groups of the given requesters."""
+        if requesters is None:
+            nodes = list(self._waits_for)
+            deadlocked = self._get_deadlocked(set(nodes))
+        else:
+            # a requester can only be deadlocked with the threads it waits for, directly or not
+            nodes = [node for node in requesters if node in self._waits_for]
+            deadlocked = self._get_deadlocked({t for node in nodes for t in self._get_reachable(node)})
+        deadlocks: List[List[str]] = []
+        found: Set[str] = set()
+        for node in nodes:
+            if node in deadlocked and node not in found:
+                deadlock = [t for t in self._get_reachable(node, deadlocked) if node in self._get_reachable(t, deadlocked)]
+                found.update(deadlock)
+                if len(deadlock) > 1:
+                    deadlocks.append(deadlock)
+        return deadlocks
+
+    def _get_deadlocked(self, candidates: Set[str]) -> Set[str]:
+        # drop threads with an alternative waiting for no remaining thread until none are left to drop
+        deadlocked = {t for t in candidates if t in self._waits_for}
+        changed = True
+        while changed:
+            changed = False
+            for thread in list(deadlocked):
+                if any(not (holders & deadlocked) for holders in self._waits_for[thread]):
+                    deadlocked.discard(thread)
+                    changed = True
+        return deadlocked
+
+    def _get_reachable(self, source: str, within: Optional[Set[str]] = None) -> List[str]:
+        reachable = [source]
+        seen = {source}
+        stack = [source]
+        while stack:
+            node = stack.pop()
+            for holders in self._waits_for.get(node, ()):
+                for next_node in holders:
+                    if next_node not in seen and (within is None or next_node in within):
+                        seen.add(next_node)
+                        reachable.append(next_node)
+                        stack.append(next_node)
+        return reachable
 
 
 class ThreadDeadlockDetector:
-    def __init__(self, thread_registry: IThreadRegistry) -> None:
-        self._thread_registry = thread_registry
+    """Keeps the wait-for graph of the waiting requests and finds the deadlock a request closes as it starts waiting.
 
-    def detect_deadlocks(
-        self,
-        queue: List[IReservationCollection],
-    ) -> None:
-        graph = self._build_wait_for_graph(queue)
-        cycling_thread_ids = self._get_cycling_thread_ids(graph)
+    A location blocks a thread while another thread holds its reservation, e.g. while that thread's labware is loaded in the
+    device, or while labware of another thread sits on it.  A location with several slots frees up as soon as any of the
+    threads in it leaves, so it is kept in the graph as a node waiting for any one of them.
+    """
+    _SLOTS_PREFIX = "location:"
 
+    def __init__(self, thread_registry: IThreadRegistry, get_holders: Callable[[str], List[str]]) -> None:
+        self._thread_registry = thread_registry
+        self._get_holders = get_holders
+        self._graph = DeadlockGraph()
+        self._labware_threads: Dict[str, Optional[str]] = {}
+
+    def update(self, collection: IReservationCollection) -> List[List[str]]:
+        """Updates what the waiting request's thread waits for and returns the deadlock it is now in, if any."""
+        thread_id = collection.thread_id
+        self._graph.set_waits_for(thread_id, self._get_blocking_thread_ids(collection))
+        deadlock = self._graph.find_deadlock(thread_id)
+        return [self._get_threads(deadlock)] if deadlock else []
+
+    def remove(self, thread_id: str) -> None:
+        """Removes the thread once it no longer waits."""
+        self._graph.remove_requester(thread_id)
+
+    def detect_deadlocks(self, queue: List[IReservationCollection]) -> List[List[str]]:
+        """Updates the waiting requests and returns the deadlocks they are in, for changes not seen as they happened."""
         for collection in queue:
-            if collection.thread_id in cycling_thread_ids:
-                collection.rejected.clear()
-                collection.deadlocked.set()
-
-    def _build_wait_for_graph(
-        self,
-        queue: List[IReservationCollection],
-    ) -> DeadlockGraph:
-        graph = DeadlockGraph()
-        labwares_in_queue = self._get_labware_to_thread_map(queue)
-        for collection in queue:
-            requesting_thread_id = collection.thread_id
-
-            for reservation in collection.get_reservations():
-                blocking_thread_id = self._get_blocking_thread_id(reservation, labwares_in_queue)
-                if blocking_thread_id:
-                    graph._add_edge(requesting_thread_id, blocking_thread_id)
-
-        return graph
-
-    def _get_blocking_thread_id(
-        self,
-        reservation: LocationReservation,
-        labwares_in_queue: Dict[str, str],
-    ) -> str | None:
-        
-        requested_location = reservation.requested_location
-        blocking_labware = requested_location.labware
+            self._graph.set_waits_for(collection.thread_id, self._get_blocking_thread_ids(collection))
+        return [self._get_threads(deadlock) for deadlock in self._graph.find_deadlocks([c.thread_id for c in queue])]
+
+    def _get_threads(self, deadlock: List[str]) -> List[str]:
+        return [node for node in deadlock if not node.startswith(self._SLOTS_PREFIX)]
+
+    def _get_blocking_thread_ids(self, collection: IReservationCollection) -> List[Set[str]]:
+        alternatives: List[Set[str]] = []
+        for option in collection.get_reservation_options():
+            blocking = {self._get_blocking_thread_id(reservation) for reservation in option}
+            blocking.discard(None)
+            alternatives.append(blocking)  # type: ignore[arg-type]
+        return alternatives
+
+    def _get_blocking_thread_id(self, reservation: LocationReservation) -> str | None:
+        location = reservation.requested_location
+        if location.capacity == 1:
+            return self.get_occupant(location)
+        node = self._SLOTS_PREFIX + location.name
+        occupants = set(self._get_holders(location.name))
+        occupants.update(t for t in (self._get_labware_thread(labware) for labware in location.labwares) if t is not None)
+        if not occupants:
+            self._graph.remove_requester(node)
+            return None
+        self._graph.set_waits_for(node, [{thread_id} for thread_id in occupants])
+        return node
+
+    def get_occupant(self, location: Location) -> str | None:
+        """Returns the ID of the thread holding the location's reservation, or else of the thread whose labware sits on it."""
+        holders = self._get_holders(location.name)
+        if holders:
+            return holders[0]
+        blocking_labware = location.labware
         if blocking_labware is None:
             return None
-        blocking_thread_id = labwares_in_queue.get(blocking_labware.id)
-        return blocking_thread_id
-
-
-    def _get_cycling_thread_ids(self, graph: DeadlockGraph) -> Set[str]:
-        return graph.find_cycle_nodes()
-    
-    def _get_labware_to_thread_map(self, queue: List[IReservationCollection]) -> Dict[str, str]:
-        return {self._thread_registry.get_thread(c.thread_id).labware.id: c.thread_id for c in queue}
+        return self._get_labware_thread(blocking_labware)
+
+    def _get_labware_thread(self, labware: LabwareInstance) -> str | None:
+        if labware.id not in self._labware_threads:
+            # looked up once per labware, the registry searches every thread
+            try:
+                self._labware_threads[labware.id] = self._thread_registry.get_thread_by_labware(labware.id).id
+            except KeyError:
+                self._labware_threads[labware.id] = None
+        return self._labware_threads[labware.id]
 
 
 
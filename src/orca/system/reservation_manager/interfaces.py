@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 import asyncio
-from typing import List
+from typing import Callable, Collection, List, Optional
 import typing
 from orca.resource_models.location import Location
 
@@ -22,7 +22,7 @@ class IAvailabilityManager(ABC):
 
 
 class IReservationManager(ABC):
-    def can_reserve(self, location_name: str) -> bool:
+    def can_reserve(self, location_name: str, thread_id: str | None = None) -> bool:
         raise NotImplementedError
 
     def release_reservation(self, location_name: str) -> None:
@@ -41,6 +41,11 @@ class IReservationCollection(ABC):
         """Returns a list of all reservations."""
         raise NotImplementedError
 
+    def get_reservation_options(self) -> List[List["LocationReservation"]]:
+        """Returns the alternatives the collection may be granted, each a list of reservations granted together.
+        Defaults to each reservation being an alternative on its own."""
+        return [[reservation] for reservation in self.get_reservations()]
+
     @abstractmethod
     def resolve_final_reservation(self) -> None:
         """Resolves the final reservation in the collection, marking it as processed."""
@@ -76,11 +81,58 @@ class IReservationCollection(ABC):
         raise NotImplementedError
 
 
+class ILocationNeeds(ABC):
+    @abstractmethod
+    def get_future_location_needs(self) -> List[List[str]]:
+        """Returns the locations a thread still needs in order, each step any one of a list of location names."""
+        raise NotImplementedError
+
+
 class IThreadReservationCoordinator(ABC):
     @abstractmethod
-    async def submit_reservation_request(self, thread_id: str, request: IReservationCollection) -> None:
+    async def submit_reservation_request(self, thread_id: str, request: IReservationCollection, parked: bool = False) -> None:
+        """Submits a request, returning once it has been processed.  A parked request, e.g. of a thread that backed out of a
+        deadlock with nowhere to move its labware, is not backed out again until a location it waits for changes hands."""
         raise NotImplementedError
-    
+
+    @abstractmethod
+    def admit_thread(self, thread_id: str, needs: ILocationNeeds) -> None:
+        """Admits a thread starting to run, with the locations it will need."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def remove_thread(self, thread_id: str) -> None:
+        """Removes a thread that finished running and needs no more locations."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_thread_removed_callback(self, callback: Callable[[str], None]) -> None:
+        """Adds a callback called with the ID of each thread removed, e.g. to drop what was kept for the thread."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def renew_leases(self, thread_id: str) -> None:
+        """Renews the leases of the reservations the thread holds, so they do not expire while the thread runs."""
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def lease_duration(self) -> Optional[float]:
+        """The seconds a lease lasts unless renewed, None if leases do not expire."""
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def reserved_locations(self) -> Collection[str]:
+        """The names of the locations currently reserved."""
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def awaited_locations(self) -> Collection[str]:
+        """The names of the locations requests are waiting for."""
+        raise NotImplementedError
+
     @abstractmethod
     async def start_tick_loop(self, tick_interval: float) -> None:
         """Starts the tick loop for the reservation coordinator."""
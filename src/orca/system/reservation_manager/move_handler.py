@@ -1,11 +1,13 @@
 import asyncio
 import logging
-from typing import List
+from typing import Dict, List, Optional, Set, Tuple
 from orca.resource_models.labware import LabwareInstance
 from orca.resource_models.location import Location
 from orca.system.reservation_manager.interfaces import IReservationCollection, IThreadReservationCoordinator
 from orca.system.reservation_manager.location_reservation import LocationReservation
-from orca.system.system_map import SystemMap
+from orca.resource_models.plate_pad import PlatePad
+from orca.resource_models.transporter_resource import TransporterEquipment
+from orca.system.system_map import SystemMap, TransporterRoute
 from orca.workflow_models.actions.location_action import ILocationAction
 
 
@@ -128,16 +130,108 @@ class MoveActionCollectionReservationRequest(IReservationCollection):
         return output
 
 
+class RouteReservationRequest(MoveActionCollectionReservationRequest):
+    """ Requests the next hops of one of several routes at once.  A route is only granted if every location along it is, so
+    labware is not picked until it can be carried through its handoffs without waiting at one."""
+    def __init__(self, thread_id: str, requested_routes: List[List[MoveAction]]):
+        super().__init__(thread_id, [route[0] for route in requested_routes])
+        self._requested_routes = requested_routes
+        self._reserved_route: List[MoveAction] | None = None
+        # reservations granted before the request, e.g. the assigned action's, are held by their owner and never released here
+        self._held = {id(move.reservation) for route in requested_routes for move in route if move.reservation.granted.is_set()}
+        self._pending: List[LocationReservation] = []
+        self._share_reservations()
+
+    @property
+    def reserved_route(self) -> List[MoveAction]:
+        if self._reserved_route is None:
+            raise ValueError("No route reserved yet")
+        return self._reserved_route
+
+    def get_reservations(self) -> List[LocationReservation]:
+        return list(self._pending)
+
+    def get_reservation_options(self) -> List[List[LocationReservation]]:
+        options = [[move.reservation for move in route if id(move.reservation) not in self._held] for route in self._requested_routes]
+        return [option for option in options if option]
+
+    def resolve_final_reservation(self) -> None:
+        route = next((r for r in self._requested_routes if all(move.reservation.granted.is_set() for move in r)), None)
+        kept = {id(move.reservation) for move in route} if route is not None else set()
+        for reservation in self._pending:
+            if reservation.granted.is_set() and id(reservation) not in kept:
+                reservation.release_reservation()
+        if route is None:
+            self._rejected.set()
+            self._processed.set()
+            return
+        self._reserved_route = route
+        self._reserved_move_action = route[0]
+        self._granted.set()
+        self._processed.set()
+
+    def clear(self) -> None:
+        if self.granted.is_set():
+            raise ValueError("Cannot clear a reservation that has been granted")
+        # reservations granted to a route that was not granted in full were released, fresh ones are requested on the retry
+        self._share_reservations()
+        self._processed.clear()
+        self._rejected.clear()
+        self._deadlocked.clear()
+
+    def _share_reservations(self) -> None:
+        # routes through the same location share its reservation, so one route in the request cannot block another
+        shared: Dict[str, LocationReservation] = {}
+        for route in self._requested_routes:
+            for move in route:
+                if id(move.reservation) in self._held:
+                    continue
+                name = move.target.teachpoint_name
+                if name not in shared:
+                    shared[name] = LocationReservation(move.target, move.labware)
+                move.set_reservation(shared[name])
+        self._pending = list(shared.values())
+
+
 class MoveHandler:
     def __init__(self,
                 thread_reservation_coordinator: IThreadReservationCoordinator,
-                system_map: SystemMap) -> None:
+                system_map: SystemMap,
+                route_alternatives: int = 1,
+                saturation: int = 1,
+                deadlock_buffers: int = 3,
+                lookahead_hops: Optional[int] = 1) -> None:
+        """
+        Args:
+            thread_reservation_coordinator (IThreadReservationCoordinator): Grants the reservations of the moves.
+            system_map (SystemMap): The map routes are planned on.
+            route_alternatives (int): The number of cheapest routes, through any transporter, considered when every transporter
+                making the first hop of a shortest route is saturated.  1 or less only ever offers the shortest routes.
+            saturation (int): The number of moves holding or waiting for a transporter at which it counts as saturated.
+            deadlock_buffers (int): The number of nearest free plate pads a deadlocked move is offered to park its labware on.
+            lookahead_hops (Optional[int]): The number of hops of a route reserved together before the labware is picked, None
+                reserves the whole route.  1 reserves one hop at a time, labware may then wait at a handoff for the next hop.
+        """
         self._thread_reservation_coordinator = thread_reservation_coordinator
         self._system_map = system_map
+        self._route_alternatives = route_alternatives
+        self._saturation = saturation
+        self._deadlock_buffers = deadlock_buffers
+        if lookahead_hops is not None and lookahead_hops < 1:
+            raise ValueError(f"Lookahead must be at least 1 hop, got {lookahead_hops}")
+        self._lookahead_hops = lookahead_hops
+        # the reserved hops of each thread's route not yet moved
+        self._planned_moves: Dict[str, List[MoveAction]] = {}
+        self._thread_reservation_coordinator.add_thread_removed_callback(self._release_planned_moves)
 
     async def resolve_move_action(self, thread_id: str, labware: LabwareInstance, current_location: Location, target_location: Location, assigned_action: ILocationAction | None = None) -> MoveAction:
-        potential_paths = self._get_potential_paths(current_location, target_location)
-        potential_moves = self._get_potential_move_actions(labware, potential_paths)
+        planned_move = self._take_planned_move(thread_id, current_location)
+        if planned_move is not None:
+            return planned_move
+        potential_routes = self._get_potential_routes(current_location, target_location)
+        if self._lookahead_hops != 1 and any(len(route.stops) > 2 for route in potential_routes):
+            return await self._resolve_route(thread_id, labware, potential_routes, assigned_action)
+        potential_moves = self._get_route_move_actions(labware, potential_routes)
         if assigned_action is not None:
             self._assign_reservation_to_moves(potential_moves, assigned_action)
         # check for any moves using the assigned_action's reservation
@@ -151,43 +245,147 @@ class MoveHandler:
         # NOTE: Although move_action does not have a reservation and does not need to be released, 
         # even though it is set as completed, it is also deadlocked.  This may lead to confusion and may need to be changed
         # due to this, this handling may work better else where
-        
-        potential_paths = self._system_map.get_shortest_paths_to_deadlock_resolution(move_action.source.teachpoint_name)
-        # if move_action.target is in the potential_paths, remove it
-        potential_paths = [path for path in potential_paths if move_action.target.teachpoint_name not in path]
-        sorted_paths = sorted(potential_paths, key=lambda path: len(path))
-        potential_moves = self._get_potential_move_actions( move_action.labware, sorted_paths)
-       
+        self._release_planned_moves(thread_id)
+        potential_moves = self._get_deadlock_resolution_moves(move_action)
         return await self._resolve_reservation_from_move_action_collection(thread_id, potential_moves)
 
+    def _get_deadlock_resolution_moves(self, move_action: MoveAction) -> List[MoveAction]:
+        source, target = move_action.source.teachpoint_name, move_action.target.teachpoint_name
+        # pads other threads wait for are skipped too, parking there would block them in turn
+        coordinator = self._thread_reservation_coordinator
+        exclude = set(coordinator.reserved_locations) | set(coordinator.awaited_locations)
+        buffers = self._system_map.get_nearest_free_buffers(source, self._deadlock_buffers, exclude)
+        # paths through the deadlocked target are skipped, nearest buffer first
+        potential_paths = [path for buffer in buffers for path in self._system_map.get_all_shortest_any_paths(source, buffer)
+                           if target not in path]
+        return self._get_potential_move_actions(move_action.labware, potential_paths)
+
 
     async def _resolve_reservation_from_move_action_collection(self, thread_id: str, potential_moves: List[MoveAction]) -> MoveAction:
         reservation_request_collection = MoveActionCollectionReservationRequest(thread_id, potential_moves)
-        await self._thread_reservation_coordinator.submit_reservation_request(thread_id, reservation_request_collection)
-        await reservation_request_collection.processed.wait()
-        if reservation_request_collection.rejected.is_set():
-            await asyncio.sleep(0.2)
-            orca_logger.info("Reservation request collection was rejected, retrying")
-            reservation_request_collection.clear()
-            return await self._resolve_reservation_from_move_action_collection(thread_id, potential_moves)
-        if reservation_request_collection.deadlocked.is_set():
-            reservation_request_collection.clear()
-            return await self.handle_deadlock(thread_id, potential_moves[0])
-        if reservation_request_collection.granted.is_set():
-            return reservation_request_collection.reserved_move_action
+        return await self._resolve_reservation(thread_id, reservation_request_collection, potential_moves[0])
+
+    async def _resolve_reservation(self, thread_id: str, reservation_request_collection: MoveActionCollectionReservationRequest, first_move: MoveAction) -> MoveAction:
+        parked = False
+        while True:
+            await self._thread_reservation_coordinator.submit_reservation_request(thread_id, reservation_request_collection, parked)
+            await reservation_request_collection.processed.wait()
+            if reservation_request_collection.deadlocked.is_set():
+                orca_logger.info(f"Thread {thread_id} - Deadlock detected while reserving a move from {first_move.source.name}")
+                # reroute in place rather than recursing, a thread may be deadlocked many times before it moves
+                potential_moves = self._get_deadlock_resolution_moves(first_move)
+                # with nowhere to park the labware, wait parked for another thread in the cycle to back out rather than
+                # being backed out again on every tick
+                parked = len(potential_moves) == 0
+                if parked:
+                    reservation_request_collection.clear()
+                else:
+                    reservation_request_collection = MoveActionCollectionReservationRequest(thread_id, potential_moves)
+                continue
+            if reservation_request_collection.granted.is_set():
+                if isinstance(reservation_request_collection, RouteReservationRequest):
+                    self._planned_moves[thread_id] = reservation_request_collection.reserved_route[1:]
+                return reservation_request_collection.reserved_move_action
+            break
         raise ValueError("Route reservation was not granted")
    
-    def _get_potential_paths(self, current_location: Location, target_location: Location) -> List[List[str]]:
+    def _get_potential_routes(self, current_location: Location, target_location: Location) -> List[TransporterRoute]:
         if current_location == target_location:
             raise ValueError("Source and target locations are the same")
-        potential_paths = self._system_map.get_all_shortest_any_paths(current_location.teachpoint_name, target_location.teachpoint_name)
+        source, target = current_location.teachpoint_name, target_location.teachpoint_name
+        potential_paths = self._system_map.get_all_shortest_any_paths(source, target)
         if potential_paths == []:
             raise ValueError("No routes found between source and target")
-        return potential_paths
+        routes = [self._system_map.get_route(path) for path in potential_paths]
+        if self._route_alternatives <= 1 or not all(route.transporters[0].queue_depth >= self._saturation for route in routes):
+            return routes
+        # every arm on a shortest route is busy, so rank the shortest and alternative routes by their cost plus the time
+        # each arm along them is expected to be busy with the moves already queued on it
+        alternatives = self._system_map.get_k_shortest_routes(source, target, self._route_alternatives)
+        routes.extend(route for route in alternatives if all(self._is_transit_stop(stop) for stop in route.stops[1:-1]))
+        ranked = sorted(routes, key=self._get_congested_cost)
+        orca_logger.info(f"Transporters on the shortest routes from {source} to {target} are saturated, "
+                         f"considering routes through {', '.join(dict.fromkeys(r.transporters[0].name for r in ranked))}")
+        return ranked
+
+    async def _resolve_route(self, thread_id: str, labware: LabwareInstance, routes: List[TransporterRoute], assigned_action: ILocationAction | None) -> MoveAction:
+        route_moves = self._get_lookahead_route_moves(labware, routes)
+        if assigned_action is not None:
+            for moves in route_moves:
+                self._assign_reservation_to_moves(moves, assigned_action)
+                # a route straight to the assigned action's location is held already
+                if all(m.reservation.granted.is_set() for m in moves):
+                    self._planned_moves[thread_id] = moves[1:]
+                    return moves[0]
+        # routes whose handoffs are free and unreserved now are tried first, the others may still be granted once freed
+        # a location with several slots may still take more labware while reserved
+        reserved = self._thread_reservation_coordinator.reserved_locations
+        route_moves.sort(key=lambda moves: any(not m.target.has_free_slot or (m.target.capacity == 1 and m.target.teachpoint_name in reserved)
+                                               for m in moves if not m.reservation.granted.is_set()))
+        reservation_request_collection = RouteReservationRequest(thread_id, route_moves)
+        return await self._resolve_reservation(thread_id, reservation_request_collection, route_moves[0][0])
+
+    def _get_lookahead_route_moves(self, labware: LabwareInstance, routes: List[TransporterRoute]) -> List[List[MoveAction]]:
+        route_moves: List[List[MoveAction]] = []
+        seen: Set[Tuple[str, ...]] = set()
+        for route in routes:
+            hops = len(route.transporters) if self._lookahead_hops is None else min(self._lookahead_hops, len(route.transporters))
+            stops = tuple(route.stops[:hops + 1])
+            if stops in seen:
+                continue
+            seen.add(stops)
+            route_moves.append([MoveAction(labware, self._system_map.get_location(start), self._system_map.get_location(end), transporter)
+                                for start, end, transporter in zip(stops, stops[1:], route.transporters)])
+        return route_moves
+
+    def _take_planned_move(self, thread_id: str, current_location: Location) -> MoveAction | None:
+        planned_moves = self._planned_moves.get(thread_id)
+        if not planned_moves:
+            return None
+        if planned_moves[0].source == current_location:
+            return planned_moves.pop(0)
+        # the labware left the planned route, e.g. to resolve a deadlock
+        self._release_planned_moves(thread_id)
+        return None
+
+    def _release_planned_moves(self, thread_id: str) -> None:
+        for move in self._planned_moves.pop(thread_id, []):
+            # reservations not released on place belong to the assigned action
+            if move.release_reservation_on_place:
+                move.reservation.release_reservation()
+
+    def _is_transit_stop(self, name: str) -> bool:
+        # alternative routes only hand labware off at plain positions and plate pads, never through a device that may be in use
+        resource = self._system_map.get_location(name).resource
+        return resource is None or isinstance(resource, PlatePad)
+
+    def _get_congested_cost(self, route: TransporterRoute) -> float:
+        busy_time = sum(t.queue_depth * self._system_map.get_transporter_hop_cost(t.name) for t in dict.fromkeys(route.transporters))
+        return route.cost + busy_time
+
+    def _get_route_move_actions(self, labware: LabwareInstance, routes: List[TransporterRoute]) -> List[MoveAction]:
+        # only the first hop of each route is moved now, one move per target through the best ranked transporter, as moves to
+        # the same target would share the target's reservation
+        potential_actions: List[MoveAction] = []
+        seen: Set[str] = set()
+        for route in routes:
+            transporter: TransporterEquipment = route.transporters[0]
+            if route.stops[1] in seen:
+                continue
+            seen.add(route.stops[1])
+            source_location = self._system_map.get_location(route.stops[0])
+            target = self._system_map.get_location(route.stops[1])
+            potential_actions.append(MoveAction(labware, source_location, target, transporter))
+        return potential_actions
 
     def _get_potential_move_actions(self, labware: LabwareInstance, potential_paths: List[List[str]]) -> List[MoveAction]:
         potential_actions: List[MoveAction] = []
+        seen: Set[str] = set()
         for path in potential_paths:
+            # one move per target, a thread's second request for a location would take over its first
+            if path[1] in seen:
+                continue
+            seen.add(path[1])
             source_location = self._system_map.get_location(path[0])
             target = self._system_map.get_location(path[1])
             transporter = self._system_map.get_transporter_between(source_location.name, target.name)
@@ -1,92 +1,343 @@
 
 import asyncio
 import logging
-from typing import Dict, List
-from orca.resource_models.location import ILabwareLocationObserver
+import math
+from typing import Callable, Collection, Dict, Iterable, List, Optional, Set, Tuple
+from orca.resource_models.labware import LabwareInstance
+from orca.resource_models.location import ILabwareLocationObserver, Location
 from orca.system.reservation_manager.location_reservation import LocationReservation
 from orca.system.reservation_manager.deadlock_manager import ThreadDeadlockDetector
-from orca.system.reservation_manager.interfaces import IAvailabilityManager, IReservationCollection, IReservationManager, IThreadReservationCoordinator
+from orca.system.reservation_manager.interfaces import IAvailabilityManager, ILocationNeeds, IReservationCollection, IReservationManager, IThreadReservationCoordinator
 from orca.system.system_map import ILocationRegistry
 from orca.system.thread_registry_interface import IThreadRegistry
 
 orca_logger = logging.getLogger("orca")
 
 class LocationReservationManager(IReservationManager, IAvailabilityManager, ILabwareLocationObserver):
+    """Grants reservations of locations.  A location with several slots, see Location.capacity, is reserved by up to one
+    reservation per slot, a slot being taken by a reservation or by labware held there without one."""
     def __init__(self, location_reg: ILocationRegistry) -> None:
         self._location_reg = location_reg
-        self._reservations: Dict[str, LocationReservation] = {}
+        self._reservations: Dict[str, List[LocationReservation]] = {}
+        # the thread holding each reservation, by reservation ID
+        self._holders: Dict[str, str] = {}
+        self._release_callback: Callable[[str], None] = lambda location_name: None
 
     @property
-    def reservations(self) -> Dict[str, LocationReservation]:
-        """Returns the current reservations."""
+    def reservations(self) -> Dict[str, List[LocationReservation]]:
+        """Returns the current reservations of each reserved location."""
         return self._reservations
 
     def get_reservation_at(self, location_name: str) -> LocationReservation | None:
-        """Returns the reservation for the given location name, if it exists."""
-        return self._reservations.get(location_name, None)
-
-    def attempt_reservation(self, location_name: str, request: LocationReservation) -> None:
-        """Attempts to reserve a location for the given request."""
-        if self.can_reserve(location_name):
-            self._reserve(location_name, request)
+        """Returns the earliest current reservation for the given location name, if it exists."""
+        reservations = self._reservations.get(location_name)
+        return reservations[0] if reservations else None
+
+    def get_holder(self, location_name: str) -> str | None:
+        """Returns the ID of the thread holding the earliest reservation for the given location name, if any."""
+        holders = self.get_holders(location_name)
+        return holders[0] if holders else None
+
+    def get_holders(self, location_name: str) -> List[str]:
+        """Returns the IDs of the threads holding reservations for the given location name."""
+        return [self._holders[r.id] for r in self._reservations.get(location_name, []) if r.id in self._holders]
+
+    def get_held_locations(self, thread_id: str) -> List[str]:
+        """Returns the names of the locations whose reservations the thread holds."""
+        return [location_name for location_name in self._reservations if thread_id in self.get_holders(location_name)]
+
+    def attempt_reservation(self, location_name: str, request: LocationReservation, thread_id: str | None = None) -> None:
+        """Attempts to reserve a location for the given request.  A thread's action may take over the reservation of the
+        thread's previous action on the same device, see can_reserve."""
+        if self.can_reserve(location_name, self._taking_over_as(request, thread_id)):
+            self._reserve(location_name, request, thread_id)
             request.granted.set()
         else:
             request.rejected.set()
         request.processed.set()
 
-    def _reserve(self, location_name: str, request: LocationReservation) -> None:
-        self._reservations[location_name] = request
+    def attempt_reservations(self, requests: List[LocationReservation], thread_id: str | None = None) -> bool:
+        """Reserves the requested location of every request, or of none if any cannot be reserved, so locations needed together
+        are never held in part.  Requests that are not granted are left unprocessed."""
+        if not self.can_reserve_all(requests, thread_id):
+            return False
+        for request in requests:
+            self._reserve(request.requested_location.name, request, thread_id)
+            request.granted.set()
+            request.processed.set()
+        return True
+
+    def can_reserve_all(self, requests: List[LocationReservation], thread_id: str | None = None) -> bool:
+        return all(self.can_reserve(r.requested_location.name, self._taking_over_as(r, thread_id)) for r in requests)
+
+    def _reserve(self, location_name: str, request: LocationReservation, thread_id: str | None = None) -> None:
+        reservations = self._reservations.setdefault(location_name, [])
+        taken_over = self._get_action_reservation_of(location_name, self._taking_over_as(request, thread_id))
+        if taken_over is not None:
+            reservations.remove(taken_over)
+            del self._holders[taken_over.id]
+        reservations.append(request)
+        if thread_id is not None:
+            self._holders[request.id] = thread_id
         request.set_location(self._location_reg.get_location(location_name))
-        request.set_reservation_release_callback(lambda: self.release_reservation(location_name))
+        request.set_reservation_release_callback(lambda: self._release_if_held(location_name, request))
         orca_logger.info(f"Thread {request.labware} - Reservation {request.id} granted for {location_name}")
 
-    def can_reserve(self, location_name: str) -> bool:
-        loation_is_unreserved = location_name not in self._reservations.keys() 
-        location_is_empty = self._location_reg.get_location(location_name).labware is None
-        return loation_is_unreserved and location_is_empty
+    @staticmethod
+    def _taking_over_as(request: LocationReservation, thread_id: str | None) -> str | None:
+        # only the reservation of an action's location, which unlike a move's names no labware, takes over another
+        return thread_id if request.labware is None else None
+
+    def _get_action_reservation_of(self, location_name: str, thread_id: str | None) -> LocationReservation | None:
+        if thread_id is None:
+            return None
+        return next((r for r in self._reservations.get(location_name, [])
+                     if r.labware is None and self._holders.get(r.id) == thread_id), None)
+
+    def can_reserve(self, location_name: str, thread_id: str | None = None) -> bool:
+        """Returns whether the location can be reserved.  If a thread is given, the location is reserved for the thread's
+        action there, which may take over the reservation of the thread's previous action on the same device: a device stays
+        reserved while the labware of its last action is loaded, and the thread's next action on it would otherwise wait on
+        itself.  Reservations made for moves are never taken over."""
+        location = self._location_reg.get_location(location_name)
+        reservations = self._reservations.get(location_name, [])
+        taking_over = self._get_action_reservation_of(location_name, thread_id) is not None
+        if location.capacity == 1 or taking_over:
+            return (not reservations or taking_over) and location.labware is None
+        # labware that arrived under its reservation takes one slot, not two
+        present = location.labwares
+        used_slots = len(present) + sum(1 for r in reservations if r.labware is None or r.labware not in present)
+        return location.labware is None and used_slots < location.capacity
     
-    def release_reservation(self, location_name: str) -> None:
-        if location_name in self._reservations.keys():
-            reservation = self._reservations[location_name]
-            orca_logger.info(f"Releasing reservation {reservation.id} for {location_name}")
+    def set_release_callback(self, callback: Callable[[str], None]) -> None:
+        """Sets a callback to be called with the location name whenever a reservation is released."""
+        self._release_callback = callback
+
+    def release_reservation(self, location_name: str, thread_id: str | None = None) -> None:
+        """Releases the reservations for the location, or only the one the given thread holds."""
+        for reservation in list(self._reservations.get(location_name, [])):
+            if thread_id is None or self._holders.get(reservation.id) == thread_id:
+                self._release(location_name, reservation)
+
+    def _release(self, location_name: str, reservation: LocationReservation) -> None:
+        orca_logger.info(f"Releasing reservation {reservation.id} for {location_name}")
+        reservations = self._reservations[location_name]
+        reservations.remove(reservation)
+        if not reservations:
             del self._reservations[location_name]
+        self._holders.pop(reservation.id, None)
+        self._release_callback(location_name)
+
+    def _release_if_held(self, location_name: str, request: LocationReservation) -> None:
+        # a reservation may be released more than once, e.g. when its action completes and again when its labware leaves,
+        # by then the location may be reserved by another request which must not be released
+        if request in self._reservations.get(location_name, []):
+            self._release(location_name, request)
 
 
+class _ReservationShard:
+    """The requests waiting for the locations of one zone of the workcell and the leases held on them."""
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.location_queues: Dict[str, List[IReservationCollection]] = {}
+        # the request each thread waits with, of the requests whose locations all lie in the zone
+        self.waiting: Dict[str, IReservationCollection] = {}
+        # when the lease of each reservation expires by location name and holding thread, if leases expire
+        self.lease_expiry: Dict[Tuple[str, str], float] = {}
+        # whether a request started waiting in the zone, or a location one waits for changed hands, since the last rescan
+        self.changed = False
+
 
 class ThreadReservationCoordinator(IThreadReservationCoordinator, IAvailabilityManager, ILabwareLocationObserver):
-    def __init__(self, location_reg: ILocationRegistry, thread_registry: IThreadRegistry) -> None:
+    """Grants reservation requests as they are submitted.
+
+    A request is granted the first of its alternatives, e.g. a device of a pool or a route, whose locations can all be
+    reserved.  The locations of that alternative are reserved together and the others are left alone, so other threads are
+    never turned away from a location granted only for a moment.
+
+    A rejected request waits in the queue of every location it requested.  When a reservation at a location is released or
+    labware is picked from it, the requests waiting there are retried by the priority of their thread, then by the nearest
+    thread deadline, then in the order they were first rejected.  A waiting request gains a priority level for every
+    `priority_aging` seconds it waits, so low priority threads are not starved.
+
+    Deadlocks are found as requests start waiting, the lowest ranked waiting thread of each cycle backs out.  A thread that
+    backed out and waits in the same cycle again is left waiting until the next tick, so a thread with nowhere to back out to
+    does not retry without end.  A request resubmitted parked, e.g. by a thread that backed out with nowhere to move its
+    labware, is not backed out again until a location it waits for is released or labware is picked from it.  The tick
+    loop rescans every waiting request, e.g. for labware placed without a reservation.
+
+    With `avoid_deadlocks` set, deadlocks between the admitted threads over the locations of their actions are avoided
+    rather than broken, in the manner of the banker's algorithm.  A location is not granted if afterwards the admitted
+    threads could no longer all finish one after another, each finishing once every location it still needs is free, its
+    own or held by a thread finishing before it.  Such a request waits until a reservation is released or a thread finishes.
+
+    Each reservation is a lease held by the thread it was granted to.  The reservations a thread still holds when it is
+    removed, e.g. after an action raised, are reclaimed.  With a `lease_duration` a lease also expires unless its thread
+    renews it in time, which reclaims the reservations of a thread that stopped without being removed.
+
+    With `zones`, e.g. from SystemMap.get_zones, the coordinator is sharded by zone so a tick only rescans the zones that
+    changed.  Each zone keeps the queues of its locations, the requests whose locations all lie in it and the leases on its
+    locations.  The locations of no zone, e.g. the transfer stations joining the zones, and the requests spanning zones are
+    kept by a shared shard.  Each tick reclaims the expired leases of every shard and rescans the waiting requests of the
+    shards where a request started waiting, a location a request waits for changed hands or labware was placed, or a thread
+    that backed out still waits.  The wait-for graph spans every zone, so a deadlock across zones is still found as it
+    forms, and by the tick after any zone it reaches changes.
+    """
+    def __init__(self,
+                 location_reg: ILocationRegistry,
+                 thread_registry: IThreadRegistry,
+                 priority_aging: float = 60.0,
+                 avoid_deadlocks: bool = False,
+                 lease_duration: Optional[float] = None,
+                 zones: Optional[Collection[Collection[str]]] = None) -> None:
+        if priority_aging <= 0:
+            raise ValueError("priority_aging must be positive")
+        if lease_duration is not None and lease_duration <= 0:
+            raise ValueError("lease_duration must be positive")
         self._location_reg = location_reg
+        self._thread_registry = thread_registry
+        self._priority_aging = priority_aging
+        self._avoid_deadlocks = avoid_deadlocks
+        self._admitted: Dict[str, ILocationNeeds] = {}
+        # requests waiting for a location that is free but was not granted to avoid a deadlock
+        self._deferred: Dict[IReservationCollection, None] = {}
+        self._lease_duration = lease_duration
+        self._reclaimed_leases: Dict[str, int] = {}
+        self._thread_started_at: Dict[str, float] = {}
         self._reservation_manager: LocationReservationManager = LocationReservationManager(location_reg)
-        self._queue: List[IReservationCollection] = []
+        self._reservation_manager.set_release_callback(self._on_release)
+        self._thread_removed_callbacks: List[Callable[[str], None]] = []
+        self._shared_shard = _ReservationShard("shared")
+        self._shards: List[_ReservationShard] = [self._shared_shard]
+        self._shard_of: Dict[str, _ReservationShard] = {}
+        for i, zone in enumerate(zones or []):
+            shard = _ReservationShard(f"zone_{i}")
+            self._shards.append(shard)
+            for location_name in zone:
+                if location_name in self._shard_of:
+                    raise ValueError(f"Location {location_name} is in more than one zone")
+                self._shard_of[location_name] = shard
+        # the request each thread waits with and the shard it waits in, a retried route may move to another shard
+        self._waiting: Dict[str, IReservationCollection] = {}
+        self._waiting_shards: Dict[str, _ReservationShard] = {}
+        # the locations each waiting request is queued at
+        self._queued_at: Dict[IReservationCollection, List[str]] = {}
         # self._deadlock_detector = DeadlockDetector(location_reg, self._location_reservations, self._location_queues)
-        self._deadlock_detector = ThreadDeadlockDetector(thread_registry)
+        self._deadlock_detector = ThreadDeadlockDetector(thread_registry, self._reservation_manager.get_holders)
+        self._backed_out: Set[str] = set()
+        # threads waiting parked, left out of backing out until a location they wait for changes hands
+        self._parked: Set[str] = set()
+        # locations given up by a thread backing out, served first to the thread of the cycle waiting for them
+        self._handoffs: Dict[str, str] = {}
         self.ticker_started = False
-        self._lock = asyncio.Lock()
+        self._processing = False
+        self._submitted_at: Dict[IReservationCollection, float] = {}
+        self._wait_times: List[float] = []
+        self._deadlock_wait_times: List[float] = []
+
+    @property
+    def reservation_wait_times(self) -> List[float]:
+        """The time, in event loop seconds, each granted request waited from its first submission until it was granted.
+        Requests abandoned after a deadlock are not included."""
+        return list(self._wait_times)
+
+    @property
+    def deadlock_wait_times(self) -> List[float]:
+        """The time, in event loop seconds, each deadlocked request waited from its first submission until its deadlock was found."""
+        return list(self._deadlock_wait_times)
+
+    @property
+    def reclaimed_leases(self) -> Dict[str, int]:
+        """The number of reservations reclaimed by reason, "expired" for leases not renewed in time and "thread_ended" for
+        reservations still held by a thread when it was removed."""
+        return dict(self._reclaimed_leases)
+
+    @property
+    def reserved_locations(self) -> Collection[str]:
+        return self._reservation_manager.reservations.keys()
+
+    @property
+    def awaited_locations(self) -> Collection[str]:
+        return {name for shard in self._shards for name, queue in shard.location_queues.items() if queue}
+
+    @property
+    def lease_duration(self) -> Optional[float]:
+        return self._lease_duration
+
+    def admit_thread(self, thread_id: str, needs: ILocationNeeds) -> None:
+        self._admitted[thread_id] = needs
+
+    def add_thread_removed_callback(self, callback: Callable[[str], None]) -> None:
+        self._thread_removed_callbacks.append(callback)
+
+    def remove_thread(self, thread_id: str) -> None:
+        for callback in self._thread_removed_callbacks:
+            callback(thread_id)
+        self._admitted.pop(thread_id, None)
+        self._backed_out.discard(thread_id)
+        self._parked.discard(thread_id)
+        for location_name in [name for name, heir in self._handoffs.items() if heir == thread_id]:
+            del self._handoffs[location_name]
+        for location_name in self._reservation_manager.get_held_locations(thread_id):
+            self._reclaim(location_name, thread_id, "thread_ended")
+        self._retry_deferred()
+
+    def renew_leases(self, thread_id: str) -> None:
+        if self._lease_duration is None:
+            return
+        expires_at = asyncio.get_running_loop().time() + self._lease_duration
+        for location_name in self._reservation_manager.get_held_locations(thread_id):
+            self._get_shard(location_name).lease_expiry[(location_name, thread_id)] = expires_at
+
+    def reset_statistics(self) -> None:
+        self._wait_times.clear()
+        self._deadlock_wait_times.clear()
+        self._reclaimed_leases.clear()
 
     async def start_tick_loop(self, tick_interval: float = 0.3) -> None:
-        """Starts a periodic tick loop to check for deadlocks and process reservations."""
+        """Starts a periodic tick loop to check the waiting requests for deadlocks.
+        Only one tick loop runs per coordinator, later calls return immediately."""
+        if self.ticker_started:
+            return
         self.ticker_started = True
         while True:
             await asyncio.sleep(tick_interval)
             await self._on_tick()
 
     async def _on_tick(self) -> None:
-        """This method is called periodically to check for deadlocks and process reservations."""
-        
-        # copy over the queue
-        async with self._lock:
-            queue_snapshot = list(self._queue)
-            self._queue.clear()
+        """This method is called periodically to tick every shard."""
+        for shard in self._shards:
+            self._on_shard_tick(shard)
+
+    def _on_shard_tick(self, shard: _ReservationShard) -> None:
+        """Reclaims the shard's expired leases and rescans its waiting requests for deadlocks if anything they wait on changed."""
+        self._reclaim_expired_leases(shard)
+        if not shard.changed and shard.waiting.keys().isdisjoint(self._backed_out):
+            return
+        shard.changed = False
+        self._backed_out.difference_update(shard.waiting)
+        self._detect_dead_lock(list(shard.waiting.values()))
 
-        # attempt to get a reservation
-        for collection in queue_snapshot:
-            for r in collection.get_reservations():
-                self._reservation_manager.attempt_reservation(r.requested_location.name, r)
-            
-            collection.resolve_final_reservation()
-            collection.processed.set()
+    def _reclaim_expired_leases(self, shard: _ReservationShard) -> None:
+        if not shard.lease_expiry:
+            return
+        now = asyncio.get_running_loop().time()
+        for location_name, thread_id in [lease for lease, expires_at in shard.lease_expiry.items() if expires_at <= now]:
+            self._reclaim(location_name, thread_id, "expired")
+
+    def _reclaim(self, location_name: str, thread_id: str, reason: str) -> None:
+        orca_logger.warning(f"Thread {thread_id} - Reservation for {location_name} reclaimed, {reason.replace('_', ' ')}")
+        self._reclaimed_leases[reason] = self._reclaimed_leases.get(reason, 0) + 1
+        self._get_shard(location_name).lease_expiry.pop((location_name, thread_id), None)
+        self._reservation_manager.release_reservation(location_name, thread_id)
+
+    def _get_shard(self, location_name: str) -> _ReservationShard:
+        return self._shard_of.get(location_name, self._shared_shard)
 
-        self._detect_dead_lock(queue_snapshot)
+    def _get_request_shard(self, collection: IReservationCollection) -> _ReservationShard:
+        """Returns the shard of the zone holding every location of the request, or the shared shard for a request spanning zones."""
+        shards = {self._get_shard(r.requested_location.name) for r in collection.get_reservations()}
+        return shards.pop() if len(shards) == 1 else self._shared_shard
 
     def _detect_dead_lock(self, queue: List[IReservationCollection]) -> None:
         """Detects deadlocks in the current reservation state."""
@@ -95,14 +346,238 @@ class ThreadReservationCoordinator(IThreadReservationCoordinator, IAvailabilityM
         if not rejected_queue:
             return
  
-        self._deadlock_detector.detect_deadlocks(rejected_queue)
-
-        
-    async def submit_reservation_request(self, thread_id: str, request: IReservationCollection) -> None:
+        self._break_cycles(self._deadlock_detector.detect_deadlocks(rejected_queue))
+
+    def _break_cycles(self, cycles: List[List[str]]) -> None:
+        for cycle in cycles:
+            waiting = [self._waiting[thread_id] for thread_id in cycle if thread_id in self._waiting]
+            if len(waiting) < len(cycle):
+                # a thread in the cycle backed out for another cycle found in the same event
+                continue
+            candidates = [c for c in waiting if c.thread_id not in self._backed_out and c.thread_id not in self._parked]
+            if not candidates:
+                continue
+            self._back_out(self._rank(candidates)[-1], cycle)
+
+    def _back_out(self, collection: IReservationCollection, cycle: List[str]) -> None:
+        orca_logger.info(f"Threads {', '.join(cycle)} wait for each other, thread {collection.thread_id} backs out")
+        now = asyncio.get_running_loop().time()
+        self._deadlock_wait_times.append(now - self._submitted_at.get(collection, now))
+        self._backed_out.add(collection.thread_id)
+        for other in cycle:
+            waiting = self._waiting.get(other)
+            if other == collection.thread_id or waiting is None:
+                continue
+            for r in waiting.get_reservations():
+                if self._deadlock_detector.get_occupant(r.requested_location) == collection.thread_id:
+                    self._handoffs[r.requested_location.name] = other
+        collection.rejected.clear()
+        collection.deadlocked.set()
+        # the thread backs out and submits a new request
+        self._withdraw(collection)
+        collection.processed.set()
+
+    async def submit_reservation_request(self, thread_id: str, request: IReservationCollection, parked: bool = False) -> None:
+        """Submits a request and returns once it has been granted or found deadlocked."""
         if self.ticker_started is False:
             orca_logger.warning("Reservation Coordinator Ticker not started.")
-        async with self._lock:
-            self._queue.append(request)
+        now = asyncio.get_running_loop().time()
+        self._submitted_at.setdefault(request, now)
+        self._thread_started_at.setdefault(thread_id, now)
+        if parked:
+            self._parked.add(thread_id)
+        self._process(request)
+        try:
+            # a retry rejected again sets processed while resolving and clears it after, which still wakes the waiter
+            while not request.processed.is_set():
+                await request.processed.wait()
+        except asyncio.CancelledError:
+            self._withdraw(request)
+            raise
+
+    def _process(self, collection: IReservationCollection) -> None:
+        # reservations given back while resolving a request change nothing for the waiting requests
+        self._processing = True
+        deferred = False
+        try:
+            # the first alternative that can be reserved in full is granted and the others are not touched, so no location
+            # is held for a moment by a request that does not need it
+            for option in collection.get_reservation_options():
+                location_names = [r.requested_location.name for r in option]
+                if self._avoid_deadlocks and self._reservation_manager.can_reserve_all(option, collection.thread_id) \
+                        and not self._is_safe_grant(collection.thread_id, location_names):
+                    orca_logger.info(f"Thread {collection.thread_id} - Reservation of {', '.join(location_names)} deferred to avoid a deadlock")
+                    deferred = True
+                    continue
+                if self._reservation_manager.attempt_reservations(option, collection.thread_id):
+                    if self._lease_duration is not None:
+                        expires_at = asyncio.get_running_loop().time() + self._lease_duration
+                        for name in location_names:
+                            self._get_shard(name).lease_expiry[(name, collection.thread_id)] = expires_at
+                    break
+            for r in collection.get_reservations():
+                if not r.granted.is_set():
+                    r.rejected.set()
+                    r.processed.set()
+            collection.resolve_final_reservation()
+        finally:
+            self._processing = False
+
+        if deferred and not collection.granted.is_set():
+            self._deferred[collection] = None
+        else:
+            self._deferred.pop(collection, None)
+
+        if collection.granted.is_set():
+            now = asyncio.get_running_loop().time()
+            self._wait_times.append(now - self._submitted_at.pop(collection, now))
+            self._withdraw(collection)
+            collection.processed.set()
+            # the requests still waiting there now wait for this thread
+            self._update_waiting([r.requested_location.name for r in collection.get_reservations()])
+        else:
+            # stays rejected for the deadlock scan, but is not processed until granted
+            collection.processed.clear()
+            queued_at = self._queued_at.setdefault(collection, [])
+            for r in collection.get_reservations():
+                location = r.requested_location
+                queue = self._get_shard(location.name).location_queues.setdefault(location.name, [])
+                # a request retried keeps its place in the queue
+                if collection not in queue:
+                    queue.append(collection)
+                    queued_at.append(location.name)
+                location.add_observer(self)
+            self._set_waiting(collection)
+            self._break_cycles(self._deadlock_detector.update(collection))
+
+    def _serve(self, location_name: str) -> None:
+        """Retries the requests waiting for the location in order until it is taken."""
+        queue = self._get_shard(location_name).location_queues.get(location_name, [])
+        # the location changed hands, so the requests parked on it may back out again if still deadlocked
+        self._parked.difference_update(c.thread_id for c in queue)
+        ranked = self._rank(queue)
+        heir = self._handoffs.get(location_name)
+        if heir is not None:
+            # the thread the location was given up to by a thread backing out goes first, so the cycle is not closed again
+            ranked.sort(key=lambda c: c.thread_id != heir)
+        for collection in ranked:
+            if not self._reservation_manager.can_reserve(location_name):
+                self._handoffs.pop(location_name, None)
+                break
+            if collection.processed.is_set():
+                continue
+            collection.clear()
+            self._process(collection)
+        self._update_waiting([location_name])
+        self._retry_deferred()
+
+    def _retry_deferred(self) -> None:
+        """Retries the requests deferred to avoid a deadlock, which may be safe to grant once anything changed hands."""
+        for collection in self._rank(list(self._deferred)):
+            if collection.processed.is_set():
+                continue
+            collection.clear()
+            self._process(collection)
+
+    def _is_safe_grant(self, thread_id: str, location_names: List[str]) -> bool:
+        """Returns whether granting the locations to the thread leaves the admitted threads able to finish."""
+        needs = {t: thread.get_future_location_needs() for t, thread in self._admitted.items()}
+        needed = {name for steps in needs.values() for step in steps for name in step}
+        granted = [name for name in location_names if name in needed]
+        if not granted:
+            return True
+        locations = [self._location_reg.get_location(name) for name in needed]
+        # a location with several slots is left to deadlock detection, it seldom blocks a thread for good
+        occupants = {location.name: self._deadlock_detector.get_occupant(location) for location in locations if location.capacity == 1}
+        granted = [name for name in granted if name in occupants]
+        if not granted:
+            return True
+        if self._is_safe(needs, {**occupants, **dict.fromkeys(granted, thread_id)}):
+            return True
+        # avoidance only keeps a safe state safe, a state already unsafe is left to deadlock detection
+        return not self._is_safe(needs, occupants)
+
+    @staticmethod
+    def _is_safe(needs: Dict[str, List[List[str]]], occupants: Dict[str, str | None]) -> bool:
+        remaining = dict(needs)
+        finishing = True
+        while remaining and finishing:
+            finishing = False
+            for thread_id, steps in list(remaining.items()):
+                # a location is usable once free, held by the thread itself or by a thread that already finished
+                if all(any(occupants.get(name) == thread_id or occupants.get(name) not in remaining for name in step)
+                       for step in steps):
+                    del remaining[thread_id]
+                    finishing = True
+        return not remaining
+
+    def _update_waiting(self, location_names: List[str]) -> None:
+        """Updates what the requests waiting for the locations wait for, after the locations changed hands."""
+        waiting = dict.fromkeys(c for name in location_names for c in self._get_shard(name).location_queues.get(name, []))
+        self._mark_changed(waiting)
+        for collection in waiting:
+            if not collection.processed.is_set():
+                self._break_cycles(self._deadlock_detector.update(collection))
+
+    def _mark_changed(self, waiting: Iterable[IReservationCollection]) -> None:
+        """Marks the shards the requests wait in to be rescanned by the next tick."""
+        for collection in waiting:
+            shard = self._waiting_shards.get(collection.thread_id)
+            if shard is not None:
+                shard.changed = True
+
+    def _withdraw(self, collection: IReservationCollection) -> None:
+        self._submitted_at.pop(collection, None)
+        self._deferred.pop(collection, None)
+        self._parked.discard(collection.thread_id)
+        if self._waiting.get(collection.thread_id) is collection:
+            del self._waiting[collection.thread_id]
+            del self._waiting_shards.pop(collection.thread_id).waiting[collection.thread_id]
+            self._deadlock_detector.remove(collection.thread_id)
+        # a retried request may hold fresh reservations, so look in the queues it was added to rather than at the ones it requests now
+        for location_name in self._queued_at.pop(collection, []):
+            self._get_shard(location_name).location_queues[location_name].remove(collection)
+
+    def _set_waiting(self, collection: IReservationCollection) -> None:
+        thread_id = collection.thread_id
+        shard = self._get_request_shard(collection)
+        previous = self._waiting_shards.get(thread_id)
+        if previous is not None and previous is not shard:
+            previous.waiting.pop(thread_id, None)
+        self._waiting[thread_id] = collection
+        self._waiting_shards[thread_id] = shard
+        shard.waiting[thread_id] = collection
+        shard.changed = True
+
+    def _rank(self, queue: List[IReservationCollection]) -> List[IReservationCollection]:
+        """Orders waiting requests with the request to grant first at the front, ties keep their queue order."""
+        if len(queue) < 2:
+            return list(queue)
+        now = asyncio.get_running_loop().time()
+
+        def key(collection: IReservationCollection) -> Tuple[float, float]:
+            thread = self._thread_registry.get_thread(collection.thread_id)
+            waited = now - self._submitted_at.get(collection, now)
+            priority = thread.priority + int(waited // self._priority_aging)
+            started_at = self._thread_started_at.get(collection.thread_id, now)
+            deadline = started_at + thread.deadline if thread.deadline is not None else math.inf
+            return (-priority, deadline)
+        return sorted(queue, key=key)
+
+    def _on_release(self, location_name: str) -> None:
+        holders = self._reservation_manager.get_holders(location_name)
+        lease_expiry = self._get_shard(location_name).lease_expiry
+        for lease in [lease for lease in lease_expiry if lease[0] == location_name and lease[1] not in holders]:
+            del lease_expiry[lease]
+        if not self._processing:
+            self._serve(location_name)
+
+    def notify_labware_location_change(self, event: str, location: Location, labware: LabwareInstance) -> None:
+        if event == "picked":
+            self._serve(location.name)
+        else:
+            # e.g. labware placed without a reservation, the requests waiting there are rescanned by the next tick
+            self._mark_changed(self._get_shard(location.name).location_queues.get(location.name, []))
 
 
 
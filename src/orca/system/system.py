@@ -1,5 +1,5 @@
 from types import MappingProxyType
-from typing import List
+from typing import List, Optional
 from orca.resource_models.location import Location
 from orca.resource_models.resource_pool import EquipmentResourcePool
 from orca.resource_models.transporter_resource import TransporterEquipment
@@ -7,11 +7,14 @@ from orca.resource_models.base_resource import Equipment, IResource
 
 from orca.resource_models.labware import LabwareInstance, LabwareTemplate
 from orca.events.execution_context import WorkflowExecutionContext
+from orca.system.event_loop_monitor import EventLoopMonitor
+from orca.system.move_duration_estimator import MoveDurationEstimator
 from orca.system.system_info import SystemInfo
 from orca.system.system_interface import ISystem
 from orca.system.interfaces import IMethodRegistry
 from orca.system.interfaces import IWorkflowRegistry
 from orca.system.resource_registry import IResourceRegistry, IResourceRegistryObesrver
+from orca.system.reservation_manager.reservation_manager import ThreadReservationCoordinator
 from orca.system.system_map import SystemMap
 from orca.system.registries import LabwareRegistry, TemplateRegistry
 from orca.workflow_models.interfaces import IMethod
@@ -42,7 +45,10 @@ class System(ISystem):
                  thread_manager: IThreadManager,
                  method_registry: IMethodRegistry,
                  workflow_registry: IWorkflowRegistry,
-                 executing_workflow_registry: IExecutingWorkflowRegistry) -> None:
+                 executing_workflow_registry: IExecutingWorkflowRegistry,
+                 reservation_coordinator: Optional[ThreadReservationCoordinator] = None,
+                 event_loop_monitor: Optional[EventLoopMonitor] = None,
+                 move_duration_estimator: Optional[MoveDurationEstimator] = None) -> None:
         self._info = info
         self._resources = resource_registry
         self._system_map = system_map
@@ -56,6 +62,9 @@ class System(ISystem):
         self._executing_method_registry = executing_method_registry
         self._executing_thread_registry = executing_thread_registry
         self._executing_workflow_registry = executing_workflow_registry
+        self._reservation_coordinator = reservation_coordinator
+        self._event_loop_monitor = event_loop_monitor if event_loop_monitor is not None else EventLoopMonitor()
+        self._move_duration_estimator = move_duration_estimator
 
     @property
     def id(self) -> str:
@@ -74,6 +83,22 @@ class System(ISystem):
     def description(self) -> str:
         return self._info.description
     
+    @property
+    def reservation_coordinator(self) -> ThreadReservationCoordinator:
+        if self._reservation_coordinator is None:
+            raise ValueError("System was built without a reservation coordinator")
+        return self._reservation_coordinator
+
+    @property
+    def event_loop_monitor(self) -> EventLoopMonitor:
+        return self._event_loop_monitor
+
+    @property
+    def move_duration_estimator(self) -> MoveDurationEstimator:
+        if self._move_duration_estimator is None:
+            raise ValueError("System was built without a move duration estimator")
+        return self._move_duration_estimator
+
     @property
     def system_map(self) -> SystemMap:
         return self._system_map
@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 import typing
 
 from orca.system.thread_manager_interface import IThreadManager
-from orca.system.interfaces import IMethodRegistry, IMethodTemplateRegistry, ISystemInfo, IThreadTemplateRegistry, IWorkflowRegistry, IWorkflowTemplateRegistry
+from orca.system.interfaces import IEventLoopMonitor, IMethodRegistry, IMethodTemplateRegistry, ISystemInfo, IThreadTemplateRegistry, IWorkflowRegistry, IWorkflowTemplateRegistry
 from orca.system.labware_registry_interfaces import ILabwareRegistry, ILabwareTemplateRegistry
 from orca.system.resource_registry import IResourceRegistry
 from orca.system.system_map import ILocationRegistry, SystemMap
@@ -37,6 +37,11 @@ class ISystem(ISystemInfo,
     @abstractmethod
     def system_map(self) -> SystemMap:
         raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def event_loop_monitor(self) -> IEventLoopMonitor:
+        raise NotImplementedError
     
     @abstractmethod
     def create_and_register_thread_instance(self, template: "ThreadTemplate") -> "LabwareThreadInstance":
@@ -1,15 +1,17 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 import itertools
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Collection, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
 from orca.resource_models.base_resource import IResource, ILabwarePlaceable
 from orca.resource_models.labware import LabwareInstance
-from orca.resource_models.location import IResourceLocationObserver, Location
+from orca.resource_models.location import ILabwareLocationObserver, IResourceLocationObserver, Location
 import networkx as nx # type: ignore
+import numpy as np
 import matplotlib.pyplot as plt
 
 from orca.resource_models.plate_pad import PlatePad
-from orca.resource_models.transporter_resource import TransporterEquipment
+from orca.resource_models.transporter_resource import ITransporterLabwareObserver, TransporterEquipment
 from orca.system.resource_registry import IResourceRegistry
 from orca.system.resource_registry import IResourceRegistryObesrver
 
@@ -17,7 +19,89 @@ class IResourceLocator(ABC):
     def get_resource_location(self, resource_name: str) -> Location:
         raise NotImplementedError
 
-class _NetworkXHandler:
+class _GraphHandler(ABC):
+    """ The graph operations SystemMap needs from a backend.  Node names are location names or transporter hubs."""
+
+    @abstractmethod
+    def add_node(self, name: str, location: Location) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_edge(self, start: str, end: str, transporter: TransporterEquipment, weight: float = 1.0) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_edge_weight(self, start: str, end: str, weight: float) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def has_path(self, source: str, target: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_nodes(self) -> Dict[str, Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_node_data(self, name: str) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_shortest_path(self, source: str, target: str) -> List[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_all_shortest_paths(self, source: str, target: str) -> List[List[str]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_all_simple_paths(self, source: str, target: str) -> List[List[str]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_shortest_simple_paths(self, source: str, target: str) -> Iterator[List[str]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_subgraph(self, nodes: List[str]) -> _GraphHandler:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_filtered_view(self, filter_node: Callable[[str], bool], filter_edge: Callable[[str, str], bool]) -> _GraphHandler:
+        raise NotImplementedError
+
+    def get_view_without(self, nodes: Collection[str], transporters: Collection[str]) -> _GraphHandler:
+        """Returns a read-only view of the graph without the given nodes and the edges of the given transporters"""
+        edges = self.get_edge_data
+        return self.get_filtered_view(lambda name: name not in nodes,
+                                      lambda start, end: edges(start, end)["transporter"].name not in transporters)
+
+    @abstractmethod
+    def get_path_graph(self, path: List[str]) -> _GraphHandler:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_all_edges(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_edge_data(self, source: str, target: str) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_distance(self, source: str, target: str) -> float:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_distances_from(self, source: str) -> Dict[str, float]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def draw(self) -> None:
+        raise NotImplementedError
+
+
+class _NetworkXHandler(_GraphHandler):
     
     def __init__(self, graph: Optional[nx.DiGraph] = None) -> None: # type: ignore
         if graph is None:
@@ -30,6 +114,9 @@ class _NetworkXHandler:
     def add_edge(self, start: str, end: str, transporter: TransporterEquipment, weight: float = 1.0) -> None:
         self._graph.add_edge(start, end, weight=weight, transporter=transporter) # type: ignore
 
+    def set_edge_weight(self, start: str, end: str, weight: float) -> None:
+        self._graph.edges[start, end]['weight'] = weight
+
     def has_path(self, source: str, target: str) -> bool:
         return nx.has_path(self._graph, source, target) # type: ignore
 
@@ -49,10 +136,18 @@ class _NetworkXHandler:
     def get_all_simple_paths(self, source: str, target: str) -> List[List[str]]:
         return list(nx.all_simple_paths(self._graph, source, target)) # type: ignore
 
-    def get_subgraph(self, nodes: List[str]) -> _NetworkXHandler:
+    def get_shortest_simple_paths(self, source: str, target: str) -> Iterator[List[str]]:
+        """Yields the simple paths from source to target in order of increasing weight"""
+        return nx.shortest_simple_paths(self._graph, source, target, weight='weight') # type: ignore
+
+    def get_subgraph(self, nodes: List[str]) -> _GraphHandler:
         return _NetworkXHandler(nx.subgraph(self._graph, nodes)) # type: ignore
+
+    def get_filtered_view(self, filter_node: Callable[[str], bool], filter_edge: Callable[[str, str], bool]) -> _GraphHandler:
+        """Returns a read-only view of the graph with only the nodes and edges passing the filters, the graph is not copied"""
+        return _NetworkXHandler(nx.subgraph_view(self._graph, filter_node=filter_node, filter_edge=filter_edge)) # type: ignore
     
-    def get_path_graph(self, path: List[str]) -> _NetworkXHandler:
+    def get_path_graph(self, path: List[str]) -> _GraphHandler:
         return _NetworkXHandler(nx.path_graph(self._graph, path)) # type: ignore
     
     def get_all_edges(self) -> List[Tuple[str, str, Dict[str, Any]]]:
@@ -65,6 +160,9 @@ class _NetworkXHandler:
     def get_distance(self, source: str, target: str) -> float:
         return nx.shortest_path_length(self._graph, source, target, weight='weight') # type: ignore
 
+    def get_distances_from(self, source: str) -> Dict[str, float]:
+        return nx.single_source_dijkstra_path_length(self._graph, source, weight='weight') # type: ignore
+
     def draw(self) -> None:
         pos = nx.spring_layout(self._graph) # type: ignore
         nx.draw(self._graph, pos=pos, with_labels=True) # type: ignore
@@ -74,6 +172,434 @@ class _NetworkXHandler:
         return self._graph.nodes[key]
 
 
+class _CompactGraphStore:
+    """ Storage shared by a compact graph and its views.  Location names are interned to integers in insertion order,
+    edges are kept in insertion order and compiled on demand into compressed sparse row (CSR) arrays sorted by source."""
+
+    def __init__(self) -> None:
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.node_data: List[Dict[str, Any]] = []
+        self.edge_ids: Dict[Tuple[int, int], int] = {}
+        self.edge_sources: List[int] = []
+        self.edge_targets: List[int] = []
+        self.edge_data: List[Dict[str, Any]] = []
+        # the transporter of each edge interned to an integer, so views can drop a transporter's edges with one array test
+        self.transporter_ids: Dict[str, int] = {}
+        self.edge_transporters: List[int] = []
+        # bumped on every node or edge insertion, or change other than a weight, so compiled arrays and views know to rebuild
+        self.version = 0
+        self._compiled_version = -1
+        self._networkx = nx.DiGraph()
+        self._networkx_version = -1
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._sources = np.zeros(0, dtype=np.int32)
+        self._targets = np.zeros(0, dtype=np.int32)
+        self._weights = np.zeros(0, dtype=np.float64)
+        self._slot_edges = np.zeros(0, dtype=np.int64)
+        self._edge_slots = np.zeros(0, dtype=np.int64)
+        self._transporters = np.zeros(0, dtype=np.int32)
+
+    def compile(self) -> None:
+        if self._compiled_version == self.version:
+            return
+        sources = np.asarray(self.edge_sources, dtype=np.int32)
+        order = np.argsort(sources, kind="stable")
+        self._sources = sources[order]
+        self._targets = np.asarray(self.edge_targets, dtype=np.int32)[order]
+        self._weights = np.asarray([data["weight"] for data in self.edge_data], dtype=np.float64)[order]
+        self._transporters = np.asarray(self.edge_transporters, dtype=np.int32)[order]
+        self._slot_edges = order
+        self._edge_slots = np.empty_like(order)
+        self._edge_slots[order] = np.arange(len(order))
+        self._indptr = np.zeros(len(self.names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self._sources, minlength=len(self.names)), out=self._indptr[1:])
+        self._compiled_version = self.version
+
+    def intern_transporter(self, transporter: TransporterEquipment) -> int:
+        return self.transporter_ids.setdefault(transporter.name, len(self.transporter_ids))
+
+    def set_weight(self, edge: int, weight: float) -> None:
+        self.edge_data[edge]["weight"] = weight
+        if self._compiled_version == self.version:
+            self._weights[self._edge_slots[edge]] = weight
+        if self._networkx_version == self.version:
+            self._networkx.edges[self.names[self.edge_sources[edge]], self.names[self.edge_targets[edge]]]["weight"] = weight
+
+    def to_networkx(self) -> nx.DiGraph:
+        """Returns the graph as networkx graph, rebuilt once per change to the graph and kept in step with weight changes.
+        Shared by the graph and its views, so must not be modified."""
+        if self._networkx_version != self.version:
+            graph = nx.DiGraph()
+            graph.add_nodes_from(zip(self.names, self.node_data))
+            graph.add_edges_from((self.names[start], self.names[end], data)
+                                 for start, end, data in zip(self.edge_sources, self.edge_targets, self.edge_data))
+            self._networkx = graph
+            self._networkx_version = self.version
+        return self._networkx
+
+    @property
+    def indptr(self) -> np.ndarray:
+        self.compile()
+        return self._indptr
+
+    @property
+    def sources(self) -> np.ndarray:
+        self.compile()
+        return self._sources
+
+    @property
+    def targets(self) -> np.ndarray:
+        self.compile()
+        return self._targets
+
+    @property
+    def weights(self) -> np.ndarray:
+        self.compile()
+        return self._weights
+
+    @property
+    def slot_edges(self) -> np.ndarray:
+        self.compile()
+        return self._slot_edges
+
+    @property
+    def transporters(self) -> np.ndarray:
+        self.compile()
+        return self._transporters
+
+
+class _CompactGraphHandler(_GraphHandler):
+    """ Graph backend with the same surface as _NetworkXHandler.  Location names are interned to integers and the adjacency
+    and weights are kept in CSR arrays, so shortest-path and reachability queries relax or expand every edge at once with
+    NumPy instead of walking networkx's dict-of-dicts.
+
+    Shortest paths are found by vectorized Bellman-Ford, which takes one pass per hop of the longest shortest path, a
+    handful on a workcell.  Distances are summed in path order as with Dijkstra, so they match the networkx backend
+    exactly, tied shortest paths may be listed in a different order.
+
+    Views and subgraphs share the storage and evaluate their filters once per change to the graph."""
+
+    def __init__(self, store: Optional[_CompactGraphStore] = None,
+                 filter_node: Optional[Callable[[str], bool]] = None,
+                 filter_edge: Optional[Callable[[str, str], bool]] = None,
+                 excluded_nodes: Collection[str] = (),
+                 excluded_transporters: Collection[str] = ()) -> None:
+        self._store = store if store is not None else _CompactGraphStore()
+        self._is_view = store is not None
+        self._filter_node = filter_node
+        self._filter_edge = filter_edge
+        self._excluded_nodes = excluded_nodes
+        self._excluded_transporters = excluded_transporters
+        self._mask_version = -1
+        self._node_mask = np.ones(0, dtype=bool)
+        self._edge_mask = np.ones(0, dtype=bool)
+
+    def add_node(self, name: str, location: Location) -> None:
+        self._check_mutable()
+        store = self._store
+        if name in store.index:
+            store.node_data[store.index[name]]["location"] = location
+            store.version += 1
+            return
+        store.index[name] = len(store.names)
+        store.names.append(name)
+        store.node_data.append({"location": location})
+        store.version += 1
+
+    def add_edge(self, start: str, end: str, transporter: TransporterEquipment, weight: float = 1.0) -> None:
+        self._check_mutable()
+        store = self._store
+        for name in (start, end):
+            if name not in store.index:
+                store.index[name] = len(store.names)
+                store.names.append(name)
+                store.node_data.append({})
+                store.version += 1
+        key = (store.index[start], store.index[end])
+        if key in store.edge_ids:
+            edge = store.edge_ids[key]
+            store.edge_data[edge]["transporter"] = transporter
+            store.edge_transporters[edge] = store.intern_transporter(transporter)
+            store.version += 1
+            store.set_weight(edge, weight)
+            return
+        store.edge_ids[key] = len(store.edge_data)
+        store.edge_sources.append(key[0])
+        store.edge_targets.append(key[1])
+        store.edge_data.append({"weight": weight, "transporter": transporter})
+        store.edge_transporters.append(store.intern_transporter(transporter))
+        store.version += 1
+
+    def set_edge_weight(self, start: str, end: str, weight: float) -> None:
+        self._check_mutable()
+        self._store.set_weight(self._get_edge(start, end), weight)
+
+    def has_path(self, source: str, target: str) -> bool:
+        source_index = self._get_index(source)
+        target_index = self._get_index(target)
+        sources, targets, _ = self._active_edges()
+        reached = np.zeros(len(self._store.names), dtype=bool)
+        reached[source_index] = True
+        frontier = reached.copy()
+        while frontier.any() and not reached[target_index]:
+            expanded = np.zeros_like(reached)
+            expanded[targets[frontier[sources]]] = True
+            frontier = expanded & ~reached
+            reached |= frontier
+        return bool(reached[target_index])
+
+    def get_nodes(self) -> Dict[str, Dict[str, Any]]:
+        store = self._store
+        if not self._is_view:
+            return dict(zip(store.names, store.node_data))
+        return {store.names[i]: store.node_data[i] for i in np.flatnonzero(self._get_node_mask())}
+
+    def get_node_data(self, name: str) -> Dict[str, Any]:
+        index = self._store.index.get(name)
+        if index is None or (self._is_view and not self._get_node_mask()[index]):
+            raise KeyError(name)
+        return self._store.node_data[index]
+
+    def get_shortest_path(self, source: str, target: str) -> List[str]:
+        return self.get_all_shortest_paths(source, target)[0]
+
+    def get_all_shortest_paths(self, source: str, target: str) -> List[List[str]]:
+        source_index = self._get_index(source)
+        target_index = self._get_index(target)
+        sources, targets, weights = self._active_edges()
+        distances = self._relax(source_index, sources, targets, weights)
+        if not np.isfinite(distances[target_index]):
+            raise nx.NetworkXNoPath(f"Target {target} cannot be reached from given sources")
+        tight = np.isfinite(distances[sources]) & (distances[sources] + weights == distances[targets])
+        predecessors: Dict[int, List[int]] = {}
+        for start, end in zip(sources[tight].tolist(), targets[tight].tolist()):
+            predecessors.setdefault(end, []).append(start)
+        names = self._store.names
+        paths: List[List[str]] = []
+        # walk the shortest-path predecessors back from the target, each stack entry is a partial path reversed
+        stack: List[List[int]] = [[target_index]]
+        while stack:
+            partial = stack.pop()
+            head = partial[-1]
+            if head == source_index:
+                paths.append([names[i] for i in reversed(partial)])
+                continue
+            for predecessor in reversed(predecessors.get(head, [])):
+                stack.append(partial + [predecessor])
+        return paths
+
+    def get_all_simple_paths(self, source: str, target: str) -> List[List[str]]:
+        source_index = self._get_index(source)
+        target_index = self._get_index(target)
+        if source_index == target_index:
+            return []
+        store = self._store
+        indptr, targets = store.indptr, store.targets
+        active = self._get_active_mask()
+        paths: List[List[str]] = []
+        path: List[int] = [source_index]
+        on_path: Set[int] = {source_index}
+
+        def visit(node: int) -> None:
+            for slot in range(indptr[node], indptr[node + 1]):
+                if not active[slot]:
+                    continue
+                neighbor = int(targets[slot])
+                if neighbor in on_path:
+                    continue
+                if neighbor == target_index:
+                    paths.append([store.names[i] for i in path] + [store.names[neighbor]])
+                    continue
+                path.append(neighbor)
+                on_path.add(neighbor)
+                visit(neighbor)
+                on_path.discard(path.pop())
+
+        visit(source_index)
+        return paths
+
+    def get_shortest_simple_paths(self, source: str, target: str) -> Iterator[List[str]]:
+        """Yields the simple paths from source to target in order of increasing weight, on the networkx graph kept by the
+        storage, filtered for a view rather than copied"""
+        self._get_index(source)
+        self._get_index(target)
+        graph = self._store.to_networkx()
+        if self._is_view:
+            graph = nx.subgraph_view(graph, filter_node=self._has_node, filter_edge=self._has_edge)
+        return nx.shortest_simple_paths(graph, source, target, weight='weight') # type: ignore
+
+    def get_subgraph(self, nodes: List[str]) -> _CompactGraphHandler:
+        included = set(nodes)
+        return self.get_filtered_view(lambda name: name in included, lambda start, end: True)
+
+    def get_filtered_view(self, filter_node: Callable[[str], bool], filter_edge: Callable[[str, str], bool]) -> _CompactGraphHandler:
+        """Returns a read-only view of the graph with only the nodes and edges passing the filters, the graph is not copied"""
+        if not self._is_view:
+            return _CompactGraphHandler(self._store, filter_node, filter_edge)
+        parent = self
+
+        def node_passes(name: str) -> bool:
+            return bool(parent._get_node_mask()[parent._store.index[name]]) and filter_node(name)
+
+        def edge_passes(start: str, end: str) -> bool:
+            return parent._has_edge(start, end) and filter_edge(start, end)
+
+        return _CompactGraphHandler(self._store, node_passes, edge_passes)
+
+    def get_view_without(self, nodes: Collection[str], transporters: Collection[str]) -> _CompactGraphHandler:
+        """Returns a read-only view of the graph without the given nodes and the edges of the given transporters, masked with
+        array operations rather than a filter call per node and edge"""
+        if self._is_view:
+            return super().get_view_without(nodes, transporters) # type: ignore
+        return _CompactGraphHandler(self._store, excluded_nodes=nodes, excluded_transporters=transporters)
+
+    def get_path_graph(self, path: List[str]) -> _CompactGraphHandler:
+        hops = set(zip(path, path[1:]))
+        return self.get_subgraph(path).get_filtered_view(lambda name: True, lambda start, end: (start, end) in hops)
+
+    def get_all_edges(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Returns all edges with data as a list of tuples (source, target, data)"""
+        store = self._store
+        edges = np.sort(store.slot_edges[self._get_active_mask()])
+        return [(store.names[store.edge_sources[e]], store.names[store.edge_targets[e]], store.edge_data[e]) for e in edges.tolist()]
+
+    def get_edge_data(self, source: str, target: str) -> Dict[str, Any]:
+        return self._store.edge_data[self._get_edge(source, target)]
+
+    def get_distance(self, source: str, target: str) -> float:
+        distance = self._get_distance_array(source)[self._get_index(target)]
+        if not np.isfinite(distance):
+            raise nx.NetworkXNoPath(f"Target {target} cannot be reached from given sources")
+        return float(distance)
+
+    def get_distances_from(self, source: str) -> Dict[str, float]:
+        distances = self._get_distance_array(source)
+        reached = np.flatnonzero(np.isfinite(distances))
+        names = self._store.names
+        return dict(zip([names[i] for i in reached], distances[reached].tolist()))
+
+    def draw(self) -> None:
+        graph = self.to_networkx()
+        pos = nx.spring_layout(graph) # type: ignore
+        nx.draw(graph, pos=pos, with_labels=True) # type: ignore
+        plt.show() # type: ignore
+
+    def to_networkx(self) -> nx.DiGraph:
+        """Returns a networkx copy of the graph, or of the view, with the same node and edge data"""
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self.get_nodes().items()) # type: ignore
+        graph.add_edges_from(self.get_all_edges()) # type: ignore
+        return graph
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        return self.get_node_data(key)
+
+    def _check_mutable(self) -> None:
+        if self._is_view:
+            raise nx.NetworkXError("Frozen graph can't be modified")
+
+    def _get_index(self, name: str) -> int:
+        index = self._store.index.get(name)
+        if index is None or (self._is_view and not self._get_node_mask()[index]):
+            raise nx.NodeNotFound(f"Node {name} not in graph")
+        return index
+
+    def _has_node(self, name: str) -> bool:
+        return bool(self._get_node_mask()[self._store.index[name]])
+
+    def _has_edge(self, source: str, target: str) -> bool:
+        try:
+            self._get_edge(source, target)
+        except KeyError:
+            return False
+        return True
+
+    def _get_edge(self, source: str, target: str) -> int:
+        store = self._store
+        key = (store.index.get(source), store.index.get(target))
+        edge = store.edge_ids.get(key) # type: ignore
+        if edge is None or (self._is_view and not self._get_active_mask()[store._edge_slots[edge]]):
+            raise KeyError((source, target))
+        return edge
+
+    def _get_distance_array(self, source: str) -> np.ndarray:
+        return self._relax(self._get_index(source), *self._active_edges())
+
+    def _relax(self, source: int, sources: np.ndarray, targets: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        distances = np.full(len(self._store.names), np.inf)
+        distances[source] = 0.0
+        for _ in range(len(self._store.names)):
+            relaxed = distances.copy()
+            np.minimum.at(relaxed, targets, distances[sources] + weights)
+            if np.array_equal(relaxed, distances):
+                break
+            distances = relaxed
+        return distances
+
+    def _active_edges(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        store = self._store
+        if not self._is_view:
+            return store.sources, store.targets, store.weights
+        active = self._get_active_mask()
+        return store.sources[active], store.targets[active], store.weights[active]
+
+    def _get_node_mask(self) -> np.ndarray:
+        self._update_masks()
+        return self._node_mask
+
+    def _get_active_mask(self) -> np.ndarray:
+        self._update_masks()
+        return self._edge_mask
+
+    def _update_masks(self) -> None:
+        store = self._store
+        if self._mask_version == store.version:
+            return
+        if self._filter_node is None:
+            self._node_mask = np.ones(len(store.names), dtype=bool)
+        else:
+            self._node_mask = np.fromiter((self._filter_node(name) for name in store.names), dtype=bool, count=len(store.names))
+        for name in self._excluded_nodes:
+            index = store.index.get(name)
+            if index is not None:
+                self._node_mask[index] = False
+        sources, targets = store.sources, store.targets
+        self._edge_mask = self._node_mask[sources] & self._node_mask[targets]
+        excluded = [store.transporter_ids[name] for name in self._excluded_transporters if name in store.transporter_ids]
+        if excluded:
+            self._edge_mask &= ~np.isin(store.transporters, excluded)
+        if self._filter_edge is not None:
+            names = store.names
+            for slot in np.flatnonzero(self._edge_mask).tolist():
+                self._edge_mask[slot] = self._filter_edge(names[sources[slot]], names[targets[slot]])
+        self._mask_version = store.version
+
+
+_GRAPH_BACKENDS: Dict[str, Callable[[], _GraphHandler]] = {
+    "networkx": _NetworkXHandler,
+    "compact": _CompactGraphHandler,
+}
+
+
+class _TransporterHub(NamedTuple):
+    """ Graph node standing for a transporter, every location the transporter reaches has an edge to and from its hub."""
+    transporter: str
+
+
+@dataclass(frozen=True)
+class TransporterRoute:
+    """ A route between two locations with the transporter making each hop.
+    Attributes:
+        stops (List[str]): The locations along the route, from the source to the target.
+        transporters (List[TransporterEquipment]): The transporter making each hop, one fewer than the stops.
+        cost (float): The summed weight of the hops.
+    """
+    stops: List[str]
+    transporters: List[TransporterEquipment]
+    cost: float
+
+
 class ILocationRegistry(ABC):
     @property
     @abstractmethod
@@ -89,15 +615,38 @@ class ILocationRegistry(ABC):
         raise NotImplementedError
     
 
-class SystemMap(ILocationRegistry, IResourceLocator, IResourceLocationObserver, IResourceRegistryObesrver):
+class SystemMap(ILocationRegistry, IResourceLocator, IResourceLocationObserver, ILabwareLocationObserver, ITransporterLabwareObserver, IResourceRegistryObesrver):
     """ SystemMap is a representation of the system's locations and their connections."""
-    def __init__(self, resource_registry: IResourceRegistry) -> None:
+    def __init__(self, resource_registry: IResourceRegistry, graph_backend: str = "networkx") -> None:
         """Initialize the SystemMap with a resource registry
         Args:
             resource_registry (IResourceRegistry): The resource registry that contains the resources and transporters.
+            graph_backend (str): "networkx" keeps the graph in networkx, "compact" keeps it in integer-indexed NumPy arrays,
+                which is faster to query on large maps.
         """
-        self._graph: _NetworkXHandler = _NetworkXHandler()
+        if graph_backend not in _GRAPH_BACKENDS:
+            raise ValueError(f"Unknown graph backend {graph_backend}, expected one of {', '.join(_GRAPH_BACKENDS)}")
+        self._graph: _GraphHandler = _GRAPH_BACKENDS[graph_backend]()
         self._equipment_map: Dict[str, Location] = {}
+        # a transporter's reach is a hub (location -> transporter -> location), linear in its teachpoints rather than an edge per
+        # pair.  A hub is expanded to explicit edges between each pair only if a transporter is added over explicit edges
+        self._reach: Dict[str, Set[str]] = {}
+        self._hubs: Dict[str, TransporterEquipment] = {}
+        # the names of the hubs reaching each position, in the order they were added
+        self._hubs_at: Dict[str, List[str]] = {}
+        self._explicit_edges: Set[Tuple[str, str]] = set()
+        # routes over the full graph only change with the topology, so they are cached until an edge or location changes
+        self._route_cache: Dict[Tuple[str, str], List[List[str]]] = {}
+        self._transporter_route_cache: Dict[Tuple[str, str, int], List[TransporterRoute]] = {}
+        self._distance_cache: Dict[str, Dict[str, float]] = {}
+        # names of the locations holding labware and the transporters carrying labware, kept up to date by the location
+        # and transporter observers so available routes are found on a filtered view of the graph rather than a copy
+        self._occupied_locations: Set[str] = set()
+        self._busy_transporters: Set[str] = set()
+        # plate pads labware can be parked on to resolve a deadlock, and the pads ordered by distance from each source.  The
+        # order only changes with the topology so it is cleared with the route cache, occupancy is checked when it is read
+        self._buffers: Set[str] = set()
+        self._buffers_by_distance: Dict[str, List[str]] = {}
         self._resource_registry = resource_registry
         for transporter in self._resource_registry.transporters:
             self.add_transporter(transporter)
@@ -105,17 +654,20 @@ class SystemMap(ILocationRegistry, IResourceLocator, IResourceLocationObserver,
 
     @property
     def locations(self) -> List[Location]:
-        return [nodedata["location"] for _, nodedata in self._graph.get_nodes().items()]
+        return [nodedata["location"] for name, nodedata in self._graph.get_nodes().items() if not isinstance(name, _TransporterHub)]
 
     def get_location(self, name: str) -> Location:
         return self._graph.get_node_data(name)["location"]
 
     def add_location(self, location: Location) -> None:
         self._graph.add_node(location.teachpoint_name, location=location)
+        self.clear_route_cache()
         if isinstance(location.resource, ILabwarePlaceable):
             self.assign_resource_to_location(location.name, location.resource)
             
         location.add_observer(self)
+        self._update_location_occupancy(location)
+        self._update_buffer(location)
 
     def get_resource_location(self, resource_name: str) -> Location:
         try:
@@ -128,20 +680,123 @@ class SystemMap(ILocationRegistry, IResourceLocator, IResourceLocationObserver,
                 raise ValueError(f"Resource {resource_name} does not exist")
         
     def get_distance(self, source: str, target: str) -> float:
-        return self._graph.get_distance(source, target)
+        distances = self._get_distances_from(source)
+        if target not in distances:
+            raise nx.NetworkXNoPath(f"No path between {source} and {target}")
+        return distances[target]
     
     def get_transporter_between(self, source: str, target: str) -> TransporterEquipment:
-        return self._graph.get_edge_data(source, target)["transporter"]
+        try:
+            return self._graph.get_edge_data(source, target)["transporter"]
+        except KeyError:
+            pass
+        hub = self._get_hub_between(source, target)
+        if hub is None:
+            raise KeyError((source, target))
+        return self._hubs[hub]
 
     def add_edge(self, start: str, end: str, transporter: TransporterEquipment, weight: float = 5.0) -> None:
+        """ Adds an edge moving labware from start to end with the transporter.  If the transporter's hub already covers the
+        pair, its hub edges are weighted in place as by set_edge_weight, another transporter's edge is added alongside."""
         if start not in self._graph.get_nodes():
             raise ValueError(f"Node {start} does not exist")
         if end not in self._graph.get_nodes():
             raise ValueError(f"Node {end} does not exist")
-        self._graph.add_edge(start, end, transporter=transporter, weight=weight) 
+        hub = self._get_hub_between(start, end)
+        if hub == transporter.name and (start, end) not in self._explicit_edges:
+            self._set_hub_weight(hub, start, end, weight)
+        else:
+            self._graph.add_edge(start, end, transporter=transporter, weight=weight)
+            self._explicit_edges.add((start, end))
+        self.clear_route_cache()
 
     def set_edge_weight(self, start: str, end: str, weight: float) -> None:
-        self._graph[start][end]['weight'] = weight
+        """ Sets the cost of moving labware from start to end.  A pair covered by a transporter hub has no edge of its own, half
+        the cost is set on picking at start and half on placing at end, which the transporter's other moves from start and
+        to end share."""
+        hub = self._get_hub_between(start, end)
+        if hub is not None and (start, end) not in self._explicit_edges:
+            self._set_hub_weight(hub, start, end, weight)
+        else:
+            self._graph.set_edge_weight(start, end, weight)
+        self.clear_route_cache()
+
+    def get_transporter_names(self) -> List[str]:
+        return list(self._reach)
+
+    def get_transporter_positions(self, transporter_name: str) -> List[str]:
+        """ Returns the positions the transporter can pick from and place to."""
+        return sorted(self._reach.get(transporter_name, set()))
+
+    def get_zones(self, transfer_locations: Collection[str]) -> List[Set[str]]:
+        """ Returns the zones of the map, each the locations connected by transporters without passing through a transfer
+        location.  Transfer locations, e.g. the plate pads handing labware from one group of transporters to another, join
+        the zones and belong to none of them.
+        Args:
+            transfer_locations (Collection[str]): The names of the locations joining the zones.
+        Returns:
+            List[Set[str]]: The names of the locations of each zone.
+        """
+        transfer = set(transfer_locations)
+        nodes = self._graph.get_nodes()
+        for name in transfer:
+            if name not in nodes:
+                raise ValueError(f"Location {name} does not exist")
+        neighbours: Dict[Any, Set[Any]] = {node: set() for node in nodes if node not in transfer}
+        for start, end, _ in self._graph.get_all_edges():
+            if start not in transfer and end not in transfer:
+                neighbours[start].add(end)
+                neighbours[end].add(start)
+        zones: List[Set[str]] = []
+        seen: Set[Any] = set()
+        for location in self.locations:
+            if location.name in transfer or location.name in seen:
+                continue
+            # transporter hubs connect their positions but are not locations themselves
+            zone: Set[str] = set()
+            seen.add(location.name)
+            stack: List[Any] = [location.name]
+            while stack:
+                node = stack.pop()
+                if not isinstance(node, _TransporterHub):
+                    zone.add(node)
+                for next_node in neighbours[node] - seen:
+                    seen.add(next_node)
+                    stack.append(next_node)
+            zones.append(zone)
+        return zones
+
+    def set_transporter_weights(self, transporter_name: str, pick_weights: Dict[str, float], place_weights: Dict[str, float]) -> None:
+        """ Sets the cost of the transporter's moves from its pick cost at the source and its place cost at the target.
+        Positions missing from either dictionary keep their current cost.
+        Args:
+            transporter_name (str): The name of the transporter.
+            pick_weights (Dict[str, float]): The cost of picking at each position.
+            place_weights (Dict[str, float]): The cost of placing at each position.
+        """
+        if transporter_name not in self._reach:
+            raise ValueError(f"Transporter {transporter_name} does not exist")
+        if transporter_name in self._hubs:
+            hub = _TransporterHub(transporter_name)
+            for name in self._reach[transporter_name]:
+                if name in pick_weights:
+                    self._graph.set_edge_weight(name, hub, pick_weights[name]) # type: ignore
+                if name in place_weights:
+                    self._graph.set_edge_weight(hub, name, place_weights[name]) # type: ignore
+        else:
+            for start, end in self._explicit_edges:
+                if start not in pick_weights or end not in place_weights:
+                    continue
+                if self._graph.get_edge_data(start, end)["transporter"].name == transporter_name:
+                    self._graph.set_edge_weight(start, end, pick_weights[start] + place_weights[end])
+        self.clear_route_cache()
+
+    def clear_route_cache(self) -> None:
+        """ Clears the cached routes and distances, they are recomputed on the next request."""
+        self._route_cache.clear()
+        self._transporter_route_cache.clear()
+        self._distance_cache.clear()
+        self._buffers_by_distance.clear()
 
     def has_available_route(self, source: str, target: str) -> bool:
         available_graph = self._get_available_graph([source])
@@ -152,18 +807,86 @@ class SystemMap(ILocationRegistry, IResourceLocator, IResourceLocationObserver,
         
     def get_all_shortest_available_paths(self, source: str, target: str) -> List[List[str]]:
         available_graph = self._get_available_graph([source])
-        return available_graph.get_all_shortest_paths(source, target)
+        return self._get_location_paths(available_graph.get_all_shortest_paths(source, target))
     
     def get_all_shortest_any_paths(self, source: str, target: str) -> List[List[str]]:
-        return self._graph.get_all_shortest_paths(source, target)
+        paths = self._route_cache.get((source, target))
+        if paths is None:
+            paths = self._get_location_paths(self._graph.get_all_shortest_paths(source, target))
+            self._route_cache[(source, target)] = paths
+        return [list(path) for path in paths]
+
+    def get_route(self, stops: List[str]) -> TransporterRoute:
+        """ Returns the route along the given locations with the transporter get_transporter_between picks for each hop."""
+        transporters = [self.get_transporter_between(start, end) for start, end in zip(stops, stops[1:])]
+        cost = sum(self._get_hop_weight(start, end, transporter) for start, end, transporter in zip(stops, stops[1:], transporters))
+        return TransporterRoute(list(stops), transporters, cost)
+
+    def get_k_shortest_routes(self, source: str, target: str, k: int) -> List[TransporterRoute]:
+        """ Returns up to k of the cheapest routes from source to target, cheapest first.  Routes along the same locations
+        through different transporters are listed separately, so an alternative arm for the same hop counts as a route."""
+        routes = self._transporter_route_cache.get((source, target, k))
+        if routes is None:
+            routes = []
+            seen: Set[Tuple[Tuple[str, ...], Tuple[str, ...]]] = set()
+            for path in self._graph.get_shortest_simple_paths(source, target):
+                route = self._to_transporter_route(path)
+                key = (tuple(route.stops), tuple(t.name for t in route.transporters))
+                if key in seen:
+                    continue
+                seen.add(key)
+                routes.append(route)
+                if len(routes) >= k:
+                    break
+            self._transporter_route_cache[(source, target, k)] = routes
+        return list(routes)
+
+    def get_transporter_hop_cost(self, transporter_name: str) -> float:
+        """ Returns the mean weight of a hop by the transporter, the expected time of one of its moves once weights are learned."""
+        reach = self._reach.get(transporter_name)
+        if reach is None:
+            raise ValueError(f"Transporter {transporter_name} does not exist")
+        if transporter_name in self._hubs:
+            hub = _TransporterHub(transporter_name)
+            picks = [self._graph.get_edge_data(name, hub)["weight"] for name in reach] # type: ignore
+            places = [self._graph.get_edge_data(hub, name)["weight"] for name in reach] # type: ignore
+            return sum(picks) / len(picks) + sum(places) / len(places)
+        weights = [self._graph.get_edge_data(start, end)["weight"] for start, end in self._explicit_edges
+                   if start in reach and end in reach and self._graph.get_edge_data(start, end)["transporter"].name == transporter_name]
+        return sum(weights) / len(weights) if len(weights) > 0 else 5.0
 
     def get_shortest_paths_to_deadlock_resolution(self, source: str) -> List[List[str]]:
+        """ Returns the shortest paths from source to each free plate pad, nearest pad first."""
         paths = []
-        for name, data in self._graph.get_nodes().items():
-            if isinstance(data["location"].resource, PlatePad) and name != source:
-                paths.extend(self.get_all_shortest_any_paths(source, name)) #type: ignore
-            
+        for name in self.get_nearest_free_buffers(source):
+            paths.extend(self.get_all_shortest_any_paths(source, name))
         return paths
+
+    def get_nearest_free_buffers(self, source: str, count: Optional[int] = None, exclude: Optional[Collection[str]] = None) -> List[str]:
+        """ Returns the plate pads without labware reachable from source, nearest first.
+        Pads reached by a single transporter come before handoff pads between transporters, labware set down on a
+        handoff pad stands in the way of other labware passing through it.
+        Args:
+            source (str): The location labware would be moved from.
+            count (Optional[int]): The maximum number of pads returned, every free pad if None.
+            exclude (Optional[Collection[str]]): Pads to skip, e.g. those already reserved.
+        Returns:
+            List[str]: The names of the pads.
+        """
+        ordered = self._buffers_by_distance.get(source)
+        if ordered is None:
+            distances = self._get_distances_from(source)
+            ordered = sorted((name for name in self._buffers if name != source and name in distances),
+                             key=lambda name: (self._is_handoff(name), distances[name], name))
+            self._buffers_by_distance[source] = ordered
+        free: List[str] = []
+        for name in ordered:
+            if name in self._occupied_locations or (exclude is not None and name in exclude):
+                continue
+            free.append(name)
+            if count is not None and len(free) >= count:
+                break
+        return free
     
     def _get_blocking_locations(self, source: str, target: str) -> List[Location]:
         # TODO: add input validations of source and target entered
@@ -181,8 +904,7 @@ class SystemMap(ILocationRegistry, IResourceLocator, IResourceLocationObserver,
         blocking_transporters: Set[TransporterEquipment] = set()
         for path in self.get_all_shortest_any_paths(source, target):
             for i in range(len(path) - 1):
-                edge = self._graph.get_edge_data(path[i], path[i + 1])
-                transporter: TransporterEquipment = edge["transporter"]
+                transporter = self.get_transporter_between(path[i], path[i + 1])
                 if transporter.labware is not None:
                     blocking_transporters.add(transporter)
         return list(blocking_transporters)
@@ -191,19 +913,125 @@ class SystemMap(ILocationRegistry, IResourceLocator, IResourceLocationObserver,
         self._graph.draw()
         
     def add_transporter(self, transporter: TransporterEquipment) -> None:
+        transporter.add_observer(self)
+        self._update_transporter_occupancy(transporter)
         taught_locations = transporter.get_taught_positions()
-        # add teachpoints as locations if they don't exist and connect them as an edge
-        for edge in itertools.combinations(taught_locations, 2):
+        # add teachpoints as locations if they don't exist
+        for name in taught_locations:
             try:
-                self.get_location(edge[0])
+                self.get_location(name)
             except KeyError:
-                self.add_location(Location(edge[0]))
-            try:
-                self.get_location(edge[1])
-            except KeyError:
-                self.add_location(Location(edge[1]))
-            self.add_edge(edge[0], edge[1], transporter)
-            self.add_edge(edge[1], edge[0], transporter)
+                self.add_location(Location(name))
+        self._reach[transporter.name] = set(taught_locations)
+        if len(self._reach[transporter.name]) < 2:
+            return
+        reach = self._reach[transporter.name]
+        if any(start in reach and end in reach for start, end in self._explicit_edges):
+            # the transporter's edges overwrite those between its positions, so it is expanded along with any hubs sharing them
+            self._hubs[transporter.name] = transporter
+            self._expand_hubs([transporter.name])
+        else:
+            self._add_hub(transporter)
+        self.clear_route_cache()
+
+    def _add_hub(self, transporter: TransporterEquipment) -> None:
+        # each hop between two positions costs the default edge weight, half going in to the hub and half coming out
+        hub = _TransporterHub(transporter.name)
+        self._hubs[transporter.name] = transporter
+        self._graph.add_node(hub, None) # type: ignore
+        for name in self._reach[transporter.name]:
+            self._graph.add_edge(name, hub, transporter=transporter, weight=2.5) # type: ignore
+            self._graph.add_edge(hub, name, transporter=transporter, weight=2.5) # type: ignore
+            self._hubs_at.setdefault(name, []).append(transporter.name)
+
+    def _get_hub_between(self, source: str, target: str) -> Optional[str]:
+        # the most recently added transporter wins, as it did when each transporter overwrote the edges between its positions
+        if source == target:
+            return None
+        for name in reversed(self._hubs_at.get(source, [])):
+            if target in self._reach[name]:
+                return name
+        return None
+
+    def _set_hub_weight(self, transporter_name: str, start: str, end: str, weight: float) -> None:
+        hub = _TransporterHub(transporter_name)
+        self._graph.set_edge_weight(start, hub, weight / 2) # type: ignore
+        self._graph.set_edge_weight(hub, end, weight / 2) # type: ignore
+
+    def _expand_hubs(self, names: Iterable[str]) -> None:
+        """ Replaces hubs with explicit edges between each pair of their positions.  Hubs sharing two or more positions with an
+        expanded hub would overlap its new edges, so they are expanded too."""
+        expanding = set(names)
+        pending = list(expanding)
+        while pending:
+            reach = self._reach[pending.pop()]
+            for name in self._hubs:
+                if name not in expanding and len(reach & self._reach[name]) >= 2:
+                    expanding.add(name)
+                    pending.append(name)
+        # expanded in the order the transporters were added so later transporters overwrite the shared edges
+        for name in [name for name in self._hubs if name in expanding]:
+            transporter = self._hubs.pop(name)
+            for position in self._reach[name]:
+                if name in self._hubs_at.get(position, []):
+                    self._hubs_at[position].remove(name)
+            positions = [p for p in transporter.get_taught_positions() if p in self._reach[name]]
+            for start, end in itertools.combinations(dict.fromkeys(positions), 2):
+                self._graph.add_edge(start, end, transporter=transporter, weight=5.0)
+                self._graph.add_edge(end, start, transporter=transporter, weight=5.0)
+                self._explicit_edges.update([(start, end), (end, start)])
+        self._graph = self._remove_hub_nodes(expanding)
+        self.clear_route_cache()
+
+    def _remove_hub_nodes(self, names: Set[str]) -> _GraphHandler:
+        # the handlers cannot remove nodes, the expanded hubs are left isolated by dropping their edges in a rebuilt graph
+        hubs = {_TransporterHub(name) for name in names}
+        graph = type(self._graph)()
+        for name, data in self._graph.get_nodes().items():
+            if name not in hubs:
+                graph.add_node(name, data.get("location"))
+        for start, end, data in self._graph.get_all_edges():
+            if start not in hubs and end not in hubs:
+                graph.add_edge(start, end, transporter=data["transporter"], weight=data["weight"])
+        return graph
+
+    def _get_hop_weight(self, start: str, end: str, transporter: TransporterEquipment) -> float:
+        if transporter.name in self._hubs:
+            hub = _TransporterHub(transporter.name)
+            return self._graph.get_edge_data(start, hub)["weight"] + self._graph.get_edge_data(hub, end)["weight"] # type: ignore
+        return self._graph.get_edge_data(start, end)["weight"]
+
+    def _to_transporter_route(self, path: List[str]) -> TransporterRoute:
+        stops: List[str] = []
+        transporters: List[TransporterEquipment] = []
+        cost = 0.0
+        for i, node in enumerate(path):
+            if i > 0:
+                edge = self._graph.get_edge_data(path[i - 1], node)
+                cost += edge["weight"]
+            if isinstance(node, _TransporterHub):
+                continue
+            if i > 0:
+                transporters.append(edge["transporter"])
+            stops.append(node)
+        return TransporterRoute(stops, transporters, cost)
+
+    def _is_handoff(self, name: str) -> bool:
+        return sum(1 for reach in self._reach.values() if name in reach) > 1
+
+    def _get_distances_from(self, source: str) -> Dict[str, float]:
+        distances = self._distance_cache.get(source)
+        if distances is None:
+            distances = self._graph.get_distances_from(source)
+            self._distance_cache[source] = distances
+        return distances
+
+    def _get_location_paths(self, paths: List[List[str]]) -> List[List[str]]:
+        """ Drops the transporter hubs from paths, routes through different transporters between the same locations are merged."""
+        location_paths: Dict[Tuple[str, ...], None] = {}
+        for path in paths:
+            location_paths[tuple(stop for stop in path if not isinstance(stop, _TransporterHub))] = None
+        return [list(path) for path in location_paths]
 
     def assign_resource_to_location(self, location_name: str, resource: ILabwarePlaceable) -> None:
         try:
@@ -226,28 +1054,49 @@ class SystemMap(ILocationRegistry, IResourceLocator, IResourceLocationObserver,
         if event == "resource_set":
             if isinstance(resource, ILabwarePlaceable):
                 self._equipment_map[resource.name] = location
+            self._update_location_occupancy(location)
+            self._update_buffer(location)
+
+    def notify_labware_location_change(self, event: str, location: Location, labware: LabwareInstance) -> None:
+        self._update_location_occupancy(location)
+
+    def notify_transporter_labware_change(self, event: str, transporter: TransporterEquipment, labware: LabwareInstance) -> None:
+        self._update_transporter_occupancy(transporter)
+
+    def refresh_occupancy(self) -> None:
+        """ Rebuilds the occupancy index from the labware currently at each location and on each transporter.
+        Only needed if labware was moved by calling resources directly rather than through their locations."""
+        self._occupied_locations.clear()
+        self._busy_transporters.clear()
+        for location in self.locations:
+            self._update_location_occupancy(location)
+        for transporter in self._resource_registry.transporters:
+            self._update_transporter_occupancy(transporter)
+
+    def _update_location_occupancy(self, location: Location) -> None:
+        if location.has_free_slot:
+            self._occupied_locations.discard(location.teachpoint_name)
+        else:
+            self._occupied_locations.add(location.teachpoint_name)
+
+    def _update_buffer(self, location: Location) -> None:
+        is_buffer = isinstance(location.resource, PlatePad)
+        if is_buffer == (location.teachpoint_name in self._buffers):
+            return
+        if is_buffer:
+            self._buffers.add(location.teachpoint_name)
+        else:
+            self._buffers.discard(location.teachpoint_name)
+        self._buffers_by_distance.clear()
+
+    def _update_transporter_occupancy(self, transporter: TransporterEquipment) -> None:
+        if transporter.labware is None:
+            self._busy_transporters.discard(transporter.name)
+        else:
+            self._busy_transporters.add(transporter.name)
 
-    def _get_available_graph(self, include_nodes: Optional[List[str]] = None) -> _NetworkXHandler:
-        subgraph = self._graph.get_subgraph([name for name, _ in self._get_available_locations(include_nodes).items()])
-        available_edges: List[Tuple[str, str, Dict[str, Any]]] = []
-        for edge in subgraph.get_all_edges():
-            source, target, data = edge
-            transporter: TransporterEquipment = data["transporter"]
-            if transporter.labware is None:
-                available_edges.append(edge)
-        available_graph = _NetworkXHandler()
-        for name, nodedata in subgraph.get_nodes().items(): 
-            available_graph.add_node(name, nodedata["location"])
-        for source, target, data in available_edges:
-            available_graph.add_edge(source, target, data["transporter"]) 
-        return available_graph
-
-
-    def _get_available_locations(self, include_nodes: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
-        nodes = {}
-        include_nodes = include_nodes if include_nodes is not None else []
-        for node, nodedata in self._graph.get_nodes().items():
-            location: Location = nodedata["location"]
-            if node in include_nodes or location.labware is None:
-                nodes[node] = nodedata
-        return nodes
\ No newline at end of file
+    def _get_available_graph(self, include_nodes: Optional[List[str]] = None) -> _GraphHandler:
+        busy = self._busy_transporters
+        excluded: Set[Any] = self._occupied_locations.difference(include_nodes or [])
+        excluded.update(_TransporterHub(name) for name in busy if name in self._hubs)
+        return self._graph.get_view_without(excluded, busy)
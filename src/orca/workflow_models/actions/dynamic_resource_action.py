@@ -89,4 +89,8 @@ class DynamicResourceActionResolver:
             dynamic_action.options
         )
         return location_action
+
+    def get_potential_locations(self, dynamic_action: UnresolvedLocationAction) -> List[Location]:
+        """Returns the locations the action may be resolved to."""
+        return ResourcePoolResolver(dynamic_action.resource_pool).get_potential_locations(self._system_map)
             
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 import asyncio
+from typing import Optional
 import uuid
 from orca.resource_models.labware import LabwareInstance
 from orca.resource_models.location import Location
@@ -11,6 +12,13 @@ from orca.workflow_models.status_enums import ActionStatus
 
 
 
+class IMoveDurationObserver(ABC):
+    @abstractmethod
+    def record_move(self, transporter: str, source: str, target: str, pick_duration: float, place_duration: float) -> None:
+        """ Called after a move completes with the seconds the transporter took to pick at the source and place at the target."""
+        raise NotImplementedError
+
+
 class IMoveAction(ABC):
     @property
     @abstractmethod
@@ -108,11 +116,13 @@ class ExecutingMoveAction(IMoveAction):
     def __init__(self,
                  status_manager: StatusManager,
                  context: ThreadExecutionContext,
-                 action: IMoveAction) -> None:
+                 action: IMoveAction,
+                 duration_observer: Optional[IMoveDurationObserver] = None) -> None:
         super().__init__()
         self._status_manager = status_manager
         self._action = action
         self._context = context
+        self._duration_observer = duration_observer
         self.status = ActionStatus.CREATED
         self.status = ActionStatus.AWAITING_MOVE_RESERVATION
         self._is_executing = asyncio.Lock()
@@ -143,18 +153,32 @@ class ExecutingMoveAction(IMoveAction):
         if self._action.target.labware is not None:
             raise ValueError("Target location is occupied")
 
-        self.status = ActionStatus.PREPARING_TO_MOVE
-        # move the labware
-        await self._action.source.prepare_for_pick(self._action.labware)
-        await self._action.target.prepare_for_place(self._action.labware)
-
-        self.status = ActionStatus.PICKING
-        await self._action.transporter.pick(self._action.source)
-        await self._action.source.notify_picked(self._action.labware)
-
-        self.status = ActionStatus.PLACING
-        await self._action.transporter.place(self._action.target)
-        await self._action.target.notify_placed(self._action.labware)
+        # hold the transporter for the whole move so concurrent moves cannot stage labware in between
+        async with self._action.transporter.transfer():
+            self.status = ActionStatus.PREPARING_TO_MOVE
+            # move the labware
+            await self._action.source.prepare_for_pick(self._action.labware)
+            await self._action.target.prepare_for_place(self._action.labware)
+
+            loop = asyncio.get_running_loop()
+            self.status = ActionStatus.PICKING
+            started = loop.time()
+            await self._action.transporter.pick(self._action.source)
+            picked = loop.time()
+            await self._action.source.notify_picked(self._action.labware)
+
+            self.status = ActionStatus.PLACING
+            placing = loop.time()
+            await self._action.transporter.place(self._action.target)
+            placed = loop.time()
+            await self._action.target.notify_placed(self._action.labware)
+
+        if self._duration_observer is not None:
+            self._duration_observer.record_move(self._action.transporter.name,
+                                                self._action.source.teachpoint_name,
+                                                self._action.target.teachpoint_name,
+                                                picked - started,
+                                                placed - placing)
 
         # await notify_picked
         if self._action.release_reservation_on_place:
@@ -8,7 +8,7 @@ from orca.system.reservation_manager.location_reservation import LocationReserva
 from orca.system.system_map import IResourceLocator, SystemMap
 
 
-from typing import Dict, List, Set, Union
+from typing import Dict, List, Union
 orca_logger = logging.getLogger("orca")
 
 class LocationCollectionReservationRequest(IReservationCollection):
@@ -16,6 +16,7 @@ class LocationCollectionReservationRequest(IReservationCollection):
         self._thread_id = thread_id
         self._action_location_requests = locations
         self._reserved_action_location: LocationReservation | None = None
+        self._sorted_requests: List[LocationReservation] | None = None
         self._system_map: SystemMap = system_map
         self._reference_point: Location = reference_point
         self._processed = asyncio.Event()
@@ -81,6 +82,10 @@ class LocationCollectionReservationRequest(IReservationCollection):
     #     return self._reserved_action_location
     
 
+    def get_reservation_options(self) -> List[List[LocationReservation]]:
+        """Returns each location on its own, the nearest to the reference point first."""
+        return [[r] for r in self._sort_requests(self._reference_point, self._system_map)]
+
     def resolve_final_reservation(self) -> None:
         sorted_requests = self._sort_requests(self._reference_point, self._system_map)
         granted_reservations = [r for r in sorted_requests if r.granted.is_set()]
@@ -102,8 +107,11 @@ class LocationCollectionReservationRequest(IReservationCollection):
 
 
     def _sort_requests(self, reference_point: Location, system_map: SystemMap) -> List[LocationReservation]:
-        return sorted(self._action_location_requests,
-                      key=lambda x: system_map.get_distance(reference_point.teachpoint_name, x.requested_location.teachpoint_name))
+        # the reference point and candidates do not change, so the distances are looked up once
+        if self._sorted_requests is None:
+            self._sorted_requests = sorted(self._action_location_requests,
+                                           key=lambda x: system_map.get_distance(reference_point.teachpoint_name, x.requested_location.teachpoint_name))
+        return self._sorted_requests
     
     def get_reservations(self) -> List:
         return self._action_location_requests
@@ -145,30 +153,31 @@ class ResourcePoolResolver:
                                                                                self._get_potential_action_locations(system_map),
                                                                                system_map, 
                                                                                reference_point)
-        await thread_reservation_manager.submit_reservation_request(thread_id, reservation_request_collection)
-        await reservation_request_collection.processed.wait()
-        if reservation_request_collection.deadlocked.is_set():
-            await asyncio.sleep(0.2)
-            orca_logger.info("Reservation request collection is deadlocked, retrying")
-            reservation_request_collection.clear()
-            return await self.resolve_action_location(thread_id, reference_point, thread_reservation_manager, system_map)
-        if reservation_request_collection.rejected.is_set():
-            await asyncio.sleep(0.2)
-            orca_logger.info("Reservation request collection was rejected, retrying")
-            reservation_request_collection.clear()
-            return await self.resolve_action_location(thread_id, reference_point, thread_reservation_manager, system_map)
-        if reservation_request_collection.granted.is_set():
-            return reservation_request_collection.reserved_action_location
+        while True:
+            await thread_reservation_manager.submit_reservation_request(thread_id, reservation_request_collection)
+            await reservation_request_collection.processed.wait()
+            if reservation_request_collection.deadlocked.is_set():
+                # wait in the queues again for another thread in the cycle to back out
+                orca_logger.info("Reservation request collection is deadlocked, retrying")
+                reservation_request_collection.clear()
+                continue
+            if reservation_request_collection.granted.is_set():
+                return reservation_request_collection.reserved_action_location
+            break
         raise ValueError("Reservation request collection was not granted")
 
-    def _get_potential_action_locations(self, resource_locator: IResourceLocator) -> List[LocationReservation]:
-        potential_locations: Set[Location] = set()
+    def get_potential_locations(self, resource_locator: IResourceLocator) -> List[Location]:
+        """Returns the locations of the pool's resources, each once and in the pool's order."""
+        # keep the pool's order so ties between equally good locations resolve the same way every run
+        potential_locations: Dict[str, Location] = {}
         for resource in self._resource_pool.resources:
             potential_location = resource_locator.get_resource_location(resource.name)
-            potential_locations.add(potential_location)
+            potential_locations[potential_location.name] = potential_location
+        return list(potential_locations.values())
 
+    def _get_potential_action_locations(self, resource_locator: IResourceLocator) -> List[LocationReservation]:
         location_requests: List[LocationReservation] = []
-        for location in potential_locations:
+        for location in self.get_potential_locations(resource_locator):
             location_request = LocationReservation(location, None)
             location_requests.append(location_request)
             # location_action = LocationActionData(location,
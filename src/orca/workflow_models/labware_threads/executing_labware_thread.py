@@ -5,11 +5,11 @@ from orca.resource_models.device_error import DeviceBusyError
 from orca.resource_models.labware import LabwareInstance
 from orca.resource_models.location import Location
 from orca.system.reservation_manager.move_handler import MoveHandler
-from orca.system.reservation_manager.interfaces import IThreadReservationCoordinator
+from orca.system.reservation_manager.interfaces import ILocationNeeds, IThreadReservationCoordinator
 from orca.system.system_map import SystemMap
 from orca.workflow_models.actions.dynamic_resource_action import DynamicResourceActionResolver
 from orca.workflow_models.actions.location_action import ExecutingLocationAction, ILocationAction
-from orca.workflow_models.actions.move_action import ExecutingMoveAction, MoveAction
+from orca.workflow_models.actions.move_action import ExecutingMoveAction, IMoveDurationObserver, MoveAction
 from orca.workflow_models.interfaces import ILabwareThread
 from orca.workflow_models.labware_threads.labware_thread import LabwareThreadInstance, orca_logger
 from orca.workflow_models.method import ExecutingMethod, MethodInstance
@@ -19,12 +19,12 @@ from orca.workflow_models.status_manager import StatusManager
 
 
 import asyncio
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from orca.workflow_models.workflows.workflow_registry import ExecutingMethodRegistry, ThreadRegistry
 
 
-class ExecutingLabwareThread(ILabwareThread):
+class ExecutingLabwareThread(ILabwareThread, ILocationNeeds):
 
     def __init__(self,
                  thread: LabwareThreadInstance,
@@ -34,9 +34,13 @@ class ExecutingLabwareThread(ILabwareThread):
                  status_manager: StatusManager,
                  actions_resolver: DynamicResourceActionResolver,
                  context: WorkflowExecutionContext,
+                 move_duration_observer: Optional[IMoveDurationObserver] = None,
+                 reservation_coordinator: Optional[IThreadReservationCoordinator] = None,
                  ) -> None:
 
         self._thread = thread
+        self._reservation_coordinator = reservation_coordinator
+        self._move_duration_observer = move_duration_observer
         self._move_handler = move_handler
         self._status_manager = status_manager
         self._context: WorkflowExecutionContext = context
@@ -106,6 +110,17 @@ class ExecutingLabwareThread(ILabwareThread):
     def current_location(self) -> Location:
         return self._current_location
 
+    def get_future_location_needs(self) -> List[List[str]]:
+        """Returns the locations of the actions the thread has yet to resolve, in the order they run."""
+        methods = [self._assigned_method] if self._assigned_method is not None else []
+        needs: List[List[str]] = []
+        for method in methods + self._pending_methods:
+            for action in method.pending_actions:
+                locations = [location.name for location in self._action_resolver.get_potential_locations(action)]
+                if locations:
+                    needs.append(locations)
+        return needs
+
     def update_start_location(self, location: Location) -> None:
         if self.status != LabwareThreadStatus.CREATED:
             raise ValueError("Cannot set start location.  Thread is already in progress.")
@@ -140,12 +155,13 @@ class ExecutingLabwareThread(ILabwareThread):
     async def initialize_labware(self) -> None:
         start_location = self._thread.start_location
         labware = self._thread.labware
-        try:
-            start_location.initialize_labware(labware)
-        except DeviceBusyError as e:
-            orca_logger.warning(f"Thread {self._thread.name} - Failed to initialize labware {labware.name} at start location {start_location.name}. Retrying...")
-            await asyncio.sleep(0.5)
-            await self.initialize_labware()
+        while True:
+            try:
+                start_location.initialize_labware(labware)
+                return
+            except DeviceBusyError as e:
+                orca_logger.warning(f"Thread {self._thread.name} - Failed to initialize labware {labware.name} at start location {start_location.name}. Retrying...")
+                await asyncio.sleep(0.5)
 
     def stop(self) -> None:
         self.status = LabwareThreadStatus.STOPPING
@@ -163,7 +179,28 @@ class ExecutingLabwareThread(ILabwareThread):
         if self._stop_event.is_set():
             self._handle_thread_stop()
             return
-        
+
+        if self._reservation_coordinator is None:
+            await self._run_methods()
+            return
+        self._reservation_coordinator.admit_thread(self._thread.id, self)
+        heartbeat = asyncio.create_task(self._renew_leases(self._reservation_coordinator))
+        try:
+            await self._run_methods()
+        finally:
+            heartbeat.cancel()
+            # reclaims any reservation left behind, e.g. by an action that raised
+            self._reservation_coordinator.remove_thread(self._thread.id)
+
+    async def _renew_leases(self, reservation_coordinator: IThreadReservationCoordinator) -> None:
+        lease_duration = reservation_coordinator.lease_duration
+        if lease_duration is None:
+            return
+        while True:
+            reservation_coordinator.renew_leases(self._thread.id)
+            await asyncio.sleep(lease_duration / 3)
+
+    async def _run_methods(self) -> None:
         # loop through all methods in the thread
         while len(self._pending_methods) > 0:
             self._assigned_method = self._pending_methods.pop(0)
@@ -250,7 +287,7 @@ class ExecutingLabwareThread(ILabwareThread):
                                         self._context.workflow_name,
                                         self._thread.id,
                                         self._thread.name)
-        executing_move_action = ExecutingMoveAction(self._status_manager, context, self._move_action)
+        executing_move_action = ExecutingMoveAction(self._status_manager, context, self._move_action, self._move_duration_observer)
         await executing_move_action.execute()
         self.set_current_location(executing_move_action.target)
         # if this was the last labware to pick from the resource, then release the reservation
@@ -275,7 +312,8 @@ class ExecutingThreadFactory:
                  reservation_coordinator: IThreadReservationCoordinator,
                  actions_resolver: DynamicResourceActionResolver,
                  executing_method_registry: ExecutingMethodRegistry,
-                 system_map: SystemMap) -> None:
+                 system_map: SystemMap,
+                 move_duration_observer: Optional[IMoveDurationObserver] = None) -> None:
         self._event_bus = event_bus
         self._actions_resolver = actions_resolver
         self._move_handler = move_handler
@@ -283,6 +321,7 @@ class ExecutingThreadFactory:
         self._reservation_coordinator = reservation_coordinator
         self._system_map = system_map
         self._executing_method_registry = executing_method_registry
+        self._move_duration_observer = move_duration_observer
 
     def create_instance(self,
                         instance: LabwareThreadInstance,
@@ -305,7 +344,9 @@ class ExecutingThreadFactory:
             self._move_handler,
             self._status_manager,
             self._actions_resolver,
-            context
+            context,
+            self._move_duration_observer,
+            self._reservation_coordinator
         )
 
 class IExecutingThreadRegistry(ABC):
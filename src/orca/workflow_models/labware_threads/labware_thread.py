@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 import logging
-from typing import Callable, List
+from typing import Callable, List, Optional
 from orca.resource_models.location import Location
 from orca.resource_models.labware import LabwareInstance
 from orca.events.execution_context import ExecutionContext
@@ -44,10 +44,14 @@ class LabwareThreadInstance(ILabwareThread):
                  labware: LabwareInstance, 
                  start_location: Location, 
                  end_location: Location,
+                 priority: int = 0,
+                 deadline: Optional[float] = None,
                  ) -> None:
         self._labware: LabwareInstance = labware
         self._start_location: Location = start_location
         self._end_location: Location = end_location
+        self._priority: int = priority
+        self._deadline: Optional[float] = deadline
         self._method_sequence: List[IMethod] = []
         # self._status: LabwareThreadStatus = LabwareThreadStatus.UNCREATED
         # self.status = LabwareThreadStatus.CREATED
@@ -84,6 +88,15 @@ class LabwareThreadInstance(ILabwareThread):
     def labware(self) -> LabwareInstance:
         return self._labware
     
+    @property
+    def priority(self) -> int:
+        return self._priority
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """Seconds after the thread first requests a location by which it should be done."""
+        return self._deadline
+
     @property
     def methods(self) -> List[IMethod]:
         return self._method_sequence
@@ -54,6 +54,7 @@ class ExecutingMethod(IMethod):
         self._index = 0
         self.status = MethodStatus.CREATED
         self._resolving_action_lock = asyncio.Lock()
+        self._action_resolved = asyncio.Event()
 
     @property
     def id(self) -> str:
@@ -85,6 +86,11 @@ class ExecutingMethod(IMethod):
     def current_action(self) -> ExecutingLocationAction | None:
         return self._current_action
 
+    @property
+    def action_resolved(self) -> asyncio.Event:
+        """Set while the current action is resolved and its location reserved."""
+        return self._action_resolved
+
     def has_completed(self) -> bool:
         return len(self._pending_actions) == 0 and MethodStatus.COMPLETED == self.status
 
@@ -111,9 +117,13 @@ class ExecutingMethod(IMethod):
         async with self._resolving_action_lock:
             assert self._current_action is not None, "Current action should not be None when handling action completion."
             self._event_bus.unsubscribe(event, self._handle_action_completed)
-            self._current_action.release_reservation()  # TODO: Ensure this is the correct spot to release the reservation -- this was previously in labware thread
+            # output labware still loaded in the resource keeps the location reserved, the labware thread releases it once the last
+            # output labware is moved off
+            if self._current_action.all_output_labware_removed():
+                self._current_action.release_reservation()
             self._completed_actions.append(self._current_action)
             self._current_action = None
+            self._action_resolved.clear()
 
             if len(self.pending_actions) == 0:
                 self._current_action = None
@@ -131,6 +141,7 @@ class ExecutingMethod(IMethod):
                 location_action = await action_resolver.resolve_action(thread_id, current_dynamic_action, current_location)
                 self._current_action = self._create_executing_action(location_action)
                 self._event_bus.subscribe(f"ACTION.{self._current_action.id}.{ActionStatus.COMPLETED.name}", self._handle_action_completed)
+                self._action_resolved.set()
 
             return self._current_action
         
@@ -15,6 +15,8 @@ class ThreadTemplate:
                  start: Location, 
                  end: Location, 
                  methods: Optional[List[IMethodTemplate]] = None,                  
+                 priority: int = 0,
+                 deadline: Optional[float] = None,
                  ) -> None:
         """ Initializes a ThreadTemplate instance.
         Args:
@@ -22,11 +24,16 @@ class ThreadTemplate:
             start (Location): The starting location of the thread.
             end (Location): The ending location of the thread.
             methods (Optional[List[IMethodTemplate]], optional): A list of method templates that define the methods in the thread. Defaults to None.
+            priority (int, optional): Threads with a higher priority are granted contended locations first. Defaults to 0.
+            deadline (Optional[float], optional): Seconds after the thread first requests a location by which it should be done,
+                among threads of the same priority the one with the nearest deadline is granted contended locations first. Defaults to None.
         """
         self._labware_template: LabwareTemplate = labware_template
         self._start: Location = start
         self._end: Location = end
         self._methods: List[IMethodTemplate] = methods if methods is not None else []
+        self._priority: int = priority
+        self._deadline: Optional[float] = deadline
         
     @property
     def name(self) -> str:
@@ -44,6 +51,14 @@ class ThreadTemplate:
     def end_location(self) -> Location:
         return self._end
 
+    @property
+    def priority(self) -> int:
+        return self._priority
+
+    @property
+    def deadline(self) -> Optional[float]:
+        return self._deadline
+
     @property
     def method_resolvers(self) -> List[IMethodTemplate]:
         return self._methods
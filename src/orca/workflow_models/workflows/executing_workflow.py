@@ -15,7 +15,7 @@ from orca.workflow_models.workflows.workflow import IWorkflow, WorkflowInstance
 
 
 import asyncio
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from orca.workflow_models.workflows.workflow_registry import WorkflowRegistry
 
@@ -79,10 +79,17 @@ class ExecutingWorkflow(IWorkflow):
         for event in self._workflow.event_hooks:
             self._event_bus.subscribe(event.event_name, event.handler)
 
-    def add_and_start_thread(self, thread: LabwareThreadInstance) -> None:
+    def add_and_start_thread(self, thread: LabwareThreadInstance, start_after: Optional[asyncio.Event] = None) -> None:
         executing_thread = self._thread_manager.create_executing_thread(thread.id, self._context)
         event_loop = asyncio.get_event_loop()
-        event_loop.create_task(executing_thread.start())
+        if start_after is None:
+            event_loop.create_task(executing_thread.start())
+        else:
+            event_loop.create_task(self._start_thread_after(executing_thread, start_after))
+
+    async def _start_thread_after(self, thread: ExecutingLabwareThread, event: asyncio.Event) -> None:
+        await event.wait()
+        await thread.start()
 
     def pause(self) -> None:
         raise NotImplementedError
@@ -55,6 +55,8 @@ class ThreadFactory:
         thread = LabwareThreadInstance(labware_instance,
                                 template.start_location,
                                 template.end_location,
+                                template.priority,
+                                template.deadline,
                                 )
         
         for method_template in template.method_resolvers:
@@ -0,0 +1,42 @@
+import pytest
+
+from orca.driver_management.drivers.simulation_base.duration_models import NormalDuration
+from orca.simulation.capacity_planner import CapacityPlanner, apply_pool_sizes
+from orca.simulation.generator import WorkcellSpec, generate_workcell
+
+SPEC = WorkcellSpec(transporters=1, devices=3, device_types=1, threads=3, methods_per_thread=1, device_duration=600.0)
+
+
+def build_system():
+    workcell = generate_workcell(SPEC)
+    for transporter in workcell.system.transporters:
+        transporter.sim_driver.set_duration_model(NormalDuration(10.0, 3.0))
+    return workcell.system, workcell.workflow
+
+
+class TestCapacityPlanner:
+
+    def test_more_devices_shorten_makespan(self):
+        planner = CapacityPlanner(build_system, max_workers=2)
+        one, three = planner.plan([{"type_0_pool": 1}, {"type_0_pool": 3}], samples=2, max_duration=100000.0)
+        assert one.pool_sizes == {"type_0_pool": 1}
+        assert len(one.samples) == 2 and len(three.samples) == 2
+        assert one.timed_out_samples == 0 and three.timed_out_samples == 0
+        assert three.mean_makespan < one.mean_makespan
+        assert three.mean_throughput > one.mean_throughput
+        # a single device has to run every plate
+        assert one.mean_utilization()["device_0"] > three.mean_utilization()["device_0"]
+
+    def test_seeded_samples_are_reproducible(self):
+        planner = CapacityPlanner(build_system, max_workers=2)
+        first = planner.plan([{"type_0_pool": 2}], samples=2, seed=3, max_duration=100000.0)[0]
+        second = planner.plan([{"type_0_pool": 2}], samples=2, seed=3, max_duration=100000.0)[0]
+        assert first.makespans == second.makespans
+        assert first.makespans[0] != first.makespans[1]
+
+    def test_invalid_pool_size(self):
+        system, _ = build_system()
+        with pytest.raises(ValueError):
+            apply_pool_sizes(system, {"type_0_pool": 4})
+        apply_pool_sizes(system, {"type_0_pool": 2})
+        assert [d.name for d in system.get_resource_pool("type_0_pool").resources] == ["device_0", "device_1"]
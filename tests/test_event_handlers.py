@@ -0,0 +1,58 @@
+from typing import Any, List, Optional
+
+from orca.events.event_bus import EventBus
+from orca.events.event_handlers import Spawn
+from orca.events.execution_context import MethodExecutionContext
+from orca.resource_models.labware import LabwareTemplate
+from orca.resource_models.location import Location
+from orca.workflow_models.method_template import MethodTemplate
+from orca.workflow_models.thread_template import ThreadTemplate
+
+
+class _Workflow:
+    def __init__(self) -> None:
+        self.started: List[Any] = []
+
+    def add_and_start_thread(self, thread: Any, start_after: Optional[Any] = None) -> None:
+        self.started.append(thread)
+
+
+class _System:
+    def __init__(self) -> None:
+        self.workflows = {"workflow_a": _Workflow(), "workflow_b": _Workflow()}
+
+    def get_executing_workflow(self, workflow_id: str) -> _Workflow:
+        return self.workflows[workflow_id]
+
+    def create_and_register_thread_instance(self, template: ThreadTemplate) -> str:
+        return template.name
+
+
+class TestEventBus:
+
+    def test_handler_subscribed_once(self):
+        event_bus = EventBus()
+        calls: List[str] = []
+
+        def handler(event: str, context: Any) -> None:
+            calls.append(event)
+        # e.g. a workflow template instantiated twice subscribes its handlers twice
+        event_bus.subscribe("METHOD.IN_PROGRESS", handler)
+        event_bus.subscribe("METHOD.IN_PROGRESS", handler)
+        event_bus.emit("METHOD.IN_PROGRESS", MethodExecutionContext("workflow", "workflow", "method", "transfer"))
+        assert calls == ["METHOD.IN_PROGRESS"]
+
+
+class TestSpawn:
+
+    def test_spawns_only_for_its_workflow(self):
+        parent_method = MethodTemplate("transfer", [])
+        tips = ThreadTemplate(LabwareTemplate("tips", "mock_tips"), Location("tips_start"), Location("tips_end"), [])
+        system = _System()
+        spawn = Spawn(tips, "workflow_a", parent_method)
+        spawn.set_system(system)  # type: ignore[arg-type]
+        # every instance of the workflow template subscribes a handler, each sees the others' events
+        for workflow_id in ["workflow_a", "workflow_b"]:
+            spawn.handle("METHOD.IN_PROGRESS", MethodExecutionContext(workflow_id, "transfer_workflow", "method", "transfer"))
+        assert system.workflows["workflow_a"].started == [tips.name]
+        assert system.workflows["workflow_b"].started == []
@@ -0,0 +1,78 @@
+import asyncio
+import builtins
+import time
+
+from orca.driver_management.drivers.simulation_robotic_arm.human_transfer import HumanTransferDriver
+from orca.simulation import run_in_virtual_time
+from orca.simulation.generator import WorkcellSpec, generate_workcell
+from orca.system.event_loop_monitor import EventLoopMonitor
+
+
+class BlockingDriver:
+    async def pick(self) -> None:
+        time.sleep(0.4)
+
+
+class TestEventLoopMonitor:
+
+    def test_records_blocking_call(self):
+        monitor = EventLoopMonitor(interval=0.02, stall_threshold=0.15)
+
+        async def main() -> None:
+            monitor.start()
+            await asyncio.sleep(0.1)
+            await asyncio.create_task(BlockingDriver().pick(), name="blocking_task")
+            await asyncio.sleep(0.1)
+            monitor.stop()
+
+        asyncio.run(main())
+        stats = monitor.get_stats()
+        assert stats.samples > 0
+        assert stats.max_lag >= 0.3
+        assert len(stats.stalls) == 1
+        stall = stats.stalls[0]
+        assert stall.duration >= 0.3
+        assert stall.task == "blocking_task"
+        assert stall.coroutine == "BlockingDriver.pick"
+        assert "time.sleep(0.4)" in stall.stack[-1]
+
+    def test_no_stalls_when_yielding(self):
+        monitor = EventLoopMonitor(interval=0.02, stall_threshold=0.15)
+
+        async def main() -> None:
+            monitor.start()
+            monitor.start()
+            await asyncio.gather(*[asyncio.sleep(0.05 * i) for i in range(6)])
+            monitor.stop()
+
+        asyncio.run(main())
+        stats = monitor.get_stats()
+        assert stats.samples > 0
+        assert stats.stalls == []
+
+    def test_virtual_time_is_not_monitored(self):
+        monitor = EventLoopMonitor()
+
+        async def main() -> bool:
+            monitor.start()
+            await asyncio.sleep(10)
+            return monitor.is_running
+
+        assert run_in_virtual_time(main()) is False
+
+    def test_human_transfer_does_not_block(self, monkeypatch):
+        monkeypatch.setattr(builtins, "input", lambda prompt: time.sleep(0.3))
+        monitor = EventLoopMonitor(interval=0.02, stall_threshold=0.15)
+        driver = HumanTransferDriver("human", ["a"])
+
+        async def main() -> None:
+            monitor.start()
+            await driver.pick("a", "plate")
+            monitor.stop()
+
+        asyncio.run(main())
+        assert monitor.stalls == []
+
+    def test_system_exposes_monitor(self):
+        workcell = generate_workcell(WorkcellSpec())
+        assert isinstance(workcell.system.event_loop_monitor, EventLoopMonitor)
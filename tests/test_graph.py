@@ -1,7 +1,12 @@
 import asyncio
 
+import pytest
+
 from orca.resource_models.labware import LabwareInstance
+from orca.simulation.generator import WorkcellSpec, generate_workcell
+from orca.system.resource_registry import ResourceRegistry
 from orca.system.system_map import SystemMap
+from tests.mock import MockEquipmentResource, MockRoboticArm
 
 
 class TestSystemGraph:
@@ -20,3 +25,171 @@ class TestSystemGraph:
         has_path = system_map.has_available_route("stacker1", "ham1")
         assert not has_path
     
+
+    def test_route_cache(self, system_map: SystemMap):
+        paths = system_map.get_all_shortest_any_paths("stacker1", "ham1")
+        assert paths == [["stacker1", "loc3", "ham1"]]
+        # callers get their own copies of the cached routes
+        paths[0].append("loc5")
+        assert system_map.get_all_shortest_any_paths("stacker1", "ham1") == [["stacker1", "loc3", "ham1"]]
+        assert system_map.get_distance("stacker1", "ham1") == 10.0
+
+    def test_set_edge_weight_invalidates_routes(self, system_map: SystemMap):
+        assert system_map.get_distance("stacker1", "ham1") == 10.0
+        system_map.set_edge_weight("loc3", "ham1", 20.0)
+        assert system_map.get_distance("stacker1", "ham1") == 25.0
+        # robot2's pick at loc3 and place at ham1 each cost half, its other moves from loc3 and to ham1 share them
+        assert system_map.get_distance("loc3", "loc4") == 12.5
+        assert system_map.get_distance("loc4", "ham1") == 12.5
+        assert system_map.get_distance("loc4", "loc5") == 5.0
+
+    def test_add_transporter_invalidates_routes(self, system_map: SystemMap, resource_registry: ResourceRegistry):
+        assert system_map.get_all_shortest_any_paths("stacker1", "ham1") == [["stacker1", "loc3", "ham1"]]
+        resource_registry.add_resource(MockRoboticArm("robot3", "robot", ["stacker1", "ham1"]))
+        assert system_map.get_all_shortest_any_paths("stacker1", "ham1") == [["stacker1", "ham1"]]
+        assert system_map.get_distance("stacker1", "ham1") == 5.0
+
+    def test_available_route_follows_labware(self, system_map: SystemMap):
+        loc3 = system_map.get_location("loc3")
+        labware = LabwareInstance("plate", labware_type="mock_labware")
+        loc3.initialize_labware(labware)
+        assert not system_map.has_available_route("stacker1", "ham1")
+        # the occupied source is still routable from
+        assert system_map.get_all_shortest_available_paths("loc3", "ham1") == [["loc3", "ham1"]]
+        asyncio.run(loc3.prepare_for_pick(labware))
+        asyncio.run(loc3.notify_picked(labware))
+        assert system_map.get_all_shortest_available_paths("stacker1", "ham1") == [["stacker1", "loc3", "ham1"]]
+
+    def test_no_path_through_busy_transporter(self, system_map: SystemMap, robot2: MockRoboticArm):
+        loc4 = system_map.get_location("loc4")
+        labware = LabwareInstance("plate", labware_type="mock_labware")
+        loc4.initialize_labware(labware)
+
+        async def pick() -> None:
+            await robot2.initialize()
+            await loc4.prepare_for_pick(labware)
+            await robot2.pick(loc4)
+            await loc4.notify_picked(labware)
+        asyncio.run(pick())
+
+        assert robot2.labware == labware
+        assert not system_map.has_available_route("stacker1", "ham1")
+        assert system_map.has_available_route("stacker1", "loc2")
+
+    def test_transporter_reach_is_linear(self, system_map: SystemMap, robot1: MockRoboticArm):
+        # each arm is a hub its positions connect to rather than an edge per pair, the hub is never a location or a stop
+        positions = robot1.get_taught_positions()
+        for source in positions:
+            for target in positions:
+                if source != target:
+                    assert system_map.get_all_shortest_any_paths(source, target) == [[source, target]]
+                    assert system_map.get_distance(source, target) == 5.0
+        assert sorted(location.name for location in system_map.locations) == ["ham1", "loc1", "loc2", "loc3", "loc4", "loc5", "shaker1", "stacker1"]
+        assert system_map.get_transporter_between("stacker1", "loc3").name == "robot1"
+        assert system_map.get_transporter_between("loc3", "ham1").name == "robot2"
+        with pytest.raises(KeyError):
+            system_map.get_transporter_between("stacker1", "ham1")
+
+    def test_later_transporter_wins_shared_positions(self, system_map: SystemMap, resource_registry: ResourceRegistry):
+        resource_registry.add_resource(MockRoboticArm("robot3", "robot", ["loc1", "loc2"]))
+        assert system_map.get_transporter_between("loc1", "loc2").name == "robot3"
+        assert system_map.get_transporter_between("loc2", "loc1").name == "robot3"
+        assert system_map.get_distance("loc1", "loc2") == 5.0
+        assert system_map.get_all_shortest_any_paths("loc1", "loc2") == [["loc1", "loc2"]]
+
+    def test_add_edge_within_reach(self, system_map: SystemMap, robot1: MockRoboticArm, robot2: MockRoboticArm):
+        system_map.add_edge("loc1", "loc2", robot1, weight=12.0)
+        # the arm's hub is weighted in place rather than expanded into an edge per pair
+        assert system_map.get_distance("loc1", "loc2") == 12.0
+        assert system_map.get_all_shortest_any_paths("loc1", "loc2") == [["loc1", "loc2"]]
+        assert system_map.get_distance("loc2", "loc1") == 5.0
+        assert system_map.get_distance("stacker1", "shaker1") == 5.0
+        assert system_map.get_transporter_between("loc1", "loc2").name == "robot1"
+        # another transporter's edge is added alongside the hub
+        system_map.add_edge("loc1", "loc2", robot2, weight=3.0)
+        assert system_map.get_distance("loc1", "loc2") == 3.0
+        assert system_map.get_transporter_between("loc1", "loc2").name == "robot2"
+
+    def test_nearest_free_buffers(self, system_map: SystemMap, stacker1: MockEquipmentResource):
+        # loc3, where robot1 hands labware to robot2, comes last
+        assert system_map.get_nearest_free_buffers("loc1") == ["loc2", "shaker1", "stacker1", "ham1", "loc4", "loc5", "loc3"]
+        # equipment is not a buffer
+        system_map.assign_resource_to_location("stacker1", stacker1)
+        assert "stacker1" not in system_map.get_nearest_free_buffers("loc1")
+        # occupied and excluded pads are skipped
+        loc2 = system_map.get_location("loc2")
+        plate = LabwareInstance("plate", labware_type="mock_labware")
+        asyncio.run(loc2.prepare_for_place(plate))
+        asyncio.run(loc2.notify_placed(plate))
+        assert system_map.get_nearest_free_buffers("loc1", count=2, exclude={"loc3"}) == ["shaker1", "ham1"]
+        assert system_map.get_shortest_paths_to_deadlock_resolution("loc1")[0] == ["loc1", "shaker1"]
+
+    def test_zones_split_at_transfer_locations(self, system_map: SystemMap):
+        # loc3 is the only position both robots reach
+        zones = system_map.get_zones(["loc3"])
+        assert sorted(map(sorted, zones)) == [["ham1", "loc4", "loc5"], ["loc1", "loc2", "shaker1", "stacker1"]]
+        assert [sorted(zone) for zone in system_map.get_zones([])] == [sorted(location.name for location in system_map.locations)]
+        with pytest.raises(ValueError):
+            system_map.get_zones(["loc9"])
+
+
+class TestCompactGraphBackend:
+
+    def test_matches_networkx_backend(self, resource_registry: ResourceRegistry):
+        system_map = SystemMap(resource_registry, graph_backend="compact")
+        assert system_map.get_all_shortest_any_paths("stacker1", "ham1") == [["stacker1", "loc3", "ham1"]]
+        assert system_map.get_distance("stacker1", "ham1") == 10.0
+        system_map.set_edge_weight("loc3", "ham1", 20.0)
+        assert system_map.get_distance("stacker1", "ham1") == 25.0
+        assert system_map.get_distance("loc3", "loc4") == 12.5
+        assert system_map.get_all_shortest_any_paths("stacker1", "ham1") == [["stacker1", "loc3", "ham1"]]
+        assert system_map.get_transporter_between("loc3", "loc4").name == "robot2"
+
+    def test_k_shortest_routes_follow_weights(self, resource_registry: ResourceRegistry):
+        networkx_map = SystemMap(resource_registry)
+        compact_map = SystemMap(resource_registry, graph_backend="compact")
+        for weight in [5.0, 20.0]:
+            for system_map in (networkx_map, compact_map):
+                system_map.set_edge_weight("loc3", "ham1", weight)
+            routes = [(r.stops, r.cost) for r in compact_map.get_k_shortest_routes("stacker1", "ham1", 3)]
+            assert routes == [(r.stops, r.cost) for r in networkx_map.get_k_shortest_routes("stacker1", "ham1", 3)]
+        assert routes[0] == (["stacker1", "loc3", "ham1"], 25.0)
+
+    def test_available_routes(self, resource_registry: ResourceRegistry):
+        system_map = SystemMap(resource_registry, graph_backend="compact")
+        loc3 = system_map.get_location("loc3")
+        labware = LabwareInstance("plate", labware_type="mock_labware")
+        loc3.initialize_labware(labware)
+        assert not system_map.has_available_route("stacker1", "ham1")
+        assert system_map.has_available_route("stacker1", "loc2")
+        assert system_map.get_all_shortest_available_paths("loc3", "ham1") == [["loc3", "ham1"]]
+
+    def test_no_available_route_through_busy_transporter(self, resource_registry: ResourceRegistry, robot2: MockRoboticArm):
+        system_map = SystemMap(resource_registry, graph_backend="compact")
+        loc4 = system_map.get_location("loc4")
+        labware = LabwareInstance("plate", labware_type="mock_labware")
+        loc4.initialize_labware(labware)
+
+        async def pick() -> None:
+            await robot2.initialize()
+            await loc4.prepare_for_pick(labware)
+            await robot2.pick(loc4)
+            await loc4.notify_picked(labware)
+        asyncio.run(pick())
+
+        assert not system_map.has_available_route("stacker1", "ham1")
+        assert system_map.get_all_shortest_available_paths("stacker1", "loc2") == [["stacker1", "loc2"]]
+
+    def test_generated_workcell(self):
+        networkx_map = generate_workcell(WorkcellSpec(transporters=3, devices=12, shared_positions=2)).system_map
+        compact_map = generate_workcell(WorkcellSpec(transporters=3, devices=12, shared_positions=2, graph_backend="compact")).system_map
+        names = [location.name for location in networkx_map.locations]
+        assert names == [location.name for location in compact_map.locations]
+        for source in names:
+            for target in names:
+                assert networkx_map.get_distance(source, target) == compact_map.get_distance(source, target)
+                assert sorted(networkx_map.get_all_shortest_any_paths(source, target)) == sorted(compact_map.get_all_shortest_any_paths(source, target))
+
+    def test_unknown_backend(self, resource_registry: ResourceRegistry):
+        with pytest.raises(ValueError):
+            SystemMap(resource_registry, graph_backend="igraph")
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from orca.simulation.generator import WorkcellSpec, generate_workcell
+from orca.simulation.runner import simulate_workflow_runs
+from orca.system.move_duration_estimator import MoveDurationEstimator
+from orca.system.resource_registry import ResourceRegistry
+from orca.system.system_map import SystemMap
+from tests.mock import MockRoboticArm
+
+
+class TestMoveDurationEstimator:
+
+    def test_smoothing(self, system_map: SystemMap):
+        estimator = MoveDurationEstimator(system_map, smoothing=0.5, update_interval=100)
+        estimator.record_move("robot1", "stacker1", "loc3", 4.0, 6.0)
+        estimator.record_move("robot1", "stacker1", "loc3", 8.0, 2.0)
+        pick = estimator.get_pick_estimate("robot1", "stacker1")
+        assert pick is not None and pick.seconds == 6.0 and pick.samples == 2
+        assert estimator.get_move_estimate("robot1", "stacker1", "loc3") == 10.0
+        assert estimator.get_move_estimate("robot1", "loc3", "stacker1") is None
+
+    def test_prefers_fastest_route(self, system_map: SystemMap, resource_registry: ResourceRegistry):
+        resource_registry.add_resource(MockRoboticArm("robot3", "robot", ["stacker1", "ham1"]))
+        assert system_map.get_all_shortest_any_paths("stacker1", "ham1") == [["stacker1", "ham1"]]
+        estimator = MoveDurationEstimator(system_map, update_interval=3)
+        estimator.record_move("robot3", "stacker1", "ham1", 30.0, 30.0)
+        estimator.record_move("robot1", "stacker1", "loc3", 2.0, 2.0)
+        # weights are only updated every update_interval moves
+        assert system_map.get_all_shortest_any_paths("stacker1", "ham1") == [["stacker1", "ham1"]]
+        estimator.record_move("robot2", "loc3", "ham1", 2.0, 2.0)
+        assert system_map.get_all_shortest_any_paths("stacker1", "ham1") == [["stacker1", "loc3", "ham1"]]
+        assert system_map.get_distance("stacker1", "ham1") == 8.0
+
+    def test_unmeasured_positions_use_mean(self, system_map: SystemMap):
+        estimator = MoveDurationEstimator(system_map, update_interval=2)
+        estimator.record_move("robot1", "stacker1", "loc3", 2.0, 4.0)
+        estimator.record_move("robot1", "loc1", "loc2", 6.0, 8.0)
+        # robot1 picks at 4s and places at 6s on average at the positions it was not measured at
+        assert system_map.get_distance("loc3", "loc1") == 4.0 + 6.0
+        # robot2 was never measured and keeps its weights
+        assert system_map.get_distance("loc4", "ham1") == 5.0
+
+    def test_only_measured_transporters_updated(self, system_map: SystemMap):
+        estimator = MoveDurationEstimator(system_map, update_interval=1)
+        estimator.record_move("robot2", "loc4", "ham1", 1.0, 1.0)
+        # a weight set since, e.g. by the operator, survives updates from other transporters' moves
+        system_map.set_transporter_weights("robot2", {"loc4": 10.0}, {"ham1": 10.0})
+        estimator.record_move("robot1", "stacker1", "loc3", 2.0, 4.0)
+        assert system_map.get_distance("loc4", "ham1") == 20.0
+        estimator.record_move("robot2", "loc4", "ham1", 1.0, 1.0)
+        assert system_map.get_distance("loc4", "ham1") == 2.0
+
+    def test_persistence(self, system_map: SystemMap, tmp_path):
+        path = str(tmp_path / "move_durations.json")
+        estimator = MoveDurationEstimator(system_map, update_interval=1, path=path)
+        estimator.record_move("robot1", "stacker1", "loc3", 2.0, 3.0)
+        with open(path) as f:
+            assert json.load(f)["pick"]["robot1"]["stacker1"] == {"seconds": 2.0, "samples": 1}
+
+        restarted = MoveDurationEstimator(system_map, path=path)
+        assert restarted.get_move_estimate("robot1", "stacker1", "loc3") == 5.0
+
+    def test_invalid_settings(self, system_map: SystemMap):
+        with pytest.raises(ValueError):
+            MoveDurationEstimator(system_map, smoothing=0.0)
+        with pytest.raises(ValueError):
+            MoveDurationEstimator(system_map, update_interval=0)
+
+    def test_records_executed_moves(self):
+        workcell = generate_workcell(WorkcellSpec(threads=2, methods_per_thread=2, learn_move_durations=True))
+        simulate_workflow_runs(workcell.system, workcell.workflow, max_duration=100000.0)
+        estimator = workcell.system.move_duration_estimator
+        pick = estimator.get_pick_estimate("arm_0", "stacker_in")
+        assert pick is not None and pick.samples == 2 and pick.seconds > 0
@@ -0,0 +1,256 @@
+import asyncio
+import sys
+from typing import Callable, Collection, List, Optional
+
+import pytest
+
+from orca.events.event_bus import EventBus
+from orca.events.execution_context import ThreadExecutionContext
+from orca.resource_models.labware import LabwareInstance
+from orca.system.reservation_manager.interfaces import ILocationNeeds, IReservationCollection, IThreadReservationCoordinator
+from orca.system.reservation_manager.location_reservation import LocationReservation
+from orca.system.reservation_manager.move_handler import MoveHandler, RouteReservationRequest
+from orca.system.reservation_manager.reservation_manager import LocationReservationManager, ThreadReservationCoordinator
+from orca.system.resource_registry import ResourceRegistry
+from orca.system.system_map import SystemMap
+from orca.workflow_models.actions.move_action import ExecutingMoveAction, MoveAction
+from orca.workflow_models.status_manager import StatusManager
+from tests.mock import MockRoboticArm
+
+
+class _ImmediateCoordinator(IThreadReservationCoordinator):
+    """Processes each request once as it is submitted, a rejected request is returned rather than queued."""
+    def __init__(self, manager: LocationReservationManager) -> None:
+        self.manager = manager
+        self.submitted = 0
+        self.awaited: List[str] = []
+        self.thread_removed_callbacks: List[Callable[[str], None]] = []
+
+    async def submit_reservation_request(self, thread_id: str, request: IReservationCollection, parked: bool = False) -> None:
+        self.submitted += 1
+        for reservation in request.get_reservations():
+            self.manager.attempt_reservation(reservation.requested_location.name, reservation, thread_id)
+        request.resolve_final_reservation()
+        request.processed.set()
+
+    def admit_thread(self, thread_id: str, needs: ILocationNeeds) -> None:
+        pass
+
+    def add_thread_removed_callback(self, callback: Callable[[str], None]) -> None:
+        self.thread_removed_callbacks.append(callback)
+
+    def remove_thread(self, thread_id: str) -> None:
+        for callback in self.thread_removed_callbacks:
+            callback(thread_id)
+
+    def renew_leases(self, thread_id: str) -> None:
+        pass
+
+    @property
+    def lease_duration(self) -> Optional[float]:
+        return None
+
+    @property
+    def reserved_locations(self) -> Collection[str]:
+        return self.manager.reservations.keys()
+
+    @property
+    def awaited_locations(self) -> Collection[str]:
+        return self.awaited
+
+    async def start_tick_loop(self, tick_interval: float) -> None:
+        pass
+
+
+class _DeadlockingCoordinator(_ImmediateCoordinator):
+    """Finds the first requests submitted deadlocked."""
+    def __init__(self, manager: LocationReservationManager, deadlocks: int) -> None:
+        super().__init__(manager)
+        self.deadlocks = deadlocks
+
+    async def submit_reservation_request(self, thread_id: str, request: IReservationCollection, parked: bool = False) -> None:
+        if self.submitted < self.deadlocks:
+            self.submitted += 1
+            request.deadlocked.set()
+            request.processed.set()
+            return
+        await super().submit_reservation_request(thread_id, request, parked)
+
+
+class TestCongestionAwareRouting:
+
+    def test_moves_on_one_transporter_run_in_turn(self, system_map: SystemMap, robot1: MockRoboticArm):
+        status_manager = StatusManager(EventBus())
+        context = ThreadExecutionContext("workflow", "workflow", "thread", "thread")
+        moves = []
+        for source, target in [("loc1", "loc2"), ("stacker1", "shaker1")]:
+            labware = LabwareInstance("plate", "mock_labware")
+            system_map.get_location(source).initialize_labware(labware)
+            move = MoveAction(labware, system_map.get_location(source), system_map.get_location(target), robot1)
+            moves.append(ExecutingMoveAction(status_manager, context, move))
+
+        async def run() -> None:
+            await robot1.initialize()
+            # the second move would pick while the arm still holds the first move's labware
+            await asyncio.gather(*(move.execute() for move in moves))
+        asyncio.run(run())
+        assert system_map.get_location("loc2").labware is not None
+        assert system_map.get_location("shaker1").labware is not None
+
+    def test_transfer_counts_queue_depth(self, robot1: MockRoboticArm):
+        async def run() -> None:
+            assert robot1.queue_depth == 0
+            async with robot1.transfer():
+                waiting = asyncio.create_task(self._hold(robot1))
+                await asyncio.sleep(0)
+                # one move holds the transfer lock and the other waits for it
+                assert robot1.queue_depth == 2
+            await waiting
+            assert robot1.queue_depth == 0
+        asyncio.run(run())
+
+    def test_k_shortest_routes(self, system_map: SystemMap):
+        routes = system_map.get_k_shortest_routes("stacker1", "ham1", 3)
+        assert routes[0].stops == ["stacker1", "loc3", "ham1"]
+        assert [t.name for t in routes[0].transporters] == ["robot1", "robot2"]
+        assert routes[0].cost == 10.0
+        assert [r.cost for r in routes] == sorted(r.cost for r in routes)
+
+    def test_shortest_route_while_unsaturated(self, system_map: SystemMap, resource_registry: ResourceRegistry):
+        resource_registry.add_resource(MockRoboticArm("robot3", "robot", ["stacker1", "loc3"]))
+        handler = MoveHandler(_ImmediateCoordinator(LocationReservationManager(system_map)), system_map)
+        routes = handler._get_potential_routes(system_map.get_location("stacker1"), system_map.get_location("loc3"))
+        assert [r.transporters[0].name for r in routes] == ["robot3"]
+
+    def test_routes_around_saturated_transporter(self, system_map: SystemMap, resource_registry: ResourceRegistry):
+        robot3 = MockRoboticArm("robot3", "robot", ["stacker1", "loc3"])
+        resource_registry.add_resource(robot3)
+        handler = MoveHandler(_ImmediateCoordinator(LocationReservationManager(system_map)), system_map, route_alternatives=3)
+        source, target = system_map.get_location("stacker1"), system_map.get_location("loc3")
+
+        async def run() -> None:
+            async with robot3.transfer():
+                routes = handler._get_potential_routes(source, target)
+                assert routes[0].transporters[0].name == "robot1"
+                assert "robot3" in [r.transporters[0].name for r in routes]
+                # one move per target, through the idle transporter
+                moves = handler._get_route_move_actions(LabwareInstance("plate", "mock_labware"), routes)
+                assert [(m.target.name, m.transporter.name) for m in moves] == [("loc3", "robot1")]
+        asyncio.run(run())
+
+    def test_single_alternative_keeps_shortest_route(self, system_map: SystemMap, resource_registry: ResourceRegistry):
+        robot3 = MockRoboticArm("robot3", "robot", ["stacker1", "loc3"])
+        resource_registry.add_resource(robot3)
+        # routing around saturated transporters is opt in
+        handler = MoveHandler(_ImmediateCoordinator(LocationReservationManager(system_map)), system_map)
+
+        async def run() -> None:
+            async with robot3.transfer():
+                routes = handler._get_potential_routes(system_map.get_location("stacker1"), system_map.get_location("loc3"))
+                assert [r.transporters[0].name for r in routes] == ["robot3"]
+        asyncio.run(run())
+
+    @staticmethod
+    async def _hold(transporter: MockRoboticArm) -> None:
+        async with transporter.transfer():
+            pass
+
+
+class TestRouteLookahead:
+
+    def test_route_is_reserved_all_or_nothing(self, system_map: SystemMap):
+        manager = LocationReservationManager(system_map)
+        ham1 = system_map.get_location("ham1")
+        manager.attempt_reservation("ham1", LocationReservation(ham1), "other_thread")
+        labware = LabwareInstance("plate", "mock_labware")
+        handler = MoveHandler(_ImmediateCoordinator(manager), system_map, lookahead_hops=None)
+        route = handler._get_lookahead_route_moves(labware, [system_map.get_route(["stacker1", "loc3", "ham1"])])
+        request = RouteReservationRequest("thread", route)
+
+        asyncio.run(_ImmediateCoordinator(manager).submit_reservation_request("thread", request))
+        assert request.rejected.is_set()
+        # loc3 was granted but released again as the route was not granted in full
+        assert manager.get_reservation_at("loc3") is None
+
+        manager.get_reservation_at("ham1").release_reservation()  # type: ignore[union-attr]
+        request.clear()
+        asyncio.run(_ImmediateCoordinator(manager).submit_reservation_request("thread", request))
+        assert request.granted.is_set()
+        assert [m.target.name for m in request.reserved_route] == ["loc3", "ham1"]
+        assert set(manager.reservations) == {"loc3", "ham1"}
+
+    def test_route_waits_until_every_hop_is_free(self, system_map: SystemMap):
+        coordinator = ThreadReservationCoordinator(system_map, None)  # type: ignore[arg-type]
+        manager = coordinator._reservation_manager
+        loc3, ham1 = system_map.get_location("loc3"), system_map.get_location("ham1")
+        held_loc3, held_ham1 = LocationReservation(loc3), LocationReservation(ham1)
+        manager.attempt_reservation("loc3", held_loc3, "other_thread")
+        manager.attempt_reservation("ham1", held_ham1, "other_thread")
+        handler = MoveHandler(coordinator, system_map, lookahead_hops=None)
+        route = handler._get_lookahead_route_moves(LabwareInstance("plate", "mock_labware"),
+                                                   [system_map.get_route(["stacker1", "loc3", "ham1"])])
+        request = RouteReservationRequest("thread", route)
+
+        async def run() -> None:
+            waiting = asyncio.create_task(coordinator.submit_reservation_request("thread", request))
+            await asyncio.sleep(0)
+            # loc3 frees but ham1 is still held, the retry is rejected and the request keeps waiting
+            held_loc3.release_reservation()
+            await asyncio.sleep(0)
+            assert not waiting.done()
+            assert manager.get_reservation_at("loc3") is None
+            held_ham1.release_reservation()
+            await asyncio.wait_for(waiting, 1.0)
+            assert request.granted.is_set()
+        asyncio.run(run())
+
+    def test_planned_hops_are_not_reserved_again(self, system_map: SystemMap):
+        coordinator = _ImmediateCoordinator(LocationReservationManager(system_map))
+        handler = MoveHandler(coordinator, system_map, lookahead_hops=None)
+        labware = LabwareInstance("plate", "mock_labware")
+        stacker1, loc3, ham1 = (system_map.get_location(name) for name in ["stacker1", "loc3", "ham1"])
+
+        first = asyncio.run(handler.resolve_move_action("thread", labware, stacker1, ham1))
+        assert (first.source.name, first.target.name) == ("stacker1", "loc3")
+        assert set(coordinator.reserved_locations) == {"loc3", "ham1"}
+        second = asyncio.run(handler.resolve_move_action("thread", labware, loc3, ham1))
+        assert (second.source.name, second.target.name, second.transporter.name) == ("loc3", "ham1", "robot2")
+        assert second.reservation.granted.is_set()
+        assert coordinator.submitted == 1
+
+    def test_planned_hops_released_with_thread(self, system_map: SystemMap):
+        coordinator = _ImmediateCoordinator(LocationReservationManager(system_map))
+        handler = MoveHandler(coordinator, system_map, lookahead_hops=None)
+        labware = LabwareInstance("plate", "mock_labware")
+        stacker1, loc3, ham1 = (system_map.get_location(name) for name in ["stacker1", "loc3", "ham1"])
+
+        asyncio.run(handler.resolve_move_action("thread", labware, stacker1, ham1))
+        coordinator.remove_thread("thread")
+        assert set(coordinator.reserved_locations) == {"loc3"}
+        # a thread reusing the ID plans its own route
+        asyncio.run(handler.resolve_move_action("thread", labware, loc3, ham1))
+        assert coordinator.submitted == 2
+
+    def test_deadlocked_labware_not_parked_where_others_wait(self, system_map: SystemMap, robot1: MockRoboticArm):
+        coordinator = _ImmediateCoordinator(LocationReservationManager(system_map))
+        handler = MoveHandler(coordinator, system_map, deadlock_buffers=2)
+        loc1, loc3 = system_map.get_location("loc1"), system_map.get_location("loc3")
+        deadlocked = MoveAction(LabwareInstance("plate", "mock_labware"), loc1, loc3, robot1)
+        assert [m.target.name for m in handler._get_deadlock_resolution_moves(deadlocked)] == ["loc2", "shaker1"]
+        # another thread's labware waits to be moved to loc2
+        coordinator.awaited = ["loc2"]
+        assert [m.target.name for m in handler._get_deadlock_resolution_moves(deadlocked)] == ["shaker1", "stacker1"]
+
+    def test_rerouted_many_times_without_recursing(self, system_map: SystemMap):
+        deadlocks = sys.getrecursionlimit() + 1
+        coordinator = _DeadlockingCoordinator(LocationReservationManager(system_map), deadlocks)
+        handler = MoveHandler(coordinator, system_map)
+        stacker1, ham1 = system_map.get_location("stacker1"), system_map.get_location("ham1")
+        move = asyncio.run(handler.resolve_move_action("thread", LabwareInstance("plate", "mock_labware"), stacker1, ham1))
+        # the labware is parked on a buffer once the reroute is granted
+        assert move.source.name == "stacker1" and move.target.name != "loc3"
+        assert coordinator.submitted == deadlocks + 1
+
+    def test_invalid_lookahead(self, system_map: SystemMap):
+        with pytest.raises(ValueError):
+            MoveHandler(_ImmediateCoordinator(LocationReservationManager(system_map)), system_map, lookahead_hops=0)
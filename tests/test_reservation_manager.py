@@ -0,0 +1,677 @@
+import asyncio
+from typing import Dict, List, Optional
+
+import pytest
+
+from orca.driver_management.drivers.simulation_labware_placeable.simulation_labware_placeable import SimulationDeviceDriver
+from orca.events.event_bus import EventBus
+from orca.events.execution_context import WorkflowExecutionContext
+from orca.resource_models.device_error import DeviceBusyError
+from orca.resource_models.devices import Device
+from orca.resource_models.labware import LabwareInstance
+from orca.resource_models.location import Location
+from orca.resource_models.plate_pad import PlatePad
+from orca.simulation import run_in_virtual_time
+from orca.system.reservation_manager.deadlock_manager import DeadlockGraph
+from orca.system.reservation_manager.interfaces import ILocationNeeds, IReservationCollection
+from orca.system.reservation_manager.location_reservation import LocationReservation
+from orca.system.reservation_manager.reservation_manager import LocationReservationManager, ThreadReservationCoordinator
+from orca.system.system_map import SystemMap
+from orca.system.thread_registry_interface import IThreadRegistry
+from orca.workflow_models.actions.util import LocationCollectionReservationRequest
+from orca.workflow_models.labware_threads.labware_thread import LabwareThreadInstance
+from orca.workflow_models.method import ExecutingMethod, MethodInstance
+from orca.workflow_models.status_manager import StatusManager
+
+
+class _ThreadRegistry(IThreadRegistry):
+    def __init__(self) -> None:
+        self._threads: Dict[str, LabwareThreadInstance] = {}
+
+    @property
+    def threads(self) -> List[LabwareThreadInstance]:
+        return list(self._threads.values())
+
+    def get_thread(self, id: str) -> LabwareThreadInstance:
+        return self._threads[id]
+
+    def get_thread_by_labware(self, labware_id: str) -> LabwareThreadInstance:
+        return self._threads[labware_id]
+
+    def add_thread(self, labware_thread: LabwareThreadInstance) -> None:
+        self._threads[labware_thread.id] = labware_thread
+
+
+class _LocationNeeds(ILocationNeeds):
+    def __init__(self, needs: List[List[str]]) -> None:
+        self.needs = needs
+
+    def get_future_location_needs(self) -> List[List[str]]:
+        return self.needs
+
+
+def _add_hotel(system_map: SystemMap, capacity: int) -> Device:
+    hotel = Device("stacker1", SimulationDeviceDriver("stacker1_driver", "hotel"), capacity=capacity)
+    system_map.get_location("stacker1").resource = hotel
+    return hotel
+
+
+class TestLocationReservationManager:
+
+    def test_release_twice_keeps_next_reservation(self, system_map: SystemMap):
+        manager = LocationReservationManager(system_map)
+        loc1 = system_map.get_location("loc1")
+        first = LocationReservation(loc1)
+        manager.attempt_reservation("loc1", first)
+        first.release_reservation()
+        second = LocationReservation(loc1)
+        manager.attempt_reservation("loc1", second)
+        assert second.granted.is_set()
+        # a stale release of the first reservation must not release the second
+        first.release_reservation()
+        assert manager.get_reservation_at("loc1") is second
+
+    def test_thread_takes_over_its_own_reservation(self, system_map: SystemMap):
+        manager = LocationReservationManager(system_map)
+        loc1 = system_map.get_location("loc1")
+        held = LocationReservation(loc1)
+        manager.attempt_reservation("loc1", held, "thread_a")
+        other = LocationReservation(loc1)
+        manager.attempt_reservation("loc1", other, "thread_b")
+        assert other.rejected.is_set()
+        # e.g. the thread's next action is on the device its labware is loaded in
+        next_action = LocationReservation(loc1)
+        manager.attempt_reservation("loc1", next_action, "thread_a")
+        assert next_action.granted.is_set()
+        held.release_reservation()
+        assert manager.get_reservation_at("loc1") is next_action
+
+    def test_moves_never_take_over_reservations(self, system_map: SystemMap):
+        manager = LocationReservationManager(system_map)
+        loc1 = system_map.get_location("loc1")
+        plate = LabwareInstance("plate", "mock_labware")
+        action = LocationReservation(loc1)
+        manager.attempt_reservation("loc1", action, "thread_a")
+        # e.g. a later hop of the thread's route through the device
+        move = LocationReservation(loc1, plate)
+        manager.attempt_reservation("loc1", move, "thread_a")
+        assert move.rejected.is_set()
+        action.release_reservation()
+        manager.attempt_reservation("loc1", LocationReservation(loc1, plate), "thread_a")
+        # the thread's action does not take over the reservation of a move either
+        next_action = LocationReservation(loc1)
+        manager.attempt_reservation("loc1", next_action, "thread_a")
+        assert next_action.rejected.is_set()
+
+    def test_location_with_slots_takes_a_reservation_per_slot(self, system_map: SystemMap):
+        hotel = _add_hotel(system_map, 3)
+        manager = LocationReservationManager(system_map)
+        stacker1 = system_map.get_location("stacker1")
+        # labware held without a reservation takes a slot too
+        hotel.initialize_labware(LabwareInstance("plate", "mock_labware"))
+        first, second, third = (LocationReservation(stacker1) for _ in range(3))
+        manager.attempt_reservation("stacker1", first, "thread_a")
+        manager.attempt_reservation("stacker1", second, "thread_b")
+        manager.attempt_reservation("stacker1", third, "thread_c")
+        assert first.granted.is_set() and second.granted.is_set()
+        assert third.rejected.is_set()
+        assert manager.get_holders("stacker1") == ["thread_a", "thread_b"]
+        first.release_reservation()
+        assert manager.can_reserve("stacker1")
+        assert manager.get_holders("stacker1") == ["thread_b"]
+
+    def test_device_holds_labware_up_to_capacity(self):
+        hotel = Device("hotel", SimulationDeviceDriver("hotel_driver", "hotel"), capacity=2)
+        hotel.initialize_labware(LabwareInstance("plate_1", "mock_labware"))
+        hotel.initialize_labware(LabwareInstance("plate_2", "mock_labware"))
+        assert len(hotel.labwares) == 2 and hotel.labware is None
+        with pytest.raises(DeviceBusyError):
+            hotel.initialize_labware(LabwareInstance("plate_3", "mock_labware"))
+
+    def test_pick_waits_for_the_stage(self):
+        hotel = Device("hotel", SimulationDeviceDriver("hotel_driver", "hotel"), capacity=2)
+        first, second = LabwareInstance("plate_1", "mock_labware"), LabwareInstance("plate_2", "mock_labware")
+        hotel.initialize_labware(first)
+        hotel.initialize_labware(second)
+
+        async def run() -> None:
+            await hotel.prepare_for_pick(first)
+            waiting = asyncio.create_task(hotel.prepare_for_pick(second))
+            await asyncio.sleep(0)
+            assert not waiting.done() and hotel.labware == first
+            await hotel.notify_picked(first)
+            await asyncio.wait_for(waiting, 1.0)
+            assert hotel.labware == second
+        asyncio.run(run())
+
+    def test_occupied_plate_pad_is_busy(self):
+        pad = PlatePad("pad")
+        pad.initialize_labware(LabwareInstance("plate_1", "mock_labware"))
+        # as with a device, a thread initializing labware on the pad retries until it frees up
+        with pytest.raises(DeviceBusyError):
+            pad.initialize_labware(LabwareInstance("plate_2", "mock_labware"))
+        assert pad.labware is not None and pad.labware.name == "plate_1"
+
+    def test_plate_pad_lists_its_labware(self, system_map: SystemMap):
+        loc1 = system_map.get_location("loc1")
+        plate = LabwareInstance("plate", "mock_labware")
+        loc1.initialize_labware(plate)
+        assert loc1.labwares == [plate]
+        assert not loc1.has_free_slot
+
+    def test_locations_reserved_together_or_not_at_all(self, system_map: SystemMap):
+        manager = LocationReservationManager(system_map)
+        loc1, loc2 = system_map.get_location("loc1"), system_map.get_location("loc2")
+        manager.attempt_reservation("loc2", LocationReservation(loc2), "thread_a")
+        first, second = LocationReservation(loc1), LocationReservation(loc2)
+        assert not manager.attempt_reservations([first, second], "thread_b")
+        assert manager.get_reservation_at("loc1") is None
+        assert not first.processed.is_set() and not second.processed.is_set()
+        manager.release_reservation("loc2")
+        assert manager.attempt_reservations([first, second], "thread_b")
+        assert first.granted.is_set() and second.granted.is_set()
+
+
+class _CompletedAction:
+    def __init__(self, output_removed: bool) -> None:
+        self.output_removed = output_removed
+        self.releases = 0
+
+    def all_output_labware_removed(self) -> bool:
+        return self.output_removed
+
+    def release_reservation(self) -> None:
+        self.releases += 1
+
+
+class TestMethodReservation:
+
+    @pytest.mark.parametrize("output_removed, releases", [(False, 0), (True, 1)])
+    def test_location_held_until_output_labware_removed(self, output_removed: bool, releases: int):
+        event_bus = EventBus()
+        method = ExecutingMethod(MethodInstance("read"), event_bus, StatusManager(event_bus), WorkflowExecutionContext("workflow", "workflow"))
+        action = _CompletedAction(output_removed)
+        method._current_action = action  # type: ignore[assignment]
+        asyncio.run(method._handle_action_completed_async("ACTION.COMPLETED", WorkflowExecutionContext("workflow", "workflow")))
+        # labware still loaded in the device keeps its location reserved, the labware thread releases it once moved off
+        assert action.releases == releases
+        assert method.has_completed()
+
+
+class TestThreadReservationCoordinator:
+
+    @staticmethod
+    def _add_thread(registry: _ThreadRegistry, system_map: SystemMap, priority: int = 0, deadline: Optional[float] = None) -> str:
+        loc1 = system_map.get_location("loc1")
+        thread = LabwareThreadInstance(LabwareInstance("plate", "mock_labware"), loc1, loc1, priority, deadline)
+        registry.add_thread(thread)
+        return thread.id
+
+    @staticmethod
+    def _request(thread_id: str, system_map: SystemMap) -> LocationCollectionReservationRequest:
+        loc1 = system_map.get_location("loc1")
+        return LocationCollectionReservationRequest(thread_id, [LocationReservation(loc1)], system_map, loc1)
+
+    async def _contend(self, coordinator: ThreadReservationCoordinator, system_map: SystemMap, holder: str,
+                       waiters: List[str], wait_between: float = 0.0) -> LocationCollectionReservationRequest:
+        """Has each waiter queue for loc1 while it is held, releases it and returns the request granted."""
+        held = self._request(holder, system_map)
+        await coordinator.submit_reservation_request(holder, held)
+        requests = [self._request(thread_id, system_map) for thread_id in waiters]
+        tasks = []
+        for thread_id, request in zip(waiters, requests):
+            tasks.append(asyncio.create_task(coordinator.submit_reservation_request(thread_id, request)))
+            await asyncio.sleep(wait_between)
+        held.reserved_action_location.release_reservation()
+        await asyncio.sleep(0)
+        granted = [r for r in requests if r.granted.is_set()]
+        assert len(granted) == 1
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return granted[0]
+
+    def test_request_granted_on_submission(self, system_map: SystemMap):
+        coordinator = ThreadReservationCoordinator(system_map, None)  # type: ignore[arg-type]
+        loc1 = system_map.get_location("loc1")
+        request = LocationCollectionReservationRequest("thread_a", [LocationReservation(loc1)], system_map, loc1)
+        # no tick loop is running, the request is processed as it is submitted
+        asyncio.run(coordinator.submit_reservation_request("thread_a", request))
+        assert request.granted.is_set()
+        assert list(coordinator.reserved_locations) == ["loc1"]
+
+    def test_only_chosen_alternative_reserved(self, system_map: SystemMap):
+        coordinator = ThreadReservationCoordinator(system_map, None)  # type: ignore[arg-type]
+        released: List[str] = []
+        coordinator._reservation_manager.set_release_callback(released.append)
+        loc1, loc2 = system_map.get_location("loc1"), system_map.get_location("loc2")
+        request = LocationCollectionReservationRequest("thread_a", [LocationReservation(loc1), LocationReservation(loc2)], system_map, loc1)
+        asyncio.run(coordinator.submit_reservation_request("thread_a", request))
+        assert request.reserved_action_location.requested_location is loc1
+        # the nearest location is granted without first granting and giving back the other
+        assert list(coordinator.reserved_locations) == ["loc1"]
+        assert released == []
+
+    def test_reservations_reclaimed_when_thread_removed(self, system_map: SystemMap):
+        registry = _ThreadRegistry()
+        coordinator = ThreadReservationCoordinator(system_map, registry)
+        thread_a, thread_b = self._add_thread(registry, system_map), self._add_thread(registry, system_map)
+        leaked, waiting_request = self._request(thread_a, system_map), self._request(thread_b, system_map)
+
+        async def run() -> None:
+            await coordinator.submit_reservation_request(thread_a, leaked)
+            waiting = asyncio.create_task(coordinator.submit_reservation_request(thread_b, waiting_request))
+            await asyncio.sleep(0)
+            # e.g. the thread's action raised before its reservation was released
+            coordinator.remove_thread(thread_a)
+            await asyncio.wait_for(waiting, 1.0)
+            assert waiting_request.granted.is_set()
+        asyncio.run(run())
+        assert coordinator.reclaimed_leases == {"thread_ended": 1}
+
+    def test_expired_lease_reclaimed(self, system_map: SystemMap):
+        coordinator = ThreadReservationCoordinator(system_map, None, lease_duration=0.05)  # type: ignore[arg-type]
+        loc1, loc2 = system_map.get_location("loc1"), system_map.get_location("loc2")
+
+        async def run() -> None:
+            await coordinator.submit_reservation_request("thread_a", LocationCollectionReservationRequest("thread_a", [LocationReservation(loc1)], system_map, loc1))
+            await coordinator.submit_reservation_request("thread_b", LocationCollectionReservationRequest("thread_b", [LocationReservation(loc2)], system_map, loc2))
+            for _ in range(3):
+                await asyncio.sleep(0.03)
+                coordinator.renew_leases("thread_b")
+            await coordinator._on_tick()
+        asyncio.run(run())
+        # only the thread that stopped renewing loses its reservation
+        assert list(coordinator.reserved_locations) == ["loc2"]
+        assert coordinator.reclaimed_leases == {"expired": 1}
+
+    def test_waiting_requests_granted_in_order(self, system_map: SystemMap):
+        registry = _ThreadRegistry()
+        coordinator = ThreadReservationCoordinator(system_map, registry)
+        thread_a, thread_b, thread_c = (self._add_thread(registry, system_map) for _ in range(3))
+        held, first, second = (self._request(thread_id, system_map) for thread_id in [thread_a, thread_b, thread_c])
+
+        async def run() -> None:
+            await coordinator.submit_reservation_request(thread_a, held)
+            waiting_first = asyncio.create_task(coordinator.submit_reservation_request(thread_b, first))
+            await asyncio.sleep(0)
+            waiting_second = asyncio.create_task(coordinator.submit_reservation_request(thread_c, second))
+            await asyncio.sleep(0)
+            assert not waiting_first.done() and not waiting_second.done()
+
+            held.reserved_action_location.release_reservation()
+            await asyncio.wait_for(waiting_first, 1.0)
+            assert first.granted.is_set()
+            assert not second.processed.is_set()
+
+            first.reserved_action_location.release_reservation()
+            await asyncio.wait_for(waiting_second, 1.0)
+            assert second.granted.is_set()
+        asyncio.run(run())
+
+    def test_cancelled_request_leaves_queue(self, system_map: SystemMap):
+        coordinator = ThreadReservationCoordinator(system_map, None)  # type: ignore[arg-type]
+        loc1 = system_map.get_location("loc1")
+        held, cancelled = (LocationCollectionReservationRequest(thread_id, [LocationReservation(loc1)], system_map, loc1)
+                           for thread_id in ["thread_a", "thread_b"])
+
+        async def run() -> None:
+            await coordinator.submit_reservation_request("thread_a", held)
+            waiting = asyncio.create_task(coordinator.submit_reservation_request("thread_b", cancelled))
+            await asyncio.sleep(0)
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+            held.reserved_action_location.release_reservation()
+            assert not cancelled.granted.is_set()
+            assert list(coordinator.reserved_locations) == []
+        asyncio.run(run())
+
+    def test_higher_priority_granted_first(self, system_map: SystemMap):
+        registry = _ThreadRegistry()
+        coordinator = ThreadReservationCoordinator(system_map, registry)
+        holder, low, high = (self._add_thread(registry, system_map, priority) for priority in [0, 0, 5])
+        granted = asyncio.run(self._contend(coordinator, system_map, holder, [low, high]))
+        assert granted.thread_id == high
+
+    def test_nearest_deadline_granted_first(self, system_map: SystemMap):
+        registry = _ThreadRegistry()
+        coordinator = ThreadReservationCoordinator(system_map, registry)
+        holder = self._add_thread(registry, system_map)
+        relaxed = self._add_thread(registry, system_map, deadline=3600.0)
+        urgent = self._add_thread(registry, system_map, deadline=600.0)
+        granted = asyncio.run(self._contend(coordinator, system_map, holder, [relaxed, urgent]))
+        assert granted.thread_id == urgent
+
+    def test_waiting_request_ages_past_higher_priority(self, system_map: SystemMap):
+        registry = _ThreadRegistry()
+        coordinator = ThreadReservationCoordinator(system_map, registry, priority_aging=0.01)
+        holder, low, high = (self._add_thread(registry, system_map, priority) for priority in [0, 0, 2])
+        # the low priority request waits long enough to gain more than two levels
+        granted = asyncio.run(self._contend(coordinator, system_map, holder, [low, high], wait_between=0.05))
+        assert granted.thread_id == low
+
+    def test_invalid_lease_duration(self, system_map: SystemMap):
+        with pytest.raises(ValueError):
+            ThreadReservationCoordinator(system_map, None, lease_duration=0)  # type: ignore[arg-type]
+
+    def test_invalid_priority_aging(self, system_map: SystemMap):
+        with pytest.raises(ValueError):
+            ThreadReservationCoordinator(system_map, _ThreadRegistry(), priority_aging=0)
+
+    def test_tick_loop_starts_once(self, system_map: SystemMap):
+        coordinator = ThreadReservationCoordinator(system_map, None)  # type: ignore[arg-type]
+        ticks: List[float] = []
+        coordinator._on_shard_tick = lambda shard: ticks.append(asyncio.get_running_loop().time())  # type: ignore[method-assign]
+
+        async def run() -> None:
+            loop = asyncio.create_task(coordinator.start_tick_loop(1.0))
+            await asyncio.sleep(0)
+            # e.g. a second workflow starting on the same system
+            await asyncio.wait_for(coordinator.start_tick_loop(1.0), 0.1)
+            await asyncio.sleep(3.5)
+            loop.cancel()
+            await asyncio.gather(loop, return_exceptions=True)
+        run_in_virtual_time(run())
+        assert len(ticks) == 3
+
+    def test_deadlock_found_as_it_forms(self, system_map: SystemMap):
+        registry = _ThreadRegistry()
+        coordinator = ThreadReservationCoordinator(system_map, registry)
+        thread_a, thread_b = self._add_thread(registry, system_map), self._add_thread(registry, system_map, priority=1)
+        loc1, loc2 = system_map.get_location("loc1"), system_map.get_location("loc2")
+
+        def request(thread_id: str, location_name: str) -> LocationCollectionReservationRequest:
+            location = system_map.get_location(location_name)
+            return LocationCollectionReservationRequest(thread_id, [LocationReservation(location)], system_map, location)
+
+        async def run() -> None:
+            # each thread holds a location, e.g. the device its labware is loaded in, and waits for the other's
+            await coordinator.submit_reservation_request(thread_a, request(thread_a, "loc1"))
+            await coordinator.submit_reservation_request(thread_b, request(thread_b, "loc2"))
+            a_waits = request(thread_a, "loc2")
+            waiting = asyncio.create_task(coordinator.submit_reservation_request(thread_a, a_waits))
+            await asyncio.sleep(0)
+            b_waits = request(thread_b, "loc1")
+            b_waiting = asyncio.create_task(coordinator.submit_reservation_request(thread_b, b_waits))
+            await asyncio.sleep(0)
+            # no tick loop is running, the cycle is found as the second request starts waiting and the lower priority thread backs out
+            await asyncio.wait_for(waiting, 1.0)
+            assert a_waits.deadlocked.is_set()
+            assert not b_waits.processed.is_set()
+            b_waiting.cancel()
+            await asyncio.gather(b_waiting, return_exceptions=True)
+        asyncio.run(run())
+        assert len(coordinator.deadlock_wait_times) == 1
+
+    def test_one_thread_backs_out_per_cycle(self, system_map: SystemMap):
+        registry = _ThreadRegistry()
+        coordinator = ThreadReservationCoordinator(system_map, registry)
+        threads = [self._add_thread(registry, system_map, priority) for priority in range(3)]
+        locations = [system_map.get_location(name) for name in ["loc1", "loc2", "loc3"]]
+
+        def request(thread_id: str, location: Location) -> LocationCollectionReservationRequest:
+            return LocationCollectionReservationRequest(thread_id, [LocationReservation(location)], system_map, location)
+
+        async def run() -> None:
+            for thread_id, location in zip(threads, locations):
+                await coordinator.submit_reservation_request(thread_id, request(thread_id, location))
+            # each thread waits for the next one's location
+            requests = [request(thread_id, locations[(i + 1) % 3]) for i, thread_id in enumerate(threads)]
+            tasks = []
+            for thread_id, waits in zip(threads, requests):
+                tasks.append(asyncio.create_task(coordinator.submit_reservation_request(thread_id, waits)))
+                await asyncio.sleep(0)
+            await coordinator._on_tick()
+            # backing out the lowest priority thread breaks the cycle, the others keep waiting
+            assert [r.deadlocked.is_set() for r in requests] == [True, False, False]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        asyncio.run(run())
+        assert len(coordinator.deadlock_wait_times) == 1
+
+    def test_parked_request_not_backed_out_again(self, system_map: SystemMap):
+        registry = _ThreadRegistry()
+        coordinator = ThreadReservationCoordinator(system_map, registry)
+        thread_a, thread_b = self._add_thread(registry, system_map), self._add_thread(registry, system_map, priority=1)
+        loc1, loc2 = system_map.get_location("loc1"), system_map.get_location("loc2")
+
+        def request(thread_id: str, location: Location) -> LocationCollectionReservationRequest:
+            return LocationCollectionReservationRequest(thread_id, [LocationReservation(location)], system_map, location)
+
+        async def run() -> None:
+            await coordinator.submit_reservation_request(thread_a, request(thread_a, loc1))
+            await coordinator.submit_reservation_request(thread_b, request(thread_b, loc2))
+            # e.g. thread_a backed out before with nowhere to move its labware
+            a_waits = request(thread_a, loc2)
+            a_waiting = asyncio.create_task(coordinator.submit_reservation_request(thread_a, a_waits, parked=True))
+            await asyncio.sleep(0)
+            b_waits = request(thread_b, loc1)
+            waiting = asyncio.create_task(coordinator.submit_reservation_request(thread_b, b_waits))
+            await asyncio.sleep(0)
+            # the lower ranked thread_a is parked, so thread_b backs out and thread_a waits for loc2 to change hands
+            await asyncio.wait_for(waiting, 1.0)
+            assert b_waits.deadlocked.is_set()
+            await coordinator._on_tick()
+            assert not a_waits.processed.is_set()
+            a_waiting.cancel()
+            await asyncio.gather(a_waiting, return_exceptions=True)
+        asyncio.run(run())
+
+    def test_backed_out_location_handed_to_the_cycle(self, system_map: SystemMap):
+        registry = _ThreadRegistry()
+        coordinator = ThreadReservationCoordinator(system_map, registry)
+        thread_a, thread_b, thread_c = (self._add_thread(registry, system_map, priority) for priority in range(3))
+        loc1, loc2 = system_map.get_location("loc1"), system_map.get_location("loc2")
+
+        def request(thread_id: str, location: Location) -> LocationCollectionReservationRequest:
+            return LocationCollectionReservationRequest(thread_id, [LocationReservation(location)], system_map, location)
+
+        async def run() -> None:
+            await coordinator.submit_reservation_request(thread_a, request(thread_a, loc1))
+            await coordinator.submit_reservation_request(thread_b, request(thread_b, loc2))
+            c_waits, b_waits = request(thread_c, loc1), request(thread_b, loc1)
+            waiting = [asyncio.create_task(coordinator.submit_reservation_request(thread_c, c_waits))]
+            a_waits = request(thread_a, loc2)
+            backing_out = asyncio.create_task(coordinator.submit_reservation_request(thread_a, a_waits))
+            await asyncio.sleep(0)
+            waiting.append(asyncio.create_task(coordinator.submit_reservation_request(thread_b, b_waits)))
+            await asyncio.sleep(0)
+            await asyncio.wait_for(backing_out, 1.0)
+            assert a_waits.deadlocked.is_set()
+            assert set(coordinator.awaited_locations) == {"loc1"}
+            # thread_a moves its labware away, loc1 goes to thread_b, whose labware was in its way, rather than thread_c
+            coordinator.remove_thread(thread_a)
+            await asyncio.sleep(0)
+            assert b_waits.granted.is_set()
+            assert not c_waits.processed.is_set()
+            for task in waiting:
+                task.cancel()
+            await asyncio.gather(*waiting, return_exceptions=True)
+        asyncio.run(run())
+
+    def test_location_with_free_slot_does_not_deadlock(self, system_map: SystemMap):
+        _add_hotel(system_map, 2)
+        registry = _ThreadRegistry()
+        coordinator = ThreadReservationCoordinator(system_map, registry)
+        thread_a, thread_b, thread_c = (self._add_thread(registry, system_map) for _ in range(3))
+
+        def request(thread_id: str, location_name: str) -> LocationCollectionReservationRequest:
+            location = system_map.get_location(location_name)
+            return LocationCollectionReservationRequest(thread_id, [LocationReservation(location)], system_map, location)
+
+        async def run() -> None:
+            # thread_a and thread_b each hold a slot of the full hotel, which thread_c waits for while holding loc1
+            for thread_id, location_name in [(thread_a, "stacker1"), (thread_b, "stacker1"), (thread_c, "loc1")]:
+                await coordinator.submit_reservation_request(thread_id, request(thread_id, location_name))
+            waiting = [asyncio.create_task(coordinator.submit_reservation_request(thread_c, request(thread_c, "stacker1")))]
+            waiting.append(asyncio.create_task(coordinator.submit_reservation_request(thread_a, request(thread_a, "loc1"))))
+            await asyncio.sleep(0)
+            # thread_b may still leave the hotel
+            assert coordinator.deadlock_wait_times == []
+            waiting.append(asyncio.create_task(coordinator.submit_reservation_request(thread_b, request(thread_b, "loc1"))))
+            await asyncio.sleep(0)
+            assert len(coordinator.deadlock_wait_times) == 1
+            for task in waiting:
+                task.cancel()
+            await asyncio.gather(*waiting, return_exceptions=True)
+        asyncio.run(run())
+
+    def test_grant_deferred_to_avoid_deadlock(self, system_map: SystemMap):
+        registry = _ThreadRegistry()
+        coordinator = ThreadReservationCoordinator(system_map, registry, avoid_deadlocks=True)
+        thread_a, thread_b = self._add_thread(registry, system_map), self._add_thread(registry, system_map)
+        a_needs, b_needs = _LocationNeeds([["loc2"]]), _LocationNeeds([["loc2"], ["loc1"]])
+        coordinator.admit_thread(thread_a, a_needs)
+        coordinator.admit_thread(thread_b, b_needs)
+
+        def request(thread_id: str, location_name: str) -> LocationCollectionReservationRequest:
+            location = system_map.get_location(location_name)
+            return LocationCollectionReservationRequest(thread_id, [LocationReservation(location)], system_map, location)
+
+        async def run() -> None:
+            a_holds = request(thread_a, "loc1")
+            await coordinator.submit_reservation_request(thread_a, a_holds)
+            # with loc2 thread_b would wait for loc1 held by thread_a, which would wait for loc2
+            b_waits = request(thread_b, "loc2")
+            waiting = asyncio.create_task(coordinator.submit_reservation_request(thread_b, b_waits))
+            await asyncio.sleep(0)
+            assert not b_waits.processed.is_set()
+            assert list(coordinator.reserved_locations) == ["loc1"]
+
+            a_next = request(thread_a, "loc2")
+            await coordinator.submit_reservation_request(thread_a, a_next)
+            assert a_next.granted.is_set()
+            a_needs.needs = []
+            a_holds.reserved_action_location.release_reservation()
+            a_next.reserved_action_location.release_reservation()
+            await asyncio.wait_for(waiting, 1.0)
+            assert b_waits.granted.is_set()
+        asyncio.run(run())
+        assert coordinator.deadlock_wait_times == []
+
+    def test_deferred_grant_retried_when_thread_finishes(self, system_map: SystemMap):
+        registry = _ThreadRegistry()
+        coordinator = ThreadReservationCoordinator(system_map, registry, avoid_deadlocks=True)
+        thread_a, thread_b = self._add_thread(registry, system_map), self._add_thread(registry, system_map)
+        coordinator.admit_thread(thread_a, _LocationNeeds([["loc2"]]))
+        coordinator.admit_thread(thread_b, _LocationNeeds([["loc1"]]))
+        loc1, loc2 = system_map.get_location("loc1"), system_map.get_location("loc2")
+
+        async def run() -> None:
+            await coordinator.submit_reservation_request(thread_a, LocationCollectionReservationRequest(thread_a, [LocationReservation(loc1)], system_map, loc1))
+            b_waits = LocationCollectionReservationRequest(thread_b, [LocationReservation(loc2)], system_map, loc2)
+            waiting = asyncio.create_task(coordinator.submit_reservation_request(thread_b, b_waits))
+            await asyncio.sleep(0)
+            assert not b_waits.processed.is_set()
+            # nothing is released at loc2, the request is retried as thread_a no longer needs anything
+            coordinator.remove_thread(thread_a)
+            await asyncio.wait_for(waiting, 1.0)
+            assert b_waits.granted.is_set()
+        asyncio.run(run())
+
+    def test_deadlock_across_zones_found_as_it_forms(self, system_map: SystemMap):
+        registry = _ThreadRegistry()
+        coordinator = ThreadReservationCoordinator(system_map, registry, zones=system_map.get_zones(["loc3"]))
+        thread_a, thread_b = self._add_thread(registry, system_map), self._add_thread(registry, system_map, priority=1)
+        loc1, loc4 = system_map.get_location("loc1"), system_map.get_location("loc4")
+
+        async def run() -> None:
+            await coordinator.submit_reservation_request(thread_a, LocationCollectionReservationRequest(thread_a, [LocationReservation(loc1)], system_map, loc1))
+            await coordinator.submit_reservation_request(thread_b, LocationCollectionReservationRequest(thread_b, [LocationReservation(loc4)], system_map, loc4))
+            # each request waits in the other thread's zone
+            a_waits = LocationCollectionReservationRequest(thread_a, [LocationReservation(loc4)], system_map, loc4)
+            waiting = asyncio.create_task(coordinator.submit_reservation_request(thread_a, a_waits))
+            await asyncio.sleep(0)
+            b_waits = LocationCollectionReservationRequest(thread_b, [LocationReservation(loc1)], system_map, loc1)
+            b_waiting = asyncio.create_task(coordinator.submit_reservation_request(thread_b, b_waits))
+            await asyncio.sleep(0)
+            await asyncio.wait_for(waiting, 1.0)
+            assert a_waits.deadlocked.is_set()
+            b_waiting.cancel()
+            await asyncio.gather(b_waiting, return_exceptions=True)
+        asyncio.run(run())
+        assert len(coordinator.deadlock_wait_times) == 1
+
+    def test_each_zone_ticks(self, system_map: SystemMap):
+        coordinator = ThreadReservationCoordinator(system_map, None, lease_duration=0.05,  # type: ignore[arg-type]
+                                                   zones=system_map.get_zones(["loc3"]))
+        loc1, loc3, loc4 = (system_map.get_location(name) for name in ["loc1", "loc3", "loc4"])
+
+        async def run() -> None:
+            ticks = asyncio.create_task(coordinator.start_tick_loop(0.01))
+            for thread_id, location in [("thread_a", loc1), ("thread_b", loc3), ("thread_c", loc4)]:
+                await coordinator.submit_reservation_request(thread_id, LocationCollectionReservationRequest(thread_id, [LocationReservation(location)], system_map, location))
+            await asyncio.sleep(0.2)
+            ticks.cancel()
+            await asyncio.gather(ticks, return_exceptions=True)
+        asyncio.run(run())
+        # the leases of both zones and of the transfer location expired unrenewed
+        assert list(coordinator.reserved_locations) == []
+        assert coordinator.reclaimed_leases == {"expired": 3}
+
+    def test_tick_rescans_only_changed_zones(self, system_map: SystemMap):
+        registry = _ThreadRegistry()
+        coordinator = ThreadReservationCoordinator(system_map, registry, zones=system_map.get_zones(["loc3"]))
+        thread_a, thread_b = self._add_thread(registry, system_map), self._add_thread(registry, system_map)
+        loc1 = system_map.get_location("loc1")
+        scanned: List[List[str]] = []
+        detect_dead_lock = coordinator._detect_dead_lock
+
+        def counted(queue: List[IReservationCollection]) -> None:
+            scanned.append([c.thread_id for c in queue])
+            detect_dead_lock(queue)
+        coordinator._detect_dead_lock = counted  # type: ignore[method-assign]
+
+        async def run() -> None:
+            await coordinator.submit_reservation_request(thread_a, LocationCollectionReservationRequest(thread_a, [LocationReservation(loc1)], system_map, loc1))
+            waiting = asyncio.create_task(coordinator.submit_reservation_request(thread_b, LocationCollectionReservationRequest(thread_b, [LocationReservation(loc1)], system_map, loc1)))
+            await asyncio.sleep(0)
+            await coordinator._on_tick()
+            # nothing changed in the zone since its last rescan
+            await coordinator._on_tick()
+            coordinator.notify_labware_location_change("placed", loc1, LabwareInstance("plate", "mock_labware"))
+            await coordinator._on_tick()
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+        asyncio.run(run())
+        assert scanned == [[thread_b], [thread_b]]
+
+    def test_location_in_several_zones(self, system_map: SystemMap):
+        with pytest.raises(ValueError):
+            ThreadReservationCoordinator(system_map, _ThreadRegistry(), zones=[["loc1", "loc2"], ["loc2"]])
+
+
+class TestDeadlockGraph:
+
+    def test_cycle(self):
+        graph = DeadlockGraph()
+        graph.set_waits_for("a", [{"b"}])
+        graph.set_waits_for("b", [{"c"}])
+        assert graph.find_deadlock("b") == []
+        graph.set_waits_for("c", [{"a"}])
+        assert set(graph.find_deadlock("c")) == {"a", "b", "c"}
+
+    def test_every_deadlock_found(self):
+        graph = DeadlockGraph()
+        for requester, holder in [("a", "b"), ("b", "a"), ("c", "d"), ("d", "c"), ("e", "a")]:
+            graph.set_waits_for(requester, [{holder}])
+        deadlocks = sorted(sorted(deadlock) for deadlock in graph.find_deadlocks())
+        # e waits for a deadlocked thread but is not in the cycle, backing it out would not break it
+        assert deadlocks == [["a", "b"], ["c", "d"]]
+
+    def test_free_alternative_is_not_deadlocked(self):
+        graph = DeadlockGraph()
+        graph.set_waits_for("a", [{"b"}])
+        # b may be granted either location, the one held by c frees once c proceeds
+        graph.set_waits_for("b", [{"a"}, {"c"}])
+        assert graph.find_deadlock("b") == []
+        graph.set_waits_for("c", [{"b"}])
+        assert set(graph.find_deadlock("c")) == {"a", "b", "c"}
+
+    def test_granted_thread_leaves_graph(self):
+        graph = DeadlockGraph()
+        graph.set_waits_for("a", [{"b"}])
+        graph.set_waits_for("b", [{"a"}])
+        graph.remove_requester("b")
+        assert not graph.is_deadlocked()
@@ -0,0 +1,154 @@
+import asyncio
+import time
+
+from orca.driver_management.drivers.null_plate_pad.null_plate_pad import NullPlatePadDriver
+from orca.driver_management.drivers.simulation_base.duration_models import ConstantDuration, LookupDuration, NormalDuration, OptionDuration, SimulatedOperation
+from orca.driver_management.drivers.simulation_labware_placeable.simulation_labware_placeable import SimulationDeviceDriver
+from orca.driver_management.drivers.simulation_robotic_arm.simulation_robotic_arm import JointVelocities, SimulationRoboticArmDriver
+from orca.resource_models.devices import Device
+from orca.resource_models.plate_pad import PlatePad
+from orca.resource_models.resource_extras.teachpoints import Teachpoint
+from orca.resource_models.transporter_resource import TransporterEquipment
+from orca.simulation import run_in_virtual_time
+
+
+class TestSimulationDriverConcurrency:
+
+    def test_concurrent_operations_overlap(self):
+        device = SimulationDeviceDriver("device", "shaker", sim_time=0.2)
+        arm = SimulationRoboticArmDriver("arm", "robot", ["loc1"], sim_time=0.2)
+
+        async def run() -> None:
+            await asyncio.gather(device.execute("shake", {}), arm.pick("loc1", "plate"))
+
+        start = time.perf_counter()
+        asyncio.run(run())
+        assert time.perf_counter() - start < 0.35
+
+    def test_blocking_operations_serialize(self):
+        devices = [SimulationDeviceDriver(f"device_{i}", "shaker", sim_time=0.1, concurrent=False) for i in range(2)]
+
+        async def run() -> None:
+            await asyncio.gather(*[d.execute("shake", {}) for d in devices])
+
+        start = time.perf_counter()
+        asyncio.run(run())
+        assert time.perf_counter() - start >= 0.2
+
+    def test_is_running_during_operation(self):
+        device = SimulationDeviceDriver("device", "shaker", sim_time=0.05)
+
+        async def run() -> None:
+            task = asyncio.create_task(device.execute("shake", {}))
+            await asyncio.sleep(0.01)
+            assert device.is_running
+            await task
+            assert not device.is_running
+
+        asyncio.run(run())
+
+
+class TestDurationModels:
+
+    def _operation(self, command: str, **options) -> SimulatedOperation:
+        return SimulatedOperation("centrifuge_driver", "vspin", command, options)
+
+    def test_lookup_by_command(self):
+        model = LookupDuration({"spin": 600, "notify_placed": 0}, default=5)
+        assert model.get_duration(self._operation("spin")) == 600
+        assert model.get_duration(self._operation("notify_placed")) == 0
+        assert model.get_duration(self._operation("prepare_for_pick")) == 5
+
+    def test_nested_lookup_by_mocking_type(self):
+        model = LookupDuration({"vspin": LookupDuration({"spin": 600}, default=10)}, default=1, key="mocking_type")
+        assert model.get_duration(self._operation("spin")) == 600
+        assert model.get_duration(self._operation("initialize")) == 10
+
+    def test_option_duration(self):
+        model = OptionDuration("time", default=30, scale=1.0, offset=60)
+        assert model.get_duration(self._operation("spin", time=1200)) == 1260
+        assert model.get_duration(self._operation("spin")) == 30
+
+    def test_seeded_distribution_is_reproducible(self):
+        model = NormalDuration(100, 10, seed=7)
+        first = [model.get_duration(self._operation("spin")) for _ in range(5)]
+        model.reseed(7)
+        second = [model.get_duration(self._operation("spin")) for _ in range(5)]
+        assert first == second
+        assert all(d >= 0 for d in first)
+
+    def test_driver_uses_duration_model(self):
+        driver = SimulationDeviceDriver("centrifuge_driver", "vspin", duration_model=OptionDuration("time"))
+
+        async def run() -> float:
+            loop = asyncio.get_running_loop()
+            await driver.execute("spin", {"time": 600})
+            return loop.time()
+
+        assert run_in_virtual_time(run()) == 600
+
+    def test_device_keeps_simulation_driver(self):
+        driver = SimulationDeviceDriver("centrifuge_driver", "vspin", duration_model=ConstantDuration(600))
+        device = Device("centrifuge", driver)
+        device.set_simulating(True)
+        assert device.sim_driver is driver
+
+        arm_driver = SimulationRoboticArmDriver("arm_driver", "arm", ["loc1"])
+        arm = TransporterEquipment("arm", arm_driver)
+        arm.set_simulating(True)
+        assert arm.sim_driver is arm_driver
+
+    def test_set_sim_driver_while_simulating(self):
+        device = Device("centrifuge", NullPlatePadDriver("centrifuge_driver"), sim=True)
+        sim_driver = SimulationDeviceDriver("centrifuge_sim", "vspin", duration_model=ConstantDuration(300))
+        device.set_sim_driver(sim_driver)
+        assert device.sim_driver is sim_driver
+
+        async def run() -> float:
+            loop = asyncio.get_running_loop()
+            await device.execute("spin", {})
+            return loop.time()
+
+        # the swapped in driver runs the command, not the default simulation driver
+        assert run_in_virtual_time(run()) == 300
+
+    def test_plate_pad_handoff_is_free(self):
+        pad = PlatePad("pad")
+        pad.set_simulating(True)
+        assert isinstance(pad.sim_driver, NullPlatePadDriver)
+
+
+class TestRoboticArmTravelTime:
+
+    def _arm(self) -> SimulationRoboticArmDriver:
+        teachpoints = [
+            Teachpoint("a", wrist=0, elbow=0, shoulder=0),
+            Teachpoint("b", wrist=90, elbow=30, shoulder=45),
+        ]
+        return SimulationRoboticArmDriver("arm", "robot", teachpoints,
+                                          duration_model=ConstantDuration(2.0),
+                                          joint_velocities=JointVelocities(shoulder=15, elbow=30, wrist=90))
+
+    def test_slowest_joint_sets_travel_time(self):
+        arm = self._arm()
+        assert arm.get_travel_time("a", "b") == 3.0
+        assert arm.get_travel_time("b", "b") == 0.0
+        assert arm.get_travel_time(None, "b") == 0.0
+
+    def test_pick_and_place_include_travel(self):
+        arm = self._arm()
+
+        async def run() -> float:
+            loop = asyncio.get_running_loop()
+            await arm.pick("a", "plate")
+            await arm.place("b", "plate")
+            return loop.time()
+
+        # first move has no known start, second travels a -> b
+        assert run_in_virtual_time(run()) == 2.0 + 3.0 + 2.0
+        assert arm.current_position == "b"
+
+    def test_positions_init_option(self):
+        arm = SimulationRoboticArmDriver("arm", "robot")
+        arm.set_init_options({"positions": ["loc1", "loc2"]})
+        assert arm.get_taught_positions() == ["loc1", "loc2"]
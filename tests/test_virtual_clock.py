@@ -0,0 +1,179 @@
+import asyncio
+import os
+import runpy
+import time
+
+import pytest
+
+from orca.driver_management.drivers.simulation_labware_placeable.simulation_labware_placeable import SimulationDeviceDriver
+from orca.driver_management.drivers.simulation_robotic_arm.simulation_robotic_arm import SimulationRoboticArmDriver
+from orca.events.event_bus import EventBus
+from orca.resource_models.devices import Device
+from orca.resource_models.labware import LabwareTemplate
+from orca.resource_models.transporter_resource import TransporterEquipment
+from orca.simulation import VirtualTimeEventLoop, run_in_virtual_time
+from orca.simulation.runner import simulate_workflow_runs
+from orca.simulation.stats import percentile
+from orca.system.SdkToSystemBuilder import SdkToSystemBuilder
+from orca.system.executors import WorkflowExecutor
+from orca.system.resource_registry import ResourceRegistry
+from orca.system.system_map import SystemMap
+from orca.workflow_models.action_template import ActionTemplate
+from orca.workflow_models.method_template import JunctionMethodTemplate, MethodTemplate
+from orca.workflow_models.thread_template import ThreadTemplate
+from orca.workflow_models.workflow_templates import WorkflowTemplate
+
+
+class TestVirtualTimeEventLoop:
+
+    def test_sleep_advances_virtual_clock_only(self):
+        async def sleep_an_hour() -> float:
+            loop = asyncio.get_running_loop()
+            await asyncio.sleep(3600)
+            return loop.time()
+
+        wall_start = time.perf_counter()
+        virtual_end = run_in_virtual_time(sleep_an_hour())
+        assert virtual_end == 3600
+        assert time.perf_counter() - wall_start < 1.0
+
+    def test_concurrent_sleeps_overlap(self):
+        async def overlap() -> float:
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(asyncio.sleep(10), asyncio.sleep(30), asyncio.sleep(20))
+            return loop.time()
+
+        assert run_in_virtual_time(overlap()) == 30
+
+    def test_leftover_tasks_are_cancelled(self):
+        async def forever() -> None:
+            while True:
+                await asyncio.sleep(1)
+
+        async def main() -> asyncio.Task:
+            task = asyncio.create_task(forever())
+            await asyncio.sleep(5)
+            return task
+
+        task = run_in_virtual_time(main())
+        assert task.cancelled()
+
+    def test_start_time(self):
+        loop = VirtualTimeEventLoop(start_time=100.0)
+        try:
+            assert loop.time() == 100.0
+        finally:
+            loop.close()
+
+SMC_EXAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "examples", "smc_assay", "smc_assay_example.py")
+
+
+class TestWorkflowSimulation:
+
+    def _build(self, stackers: bool = False):
+        plate = LabwareTemplate("plate", "mock_labware")
+        arm = TransporterEquipment("arm", SimulationRoboticArmDriver("arm_driver", "arm", ["start", "reader", "end"]))
+        reader = Device("reader", SimulationDeviceDriver("reader_driver", "reader", sim_time=600.0))
+        devices = [reader]
+        if stackers:
+            # stacker devices hold any number of plates, so several workflow instances can share the start and end
+            devices += [Device("start", SimulationDeviceDriver("start_driver", "stacker")),
+                        Device("end", SimulationDeviceDriver("end_driver", "stacker"))]
+        registry = ResourceRegistry()
+        registry.add_resources([arm, *devices])
+        system_map = SystemMap(registry)
+        system_map.assign_resources({d.name: d for d in devices})
+        read = MethodTemplate("read", [ActionTemplate(reader, "read", [plate])])
+        thread = ThreadTemplate(plate, system_map.get_location("start"), system_map.get_location("end"), [read])
+        workflow = WorkflowTemplate("read_plate")
+        workflow.add_thread(thread, True)
+        builder = SdkToSystemBuilder("test", "test", [plate], registry, system_map, [read], [workflow], EventBus())
+        return workflow, builder.get_system()
+
+    def test_simulate_returns_virtual_makespan(self):
+        workflow, system = self._build()
+        wall_start = time.perf_counter()
+        makespan = WorkflowExecutor(workflow, system).simulate()
+        assert makespan >= 600.0
+        assert time.perf_counter() - wall_start < 10.0
+
+    def test_simulation_is_deterministic(self):
+        makespans = []
+        for _ in range(2):
+            workflow, system = self._build()
+            makespans.append(WorkflowExecutor(workflow, system).simulate())
+        assert makespans[0] == makespans[1]
+
+    def test_max_duration(self):
+        workflow, system = self._build()
+        with pytest.raises(asyncio.TimeoutError):
+            WorkflowExecutor(workflow, system).simulate(max_duration=0.1)
+
+    def test_simulate_workflow_runs(self):
+        workflow, system = self._build(stackers=True)
+        result = simulate_workflow_runs(system, workflow, runs=3)
+        assert result.completed_runs == 3
+        assert not result.timed_out
+        # the single reader serializes the plates
+        assert result.makespan >= 3 * 600.0
+        assert len(result.reservation_waits) > 0
+        assert result.utilization()["reader"] > 0.5
+        assert result.throughput_per_hour > 0
+
+    def test_simulate_workflow_runs_in_turn(self):
+        workflow, system = self._build(stackers=True)
+        result = simulate_workflow_runs(system, workflow, runs=3, concurrent_runs=1)
+        assert result.completed_runs == 3
+        assert result.makespan >= 3 * 600.0
+        # each plate starts as the one before completes, so none waits for the reader
+        assert max(result.reservation_waits) < 600.0
+
+    def test_joined_threads_start_once_the_method_holds_its_location(self):
+        plate = LabwareTemplate("plate", "mock_labware")
+        tips = LabwareTemplate("tips", "mock_tips")
+        locations = ["start", "end", "tips_start", "tips_end", "bravo", "delidder"]
+        arm = TransporterEquipment("arm", SimulationRoboticArmDriver("arm_driver", "arm", locations))
+        devices = [Device(name, SimulationDeviceDriver(f"{name}_driver", name)) for name in locations]
+        registry = ResourceRegistry()
+        registry.add_resources([arm, *devices])
+        system_map = SystemMap(registry)
+        system_map.assign_resources({d.name: d for d in devices})
+        bravo, delidder = devices[4], devices[5]
+        first_transfer = MethodTemplate("first_transfer", [ActionTemplate(bravo, "run", [plate, tips])])
+        second_transfer = MethodTemplate("second_transfer", [ActionTemplate(bravo, "run", [plate, tips])])
+        delid = MethodTemplate("delid", [ActionTemplate(delidder, "delid", [tips])])
+        plate_thread = ThreadTemplate(plate, system_map.get_location("start"), system_map.get_location("end"),
+                                      [first_transfer, second_transfer])
+        tips_thread = ThreadTemplate(tips, system_map.get_location("tips_start"), system_map.get_location("tips_end"),
+                                     [delid, JunctionMethodTemplate()])
+        workflow = WorkflowTemplate("transfer")
+        workflow.add_thread(plate_thread, True)
+        workflow.add_thread(tips_thread)
+        workflow.set_spawn_point(tips_thread, plate_thread, first_transfer, True)
+        workflow.set_spawn_point(tips_thread, plate_thread, second_transfer, True)
+        builder = SdkToSystemBuilder("test", "test", [plate, tips], registry, system_map,
+                                     [first_transfer, second_transfer, delid], [workflow], EventBus())
+        # tips started for the plate waiting for the bravo would hold the delidder while the plate on the bravo waits for
+        # tips that have to be delidded
+        result = simulate_workflow_runs(builder.get_system(), workflow, runs=2, max_duration=20000.0)
+        assert result.completed_runs == 2
+
+    def test_smc_example_runs_several_plates(self):
+        namespace = runpy.run_path(SMC_EXAMPLE, run_name="smc_assay")
+        result = simulate_workflow_runs(namespace["system"], namespace["smc_workflow"], runs=10, max_duration=3600.0)
+        assert result.completed_runs == 10
+        assert result.errors == []
+
+    def test_simulate_workflow_runs_max_duration(self):
+        workflow, system = self._build(stackers=True)
+        result = simulate_workflow_runs(system, workflow, runs=3, max_duration=1000.0)
+        assert result.timed_out
+        assert result.completed_runs < 3
+        assert result.makespan == pytest.approx(1000.0)
+
+
+def test_percentile():
+    assert percentile([], 99) == 0.0
+    assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 50) == 3.0
+    assert percentile([1.0, 2.0], 50) == 1.5
+    assert percentile([5.0, 1.0, 3.0], 100) == 5.0
@@ -0,0 +1,84 @@
+import pytest
+
+from orca.resource_models.plate_pad import PlatePad
+from orca.simulation.generator import WorkcellSpec, generate_workcell
+from orca.simulation.runner import simulate_workflow_runs
+
+
+def _teachpoints(workcell):
+    return {t.name: [(p.name, p.shoulder, p.elbow, p.wrist) for p in t.sim_driver.get_teachpoints()] for t in workcell.resource_registry.transporters}
+
+
+class TestWorkcellGenerator:
+
+    def test_layout(self):
+        workcell = generate_workcell(WorkcellSpec(transporters=3, devices=9, device_types=3, shared_positions=2))
+        registry = workcell.resource_registry
+        assert len(registry.transporters) == 3
+        pads = [e for e in registry.equipments if isinstance(e, PlatePad)]
+        assert len(pads) == 4
+        # neighbouring arms share their handoff pads
+        arm_0 = set(registry.get_transporter("arm_0").get_taught_positions())
+        arm_1 = set(registry.get_transporter("arm_1").get_taught_positions())
+        assert arm_0 & arm_1 == {"handoff_0_0", "handoff_0_1"}
+        assert workcell.system_map.has_any_route("stacker_in", "stacker_out")
+
+    def test_device_reach(self):
+        workcell = generate_workcell(WorkcellSpec(transporters=2, devices=4, device_types=2, device_reach=2))
+        for transporter in workcell.resource_registry.transporters:
+            positions = transporter.get_taught_positions()
+            assert all(f"device_{i}" in positions for i in range(4))
+
+    def test_pools(self):
+        pooled = generate_workcell(WorkcellSpec(devices=6, device_types=3))
+        assert sorted(p.name for p in pooled.resource_registry.resource_pools) == ["type_0_pool", "type_1_pool", "type_2_pool"]
+        assert all(len(p.resources) == 2 for p in pooled.resource_registry.resource_pools)
+        unpooled = generate_workcell(WorkcellSpec(devices=6, device_types=3, use_pools=False))
+        assert unpooled.resource_registry.resource_pools == []
+
+    def test_threads_and_methods(self):
+        workcell = generate_workcell(WorkcellSpec(threads=5, methods_per_thread=2))
+        assert len(workcell.labware_templates) == 5
+        assert len(workcell.methods) == 10
+        assert len(workcell.workflow.entry_thread_templates) == 5
+
+    def test_seeded(self):
+        spec = WorkcellSpec(transporters=2, devices=6, threads=3, seed=7)
+        first = generate_workcell(spec)
+        second = generate_workcell(spec)
+        assert _teachpoints(first) == _teachpoints(second)
+        assert [a.options for m in first.methods for a in m.actions] == [a.options for m in second.methods for a in m.actions]
+        other = generate_workcell(WorkcellSpec(transporters=2, devices=6, threads=3, seed=8))
+        assert _teachpoints(first) != _teachpoints(other)
+
+    def test_invalid_spec(self):
+        with pytest.raises(ValueError):
+            WorkcellSpec(transporters=0)
+        with pytest.raises(ValueError):
+            WorkcellSpec(devices=2, device_types=3)
+        with pytest.raises(ValueError):
+            WorkcellSpec(transporters=2, shared_positions=0)
+        with pytest.raises(ValueError):
+            WorkcellSpec(stacker_capacity=0)
+
+    def test_simulate(self):
+        workcell = generate_workcell(WorkcellSpec(threads=2, methods_per_thread=2))
+        result = simulate_workflow_runs(workcell.system, workcell.workflow, max_duration=100000.0)
+        assert result.completed_runs == 1
+        assert result.makespan > 0
+
+    def test_simulate_with_stackers_holding_every_plate(self):
+        workcell = generate_workcell(WorkcellSpec(threads=3, methods_per_thread=1, stacker_capacity=None))
+        result = simulate_workflow_runs(workcell.system, workcell.workflow, max_duration=100000.0)
+        assert result.completed_runs == 1
+        assert len(workcell.system_map.get_location("stacker_out").labwares) == 3
+
+    @pytest.mark.parametrize("route_alternatives", [1, 3])
+    def test_simulate_contended_workcell(self, route_alternatives: int):
+        # benchmarks/congestion.py with twice its threads, which used to livelock in deadlock resolution
+        spec = WorkcellSpec(transporters=3, devices=9, device_types=3, device_reach=3, threads=12, methods_per_thread=3,
+                            device_duration=30.0, arm_duration=10.0, route_alternatives=route_alternatives)
+        workcell = generate_workcell(spec)
+        result = simulate_workflow_runs(workcell.system, workcell.workflow, max_duration=20000.0)
+        assert result.completed_runs == 1
+        assert result.errors == []